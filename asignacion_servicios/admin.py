@@ -1,10 +1,13 @@
 from django.contrib import admin
 
 # Register your models here.
-from asignacion_servicios.models import Driver, Service, Client, Address
+from asignacion_servicios.models import Driver, Service, Client, Address, Task, OutboxEvent, DemandTile, DriverRecommendation
 
 admin.site.register(Driver)
 admin.site.register(Service)
 admin.site.register(Client)
 admin.site.register(Address)
-
+admin.site.register(Task)
+admin.site.register(OutboxEvent)
+admin.site.register(DemandTile)
+admin.site.register(DriverRecommendation)
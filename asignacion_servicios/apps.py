@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class AsignacionServiciosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'asignacion_servicios'
+
+    def ready(self):
+        from .db import install_query_stats
+        from .services import TokenRevocationService
+        install_query_stats()
+        TokenRevocationService.install()
@@ -0,0 +1,5 @@
+from .replicaRouter import PrimaryReplicaRouter, read_from_replica, replica_enabled
+from .queryStats import (
+    QueryStats, QueryStatsWrapper, fingerprint, install_query_stats, load_snapshots, query_origin, query_stats,
+    request_reset, summarize, write_snapshot,
+)
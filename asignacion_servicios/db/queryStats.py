@@ -0,0 +1,345 @@
+import atexit
+import json
+import logging
+import math
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+_APP_DIR = str(Path(__file__).resolve().parent.parent)
+_DB_DIR = str(Path(__file__).resolve().parent)
+_REPOSITORIES_DIR = os.path.join(_APP_DIR, 'repositories')
+
+_SAVEPOINT = re.compile(r'\b(SAVEPOINT|RELEASE SAVEPOINT|ROLLBACK TO SAVEPOINT)\s+"?\w+"?', re.IGNORECASE)
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b|%s|\?")
+_PLACEHOLDER_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_REPEATED_LIST = re.compile(r'\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normaliza una sentencia SQL para agrupar las que solo difieren en sus valores.
+
+    Reemplaza literales y parámetros por '?', las listas '(?, ?, ...)' por '(...)' (incluidas
+    las filas de un INSERT múltiple) y los nombres de savepoint, y colapsa los espacios.
+
+    Args:
+        sql (str): Sentencia SQL, con parámetros '%s' o con literales.
+
+    Returns:
+        str: Huella de la sentencia.
+    """
+    sql = _SAVEPOINT.sub(r'\1 ?', sql)
+    sql = _LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER_LIST.sub('(...)', sql)
+    sql = _REPEATED_LIST.sub('(...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def percentile(values: list, pct: float) -> float:
+    """
+    Calcula el percentil por rango más cercano.
+
+    Args:
+        values (list): Valores numéricos.
+        pct (float): Percentil entre 0 y 100.
+
+    Returns:
+        float: Valor del percentil, o 0.0 si no hay valores.
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def query_origin(limit: int = 5) -> tuple:
+    """
+    Identifica el código de la aplicación que ejecutó la consulta actual recorriendo la pila.
+
+    El origen es el primer método de un repositorio en la pila; si la consulta se evaluó fuera
+    de los repositorios (un queryset perezoso recorrido en un serializer, por ejemplo) es la
+    primera función de la aplicación.
+
+    Args:
+        limit (int, optional): Número máximo de marcos de la aplicación en la pila retornada.
+
+    Returns:
+        tuple: (origen 'Clase.método' o 'módulo.función', lista de 'archivo:línea función')
+    """
+    origin = None
+    repository = None
+    stack = []
+    frame = sys._getframe(1)
+    while frame is not None and (repository is None or len(stack) < limit):
+        filename = frame.f_code.co_filename
+        if filename.startswith(_APP_DIR) and not filename.startswith(_DB_DIR) and '/test/' not in filename:
+            qualname = frame.f_code.co_qualname
+            if origin is None:
+                origin = f"{frame.f_globals.get('__name__', '?')}.{qualname}"
+            if repository is None and filename.startswith(_REPOSITORIES_DIR):
+                repository = qualname
+            if len(stack) < limit:
+                stack.append(f"{os.path.relpath(filename, _APP_DIR)}:{frame.f_lineno} {qualname}")
+        frame = frame.f_back
+    return repository or origin or '?', stack
+
+
+class QueryStats:
+    """
+    Estadísticas en memoria de las consultas SQL del proceso, por huella y por origen.
+
+    Guarda para cada par (huella, origen) el número de ejecuciones, el tiempo total, el máximo
+    y las últimas QUERY_STATS_SAMPLES duraciones, con las que se calcula el p95.
+    """
+
+    def __init__(self, samples: int = 200):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def record(self, query_fingerprint: str, origin: str, duration_ms: float) -> None:
+        """
+        Suma una ejecución.
+
+        Args:
+            query_fingerprint (str): Huella de la sentencia.
+            origin (str): Código que la ejecutó.
+            duration_ms (float): Duración en milisegundos.
+        """
+        key = (query_fingerprint, origin)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [0, 0.0, 0.0, deque(maxlen=self.samples)]
+            entry[0] += 1
+            entry[1] += duration_ms
+            entry[2] = max(entry[2], duration_ms)
+            entry[3].append(duration_ms)
+
+    def snapshot(self) -> list:
+        """
+        Returns:
+            list: Diccionarios con fingerprint, origin, count, total_ms, max_ms y samples.
+        """
+        with self._lock:
+            return [
+                {
+                    'fingerprint': query_fingerprint, 'origin': origin, 'count': count,
+                    'total_ms': total_ms, 'max_ms': max_ms, 'samples': list(samples),
+                }
+                for (query_fingerprint, origin), (count, total_ms, max_ms, samples) in self._entries.items()
+            ]
+
+    def reset(self) -> None:
+        """
+        Descarta las estadísticas acumuladas.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+def summarize(entries: list, by: str = 'fingerprint', sort: str = 'total_ms', top: int = 20) -> list:
+    """
+    Agrupa entradas de snapshot (de uno o varios procesos) y retorna las más costosas.
+
+    Args:
+        entries (list): Entradas de QueryStats.snapshot().
+        by (str, optional): 'fingerprint' o 'origin'.
+        sort (str, optional): 'total_ms', 'p95_ms', 'max_ms' o 'count'.
+        top (int, optional): Número de filas.
+
+    Returns:
+        list: Diccionarios con key, count, total_ms, mean_ms, p95_ms, max_ms y origins (o fingerprints).
+    """
+    other = 'origin' if by == 'fingerprint' else 'fingerprint'
+    groups = {}
+    for entry in entries:
+        group = groups.setdefault(entry[by], {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'samples': [], 'related': set()})
+        group['count'] += entry['count']
+        group['total_ms'] += entry['total_ms']
+        group['max_ms'] = max(group['max_ms'], entry['max_ms'])
+        group['samples'].extend(entry['samples'])
+        group['related'].add(entry[other])
+
+    rows = [
+        {
+            'key': key, 'count': group['count'], 'total_ms': group['total_ms'],
+            'mean_ms': group['total_ms'] / group['count'], 'p95_ms': percentile(group['samples'], 95),
+            'max_ms': group['max_ms'], f"{other}s": sorted(group['related']),
+        }
+        for key, group in groups.items()
+    ]
+    rows.sort(key=lambda row: row[sort], reverse=True)
+    return rows[:top]
+
+
+def write_snapshot(stats: QueryStats, directory) -> Path:
+    """
+    Guarda el snapshot del proceso en 'directory' como <host>-<pid>.json (reemplazo atómico).
+
+    Args:
+        stats (QueryStats): Estadísticas del proceso.
+        directory (str o Path): Directorio compartido de snapshots.
+
+    Returns:
+        Path: Archivo escrito.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{socket.gethostname()}-{os.getpid()}.json"
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(stats.snapshot()))
+    os.replace(temporary, path)
+    return path
+
+
+RESET_MARKER = 'reset'
+
+
+def request_reset(directory) -> None:
+    """
+    Elimina los snapshots y deja en 'directory' una marca de reset nueva. Cada proceso descarta
+    sus estadísticas acumuladas al ver la marca en su siguiente escritura, antes de guardar su
+    snapshot, así que el reset llega a todos los procesos en QUERY_STATS_FLUSH_SECONDS.
+
+    Args:
+        directory (str o Path): Directorio compartido de snapshots.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for path in directory.glob('*.json'):
+        path.unlink(missing_ok=True)
+    (directory / RESET_MARKER).write_text(f"{time.time_ns()}-{os.getpid()}")
+
+
+def read_reset_marker(directory):
+    """
+    Args:
+        directory (str o Path): Directorio de snapshots.
+
+    Returns:
+        str o None: Contenido de la marca de reset, o None si no hay.
+    """
+    try:
+        return (Path(directory) / RESET_MARKER).read_text()
+    except OSError:
+        return None
+
+
+def load_snapshots(directory) -> list:
+    """
+    Lee y concatena los snapshots de todos los procesos.
+
+    Args:
+        directory (str o Path): Directorio de snapshots.
+
+    Returns:
+        list: Entradas de todos los snapshots.
+    """
+    directory = Path(directory)
+    if not directory.is_dir():
+        return []
+    entries = []
+    for path in sorted(directory.glob('*.json')):
+        try:
+            entries.extend(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            # Snapshot eliminado o escrito a medias por otro proceso.
+            continue
+    return entries
+
+
+class QueryStatsWrapper:
+    """
+    Execute wrapper de Django (connection.execute_wrapper) que mide cada consulta, la agrega
+    en QueryStats y registra en el logger las que superan SLOW_QUERY_MS con su origen.
+
+    El snapshot se escribe en un hilo aparte cada 'flush_seconds': un error de disco se registra
+    en el logger y nunca llega a la consulta que disparó la escritura.
+    """
+
+    def __init__(self, stats: QueryStats, slow_ms: float, directory=None, flush_seconds: float = 60):
+        self.stats = stats
+        self.slow_ms = slow_ms
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self._next_flush = time.monotonic() + flush_seconds
+        self._flush_lock = threading.Lock()
+        self._reset_marker = read_reset_marker(directory) if directory is not None else None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            origin, stack = query_origin()
+            query_fingerprint = fingerprint(sql)
+            self.stats.record(query_fingerprint, origin, duration_ms)
+            if duration_ms >= self.slow_ms:
+                logger.warning(
+                    "Consulta lenta (%.1f ms) en %s desde %s: %s\n  %s",
+                    duration_ms, context['connection'].alias, origin, query_fingerprint, '\n  '.join(stack),
+                )
+            if self.directory is not None and time.monotonic() >= self._next_flush:
+                self._next_flush = time.monotonic() + self.flush_seconds
+                threading.Thread(target=self.flush, name='query-stats-flush', daemon=True).start()
+
+    def flush(self) -> None:
+        """
+        Guarda el snapshot del proceso, descartando antes las estadísticas si hay una marca de
+        reset nueva (query_stats --reset). Los errores de escritura se registran y no se propagan.
+        """
+        if not self._flush_lock.acquire(blocking=False):
+            return
+        try:
+            marker = read_reset_marker(self.directory)
+            if marker != self._reset_marker:
+                self._reset_marker = marker
+                self.stats.reset()
+            write_snapshot(self.stats, self.directory)
+        except OSError:
+            logger.exception("No se pudo guardar el snapshot de consultas en %s", self.directory)
+        finally:
+            self._flush_lock.release()
+
+
+query_stats = QueryStats()
+_wrapper = None
+
+
+def install_query_stats() -> None:
+    """
+    Instala QueryStatsWrapper en cada conexión nueva si QUERY_STATS_ENABLED está activo.
+    Se llama desde AppConfig.ready().
+    """
+    global _wrapper
+    if not getattr(settings, 'QUERY_STATS_ENABLED', False) or _wrapper is not None:
+        return
+    query_stats.samples = getattr(settings, 'QUERY_STATS_SAMPLES', 200)
+    _wrapper = QueryStatsWrapper(
+        query_stats,
+        slow_ms=getattr(settings, 'SLOW_QUERY_MS', 200),
+        directory=getattr(settings, 'QUERY_STATS_DIR', None),
+        flush_seconds=getattr(settings, 'QUERY_STATS_FLUSH_SECONDS', 60),
+    )
+    connection_created.connect(_attach_wrapper, dispatch_uid='asignacion_servicios.query_stats')
+    if _wrapper.directory is not None:
+        atexit.register(_wrapper.flush)
+
+
+def _attach_wrapper(sender, connection, **kwargs) -> None:
+    # connection_created se emite también al reconectar el mismo DatabaseWrapper.
+    if _wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_wrapper)
@@ -0,0 +1,88 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def replica_enabled() -> bool:
+    """
+    Indica si el enrutamiento de lecturas a la réplica está activo y configurado.
+
+    Returns:
+        bool: True si READ_REPLICA_ENABLED está activo y el alias de réplica existe en DATABASES.
+    """
+    return (
+        getattr(settings, 'READ_REPLICA_ENABLED', False)
+        and getattr(settings, 'READ_REPLICA_ALIAS', None) in settings.DATABASES
+    )
+
+
+@contextmanager
+def read_from_replica(enabled: bool = True):
+    """
+    Context manager que envía las lecturas del bloque a la réplica (o a la primaria si enabled=False).
+
+    Args:
+        enabled (bool): True para leer de la réplica, False para forzar la primaria.
+    """
+    token = _read_from_replica.set(enabled)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Router de base de datos con separación de lecturas y escrituras.
+
+    Las escrituras siempre van a la base de datos primaria ('default'). Las lecturas van a la
+    réplica solo cuando el contexto actual lo permite (ver read_from_replica), de modo que
+    el código fuera de peticiones de solo lectura, como comandos o transacciones de escritura,
+    sigue leyendo de la primaria.
+    """
+
+    def db_for_read(self, model, **hints):
+        """
+        Retorna el alias de la réplica si el contexto actual lee de ella.
+
+        Returns:
+            str o None: Alias de la réplica o None para usar la primaria.
+        """
+        if _read_from_replica.get() and replica_enabled():
+            return settings.READ_REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        """
+        Retorna siempre la primaria, incluso para instancias leídas de la réplica.
+
+        Returns:
+            str: Alias de la base de datos primaria.
+        """
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Permite relaciones entre objetos de la primaria y de la réplica, ya que contienen los mismos datos.
+
+        Returns:
+            bool o None: True si ambos objetos vienen de la primaria o de la réplica.
+        """
+        aliases = {DEFAULT_DB_ALIAS, getattr(settings, 'READ_REPLICA_ALIAS', None)}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Evita ejecutar migraciones sobre la réplica, que recibe los cambios por replicación.
+
+        Returns:
+            bool o None: False para la réplica, None para el resto.
+        """
+        if db == getattr(settings, 'READ_REPLICA_ALIAS', None):
+            return False
+        return None
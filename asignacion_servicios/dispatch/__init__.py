@@ -0,0 +1,5 @@
+from .offerBroker import Offer, OfferBroker, city_key
+from .rebalancer import allocate, distance_matrix, numpy_available, plan_moves
+from .driverScoring import CRITERIA, best_candidate, candidate_distances, eta_minutes, scoring_weights
+from .batching import group_pickups, route_order
+from .scheduleQueue import ScheduleQueue
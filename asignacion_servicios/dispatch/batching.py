@@ -0,0 +1,99 @@
+from .rebalancer import distance_matrix
+
+
+def group_pickups(pickups: list, radius_km: float, window_seconds: float, max_size: int) -> list:
+    """
+    Agrupa recogidas cercanas en el espacio y en el tiempo para que las atienda un solo conductor.
+
+    Recorre las recogidas de la más antigua a la más reciente; cada recogida aún sin grupo abre
+    uno y lo completa con las recogidas libres más cercanas de la misma ciudad, creadas dentro de
+    la ventana de tiempo y a menos de 'radius_km' de ella. Como las recogidas están ordenadas por
+    fecha, solo se revisan las que caen dentro de la ventana.
+
+    Args:
+        pickups (list): Tuplas (clave de ciudad, latitud, longitud, created_at) ordenadas por created_at.
+        radius_km (float): Distancia máxima entre la primera recogida del grupo y las demás.
+        window_seconds (float): Diferencia máxima de creación respecto a la primera recogida.
+        max_size (int): Número máximo de recogidas por grupo.
+
+    Returns:
+        list: Grupos como listas de índices de 'pickups'; el primero de cada grupo es la recogida más antigua.
+    """
+    grouped = [False] * len(pickups)
+    groups = []
+    for seed, (city, latitude, longitude, created_at) in enumerate(pickups):
+        if grouped[seed]:
+            continue
+        grouped[seed] = True
+        candidates = []
+        for index in range(seed + 1, len(pickups)):
+            other_city, _, _, other_created_at = pickups[index]
+            if (other_created_at - created_at).total_seconds() > window_seconds:
+                break
+            if not grouped[index] and other_city == city:
+                candidates.append(index)
+
+        group = [seed]
+        if candidates and max_size > 1:
+            distances = distance_matrix(
+                [(latitude, longitude)], [(pickups[i][1], pickups[i][2]) for i in candidates]
+            )[0]
+            nearest = sorted(
+                (distance, index) for distance, index in zip(list(distances), candidates) if distance <= radius_km
+            )
+            group.extend(index for _, index in nearest[:max_size - 1])
+        for index in group:
+            grouped[index] = True
+        groups.append(group)
+    return groups
+
+
+def route_order(start: tuple, stops: list) -> tuple:
+    """
+    Ordena las paradas de una ruta abierta que parte de 'start' minimizando la distancia total.
+
+    Construye la ruta con el vecino más cercano y la mejora con 2-opt (invertir tramos mientras
+    acorte la ruta), suficiente para los pocos puntos de un lote.
+
+    Args:
+        start (tuple): (lat, lng) de partida (posición del conductor).
+        stops (list): (lat, lng) de cada parada.
+
+    Returns:
+        tuple: (orden de índices de 'stops', distancia acumulada en km hasta cada parada, en ese orden)
+    """
+    if not stops:
+        return [], []
+    points = [start] + list(stops)
+    matrix = [list(row) for row in distance_matrix(points, points)]
+
+    route = [0]
+    pending = set(range(1, len(points)))
+    while pending:
+        current = route[-1]
+        nearest = min(pending, key=lambda point: (matrix[current][point], point))
+        route.append(nearest)
+        pending.remove(nearest)
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(route) - 1):
+            for j in range(i + 1, len(route)):
+                # Invertir route[i..j]: cambian las aristas (i-1, i) y (j, j+1); la ruta no vuelve al inicio.
+                before = matrix[route[i - 1]][route[i]]
+                after = matrix[route[i - 1]][route[j]]
+                if j + 1 < len(route):
+                    before += matrix[route[j]][route[j + 1]]
+                    after += matrix[route[i]][route[j + 1]]
+                if after < before - 1e-9:
+                    route[i:j + 1] = reversed(route[i:j + 1])
+                    improved = True
+
+    order = [point - 1 for point in route[1:]]
+    cumulative = []
+    travelled = 0.0
+    for previous, point in zip(route, route[1:]):
+        travelled += matrix[previous][point]
+        cumulative.append(travelled)
+    return order, cumulative
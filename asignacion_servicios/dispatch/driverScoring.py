@@ -0,0 +1,115 @@
+from django.conf import settings
+from .offerBroker import city_key
+from .rebalancer import distance_matrix, np
+
+# Criterios disponibles. En los de costo un valor menor es mejor; en los de beneficio, mayor.
+COST_CRITERIA = ('distance', 'eta', 'recent_completed')
+BENEFIT_CRITERIA = ('idle',)
+CRITERIA = COST_CRITERIA + BENEFIT_CRITERIA
+
+DEFAULT_PRESETS = {
+    'distance': {'distance': 1.0},
+}
+
+
+def scoring_weights(country: str, city: str) -> dict:
+    """
+    Obtiene los pesos de los criterios para una ciudad.
+
+    DISPATCH_SCORING_CITIES asocia la clave 'país|ciudad' (sin distinguir mayúsculas) a un preset
+    de DISPATCH_SCORING_PRESETS o a un diccionario de pesos; las demás ciudades usan el preset
+    DISPATCH_SCORING_DEFAULT ('distance': solo la distancia).
+
+    Args:
+        country (str): País.
+        city (str): Ciudad.
+
+    Raises:
+        ValueError: Si la configuración nombra un preset o un criterio inexistente.
+
+    Returns:
+        dict: Pesos por criterio, sin los nulos.
+    """
+    presets = {**DEFAULT_PRESETS, **getattr(settings, 'DISPATCH_SCORING_PRESETS', {})}
+    cities = {key.casefold(): value for key, value in getattr(settings, 'DISPATCH_SCORING_CITIES', {}).items()}
+    weights = cities.get(city_key(country, city), getattr(settings, 'DISPATCH_SCORING_DEFAULT', 'distance'))
+    if isinstance(weights, str):
+        if weights not in presets:
+            raise ValueError(f"Preset de puntuación desconocido: {weights}")
+        weights = presets[weights]
+    unknown = set(weights) - set(CRITERIA)
+    if unknown:
+        raise ValueError(f"Criterios de puntuación desconocidos: {', '.join(sorted(unknown))}")
+    return {name: float(weight) for name, weight in weights.items() if weight}
+
+
+def candidate_distances(origin: tuple, positions: list) -> list:
+    """
+    Calcula la distancia haversine (km) desde un punto a cada candidato.
+
+    Args:
+        origin (tuple): (lat, lng) de la recogida.
+        positions (list): (lat, lng) de cada candidato.
+
+    Returns:
+        list: Distancias (ndarray si NumPy está disponible).
+    """
+    if not positions:
+        return []
+    return distance_matrix([origin], positions)[0]
+
+
+def eta_minutes(distances, speed_kmh: float):
+    """
+    Estima el tiempo de llegada (minutos) de cada candidato a una velocidad media.
+
+    Args:
+        distances (list): Distancias en km (lista o ndarray).
+        speed_kmh (float): Velocidad media en km/h.
+
+    Returns:
+        list: Minutos por candidato, del mismo tipo que 'distances'.
+    """
+    if np is not None and isinstance(distances, np.ndarray):
+        return distances * (60.0 / speed_kmh)
+    return [distance * 60.0 / speed_kmh for distance in distances]
+
+
+def best_candidate(criteria: dict, weights: dict) -> int:
+    """
+    Elige el candidato de menor costo ponderado.
+
+    Cada criterio se normaliza entre 0 y 1 sobre todos los candidatos (los de beneficio se
+    invierten) y se suma multiplicado por su peso, con operaciones sobre arreglos completos.
+    En caso de empate gana el primer candidato.
+
+    Args:
+        criteria (dict): Valores de cada criterio, una lista por criterio con un valor por candidato.
+        weights (dict): Pesos por criterio.
+
+    Returns:
+        int: Índice del mejor candidato.
+    """
+    if np is not None:
+        total = None
+        for name, weight in weights.items():
+            values = np.asarray(criteria[name], dtype=float)
+            spread = values.max() - values.min()
+            cost = (values - values.min()) / spread if spread else np.zeros_like(values)
+            if name in BENEFIT_CRITERIA:
+                cost = 1.0 - cost if spread else cost
+            total = weight * cost if total is None else total + weight * cost
+        return int(np.argmin(total)) if total is not None else 0
+
+    size = len(next(iter(criteria.values()), []))
+    total = [0.0] * size
+    for name, weight in weights.items():
+        values = criteria[name]
+        low, high = min(values), max(values)
+        spread = high - low
+        for index, value in enumerate(values):
+            cost = (value - low) / spread if spread else 0.0
+            if name in BENEFIT_CRITERIA and spread:
+                cost = 1.0 - cost
+            total[index] += weight * cost
+    return min(range(size), key=total.__getitem__) if size else 0
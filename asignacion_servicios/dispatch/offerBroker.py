@@ -0,0 +1,189 @@
+import heapq
+import threading
+import time
+from collections import deque
+
+
+def city_key(country: str, city: str) -> str:
+    """
+    Construye la clave de shard de una ciudad, sin distinguir mayúsculas.
+
+    Args:
+        country (str): País.
+        city (str): Ciudad.
+
+    Returns:
+        str: Clave normalizada 'país|ciudad'.
+    """
+    return f"{(country or '').casefold()}|{(city or '').casefold()}"
+
+
+class Offer:
+    """
+    Oferta de un servicio a un conductor, con expiración.
+
+    Attributes:
+        service_id (int): ID del servicio ofrecido.
+        driver_id (int): ID del conductor al que se ofrece.
+        shard (str): Clave de la ciudad del servicio.
+        distance (float): Distancia en km del conductor a la recogida.
+        expires_at (float): Instante de expiración (time.monotonic()).
+        excluded (frozenset): Conductores que ya rechazaron o dejaron expirar el servicio.
+    """
+    __slots__ = ('service_id', 'driver_id', 'shard', 'distance', 'expires_at', 'excluded')
+
+    def __init__(self, service_id, driver_id, shard, distance, expires_at, excluded=frozenset()):
+        self.service_id = service_id
+        self.driver_id = driver_id
+        self.shard = shard
+        self.distance = distance
+        self.expires_at = expires_at
+        self.excluded = excluded
+
+    def to_dict(self) -> dict:
+        return {
+            'service_id': self.service_id,
+            'driver_id': self.driver_id,
+            'distance': self.distance,
+            'expires_in': max(0.0, round(self.expires_at - time.monotonic(), 1)),
+        }
+
+
+class _CityShard:
+    """
+    Estado de ofertas de una ciudad, protegido por su propio lock.
+    """
+    __slots__ = ('condition', 'by_driver', 'by_service', 'expiry')
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.by_driver = {}
+        self.by_service = {}
+        self.expiry = []
+
+
+class OfferBroker:
+    """
+    Colas de ofertas en memoria por conductor, particionadas por ciudad.
+
+    Cada ciudad tiene su propio lock y condición, de modo que publicar o esperar ofertas en una
+    ciudad no bloquea a las demás. Por conductor solo se guarda una cola mientras tiene ofertas
+    pendientes, y la expiración se gestiona con un heap por ciudad.
+
+    El estado vive en el proceso: con varios procesos web cada uno tiene sus propias colas.
+    """
+
+    def __init__(self):
+        self._shards = {}
+        self._shards_lock = threading.Lock()
+
+    def _shard(self, key: str) -> _CityShard:
+        shard = self._shards.get(key)
+        if shard is None:
+            with self._shards_lock:
+                shard = self._shards.setdefault(key, _CityShard())
+        return shard
+
+    def publish(self, offer: Offer) -> None:
+        """
+        Publica una oferta y despierta a los conductores que esperan en su ciudad.
+        """
+        shard = self._shard(offer.shard)
+        with shard.condition:
+            shard.by_service[offer.service_id] = offer
+            shard.by_driver.setdefault(offer.driver_id, deque()).append(offer)
+            heapq.heappush(shard.expiry, (offer.expires_at, offer.service_id, offer.driver_id))
+            shard.condition.notify_all()
+
+    def poll(self, driver_id: int, shard_key: str, timeout: float = 0):
+        """
+        Espera hasta 'timeout' segundos la siguiente oferta vigente para el conductor.
+
+        Args:
+            driver_id (int): ID del conductor.
+            shard_key (str): Clave de la ciudad del conductor.
+            timeout (float): Segundos máximos de espera.
+
+        Returns:
+            Offer o None: Oferta vigente más antigua o None si no llegó ninguna.
+        """
+        shard = self._shard(shard_key)
+        deadline = time.monotonic() + timeout
+        with shard.condition:
+            while True:
+                offer = self._first_live(shard, driver_id)
+                remaining = deadline - time.monotonic()
+                if offer is not None or remaining <= 0:
+                    return offer
+                shard.condition.wait(remaining)
+
+    def take(self, service_id: int, shard_key: str, driver_id: int = None):
+        """
+        Retira la oferta vigente de un servicio, opcionalmente solo si es del conductor indicado.
+
+        Returns:
+            Offer o None: Oferta retirada o None si no existe, expiró o es de otro conductor.
+        """
+        shard = self._shard(shard_key)
+        with shard.condition:
+            offer = shard.by_service.get(service_id)
+            if offer is None or (driver_id is not None and offer.driver_id != driver_id):
+                return None
+            self._remove(shard, offer)
+            if offer.expires_at <= time.monotonic():
+                return None
+            return offer
+
+    def pop_expired(self, now: float = None) -> list:
+        """
+        Retira y retorna todas las ofertas expiradas de todas las ciudades.
+
+        Args:
+            now (float, optional): Instante de referencia (time.monotonic()).
+
+        Returns:
+            list: Ofertas expiradas.
+        """
+        now = time.monotonic() if now is None else now
+        expired = []
+        for shard in list(self._shards.values()):
+            with shard.condition:
+                while shard.expiry and shard.expiry[0][0] <= now:
+                    _, service_id, driver_id = heapq.heappop(shard.expiry)
+                    offer = shard.by_service.get(service_id)
+                    # Entradas obsoletas del heap (oferta ya aceptada, rechazada o reemplazada).
+                    if offer is None or offer.driver_id != driver_id or offer.expires_at > now:
+                        continue
+                    self._remove(shard, offer)
+                    expired.append(offer)
+        return expired
+
+    def busy_drivers(self, shard_key: str) -> set:
+        """
+        Retorna los conductores de la ciudad que tienen ofertas pendientes.
+        """
+        shard = self._shard(shard_key)
+        with shard.condition:
+            return set(shard.by_driver)
+
+    @staticmethod
+    def _first_live(shard: _CityShard, driver_id: int):
+        queue = shard.by_driver.get(driver_id)
+        now = time.monotonic()
+        while queue:
+            if queue[0].expires_at > now:
+                return queue[0]
+            queue.popleft()
+        return None
+
+    @staticmethod
+    def _remove(shard: _CityShard, offer: Offer) -> None:
+        shard.by_service.pop(offer.service_id, None)
+        queue = shard.by_driver.get(offer.driver_id)
+        if queue is not None:
+            try:
+                queue.remove(offer)
+            except ValueError:
+                pass
+            if not queue:
+                del shard.by_driver[offer.driver_id]
@@ -0,0 +1,124 @@
+import math
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def numpy_available() -> bool:
+    """
+    Indica si NumPy está instalado y se usa para los cálculos vectorizados.
+    """
+    return np is not None
+
+
+def allocate(total: int, weights: list) -> list:
+    """
+    Reparte 'total' unidades enteras proporcionalmente a unos pesos (método del mayor resto).
+
+    Args:
+        total (int): Unidades a repartir.
+        weights (list): Pesos no negativos.
+
+    Returns:
+        list: Unidades asignadas a cada peso; suman 'total' si algún peso es positivo.
+    """
+    weight_sum = sum(weights)
+    if total <= 0 or weight_sum <= 0:
+        return [0] * len(weights)
+    if np is not None:
+        quota = total * np.asarray(weights, dtype=float) / weight_sum
+        shares = np.floor(quota).astype(int)
+        rest = total - int(shares.sum())
+        shares[np.argsort(-(quota - shares), kind='stable')[:rest]] += 1
+        return shares.tolist()
+    quota = [total * weight / weight_sum for weight in weights]
+    shares = [int(value) for value in quota]
+    rest = total - sum(shares)
+    for index in sorted(range(len(quota)), key=lambda i: shares[i] - quota[i])[:rest]:
+        shares[index] += 1
+    return shares
+
+
+def distance_matrix(origins: list, destinations: list) -> list:
+    """
+    Calcula la distancia haversine (km) entre cada origen y cada destino.
+
+    Args:
+        origins (list): Pares (lat, lng).
+        destinations (list): Pares (lat, lng).
+
+    Returns:
+        list: Matriz len(origins) x len(destinations) (ndarray si NumPy está disponible).
+    """
+    if np is not None:
+        a = np.radians(np.asarray(origins, dtype=float).reshape(-1, 2))[:, None, :]
+        b = np.radians(np.asarray(destinations, dtype=float).reshape(-1, 2))[None, :, :]
+        dlat = b[..., 0] - a[..., 0]
+        dlng = b[..., 1] - a[..., 1]
+        h = np.sin(dlat / 2) ** 2 + np.cos(a[..., 0]) * np.cos(b[..., 0]) * np.sin(dlng / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(h, 0.0, 1.0)))
+    matrix = []
+    for lat1, lng1 in origins:
+        row = []
+        for lat2, lng2 in destinations:
+            dlat = math.radians(lat2 - lat1)
+            dlng = math.radians(lng2 - lng1)
+            h = math.sin(dlat / 2) ** 2 + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+            row.append(2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(max(h, 0.0), 1.0))))
+        matrix.append(row)
+    return matrix
+
+
+def plan_moves(supply: list, demand: list, centers: list, max_distance_km: float) -> list:
+    """
+    Resuelve el rebalanceo de conductores entre celdas como un problema de transporte.
+
+    Los conductores disponibles se reparten entre las celdas en proporción a la demanda prevista;
+    las celdas con exceso envían conductores a las celdas con déficit, emparejando primero los
+    pares más cercanos (heurística voraz sobre la matriz de distancias ordenada).
+
+    Args:
+        supply (list): Conductores disponibles por celda.
+        demand (list): Demanda prevista por celda.
+        centers (list): Centro (lat, lng) de cada celda.
+        max_distance_km (float): Distancia máxima de un movimiento.
+
+    Returns:
+        list: Tuplas (celda origen, celda destino, conductores, distancia km) con índices de celda.
+    """
+    target = allocate(sum(supply), demand)
+    excess = [available - wanted for available, wanted in zip(supply, target)]
+    sources = [index for index, value in enumerate(excess) if value > 0]
+    sinks = [index for index, value in enumerate(excess) if value < 0]
+    if not sources or not sinks:
+        return []
+
+    distances = distance_matrix([centers[i] for i in sources], [centers[j] for j in sinks])
+    if np is not None:
+        order = np.argsort(distances, axis=None, kind='stable')
+        rows, cols = np.unravel_index(order, distances.shape)
+        pairs = zip(rows.tolist(), cols.tolist(), distances.ravel()[order].tolist())
+    else:
+        pairs = sorted(
+            ((row, col, value) for row, values in enumerate(distances) for col, value in enumerate(values)),
+            key=lambda pair: pair[2]
+        )
+
+    remaining_out = [excess[i] for i in sources]
+    remaining_in = [-excess[j] for j in sinks]
+    pending = min(sum(remaining_out), sum(remaining_in))
+    moves = []
+    for row, col, distance in pairs:
+        if pending == 0 or distance > max_distance_km:
+            break
+        count = min(remaining_out[row], remaining_in[col])
+        if count:
+            moves.append((sources[row], sinks[col], count, distance))
+            remaining_out[row] -= count
+            remaining_in[col] -= count
+            pending -= count
+    return moves
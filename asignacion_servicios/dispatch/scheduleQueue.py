@@ -0,0 +1,88 @@
+import heapq
+
+
+class ScheduleQueue:
+    """
+    Cola en memoria de servicios programados, ordenada por momento de despacho (min-heap).
+
+    Reprogramar un servicio inserta una entrada nueva; la anterior queda obsoleta y se descarta
+    al salir del heap (borrado perezoso), por lo que push y pop cuestan O(log n).
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._due = {}
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, service_id) -> bool:
+        return service_id in self._due
+
+    def due_at(self, service_id: int):
+        """
+        Args:
+            service_id (int): ID del servicio.
+
+        Returns:
+            datetime o None: Momento de despacho programado, o None si no está en la cola.
+        """
+        return self._due.get(service_id)
+
+    def push(self, service_id: int, due) -> None:
+        """
+        Programa (o reprograma) el despacho de un servicio.
+
+        Args:
+            service_id (int): ID del servicio.
+            due (datetime): Momento de despacho.
+        """
+        if self._due.get(service_id) == due:
+            return
+        self._due[service_id] = due
+        heapq.heappush(self._heap, (due, service_id))
+
+    def discard(self, service_id: int) -> None:
+        """
+        Quita un servicio de la cola si estaba programado.
+
+        Args:
+            service_id (int): ID del servicio.
+        """
+        self._due.pop(service_id, None)
+
+    def next_due(self):
+        """
+        Returns:
+            datetime o None: Momento de despacho más próximo, o None si la cola está vacía.
+        """
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now, limit: int) -> list:
+        """
+        Retira hasta 'limit' servicios cuyo momento de despacho ya llegó.
+
+        Args:
+            now (datetime): Momento actual.
+            limit (int): Número máximo de servicios.
+
+        Returns:
+            list: IDs de los servicios en orden de despacho.
+        """
+        due = []
+        while len(due) < limit:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, service_id = heapq.heappop(self._heap)
+            del self._due[service_id]
+            due.append(service_id)
+        return due
+
+    def _drop_stale(self) -> None:
+        """
+        Descarta de la cima del heap las entradas reprogramadas o eliminadas.
+        """
+        while self._heap and self._due.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
@@ -0,0 +1,39 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from asignacion_servicios.services import BatchingService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Agrupa los servicios pendientes con recogidas cercanas y los asigna en lotes (DISPATCH_BATCHING_ENABLED).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sleep', type=float, default=5.0, help='Segundos entre ciclos (por defecto 5).')
+        parser.add_argument('--once', action='store_true', help='Ejecuta un solo ciclo y termina.')
+
+    def handle(self, *args, **options):
+        groups = services = failures = 0
+        try:
+            while True:
+                try:
+                    assigned_groups, assigned_services = BatchingService.run_once()
+                    failures = 0
+                except Exception:
+                    if options['once']:
+                        raise
+                    failures += 1
+                    logger.exception("Error al asignar lotes; reintento en el siguiente ciclo")
+                    close_old_connections()
+                    time.sleep(min(options['sleep'] * 2 ** failures, 60))
+                    continue
+                groups += assigned_groups
+                services += assigned_services
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Grupos asignados: {groups} ({services} servicios)"))
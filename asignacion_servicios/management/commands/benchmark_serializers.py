@@ -0,0 +1,98 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from asignacion_servicios.models import Address, Client, Driver, Service
+from asignacion_servicios.renderers import FastJSONRenderer, orjson_available
+from asignacion_servicios.serializers import (
+    DriverSerializer, DriverListSerializer, ServiceSerializer, ServiceListSerializer
+)
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara el tiempo de serialización de listados entre ServiceSerializer/DriverSerializer + JSONRenderer '
+        'y los serializadores basados en .values_list() + FastJSONRenderer, verificando que la salida sea idéntica byte a byte.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Filas por listado (por defecto 100).')
+        parser.add_argument('--iterations', type=int, default=50, help='Repeticiones por medición (por defecto 50).')
+
+    def handle(self, *args, **options):
+        rows, iterations = options['rows'], options['iterations']
+        self.stdout.write(f"orjson disponible: {'sí' if orjson_available() else 'no (se usa la biblioteca estándar)'}")
+        try:
+            with transaction.atomic():
+                self._ensure_rows(rows)
+                self._compare('Service', Service.objects.all()[:rows], ServiceSerializer, ServiceListSerializer, iterations)
+                self._compare('Driver', Driver.objects.all()[:rows], DriverSerializer, DriverListSerializer, iterations)
+                # Los datos de prueba creados se descartan al terminar.
+                raise _Rollback()
+        except _Rollback:
+            pass
+
+    def _compare(self, label, queryset, serializer_class, list_serializer_class, iterations):
+        """
+        Mide ambas rutas de serialización sobre el mismo queryset y verifica que produzcan los mismos bytes.
+
+        Raises:
+            CommandError: Si las salidas no son idénticas.
+        """
+        def baseline():
+            return JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+
+        def fast():
+            list_serializer = list_serializer_class()
+            return FastJSONRenderer().render(list_serializer.to_representation(list_serializer.values(queryset.all())))
+
+        expected, actual = baseline(), fast()
+        if expected != actual:
+            raise CommandError(f"{label}: la salida rápida no coincide byte a byte con {serializer_class.__name__}.")
+
+        baseline_ms = self._measure(baseline, iterations)
+        fast_ms = self._measure(fast, iterations)
+        self.stdout.write(
+            f"{label} ({queryset.count()} filas, {len(expected)} bytes): "
+            f"{serializer_class.__name__} {baseline_ms:.2f} ms, {list_serializer_class.__name__} {fast_ms:.2f} ms, "
+            f"x{baseline_ms / fast_ms:.1f} - salida idéntica"
+        )
+
+    @staticmethod
+    def _measure(func, iterations) -> float:
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        return (time.perf_counter() - start) * 1000 / iterations
+
+    @staticmethod
+    def _ensure_rows(rows):
+        """
+        Crea conductores y servicios de prueba si la base de datos tiene menos de 'rows' filas.
+        """
+        address, _ = Address.objects.get_or_create(
+            name="Benchmark", country="Colombia", city="Bogotá", street="Calle 1",
+            latitude=4.60971, longitude=-74.08175
+        )
+        client, _ = Client.objects.get_or_create(
+            phone="+570000000000",
+            defaults={'name': "Cliente Benchmark", 'email': "benchmark@example.com", 'address': address}
+        )
+        missing_drivers = rows - Driver.objects.count()
+        Driver.objects.bulk_create([
+            Driver(name=f"Conductor {i}", phone=f"+57{i:010d}", address=address, is_available=bool(i % 2))
+            for i in range(max(missing_drivers, 0))
+        ])
+        drivers = list(Driver.objects.all()[:rows])
+        missing_services = rows - Service.objects.count()
+        Service.objects.bulk_create([
+            Service(
+                pickup_address=address, client=client, driver=drivers[i % len(drivers)],
+                status='in_progress', estimated_time=12.5 + i, distance=3.25 + i / 7
+            )
+            for i in range(max(missing_services, 0))
+        ])
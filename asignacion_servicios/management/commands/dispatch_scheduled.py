@@ -0,0 +1,53 @@
+import logging
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+from asignacion_servicios.dispatch import ScheduleQueue
+from asignacion_servicios.services import SchedulingService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Asigna los servicios programados (scheduled_for) DISPATCH_SCHEDULE_LEAD_SECONDS antes de su hora '
+        'de recogida, recargando la cola desde la base de datos cada DISPATCH_SCHEDULE_REFRESH_SECONDS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=None, help='Servicios por lote (por defecto DISPATCH_SCHEDULE_BATCH_SIZE).')
+        parser.add_argument('--once', action='store_true', help='Despacha los servicios vencidos una vez y termina.')
+
+    def handle(self, *args, **options):
+        refresh_every = timedelta(seconds=getattr(settings, 'DISPATCH_SCHEDULE_REFRESH_SECONDS', 60))
+        queue = ScheduleQueue()
+        next_refresh = timezone.now()
+        assigned = failures = 0
+        try:
+            while True:
+                now = timezone.now()
+                try:
+                    if now >= next_refresh:
+                        SchedulingService.refresh(queue, now)
+                        next_refresh = now + refresh_every
+                    assigned += SchedulingService.dispatch_due(queue, now, options['batch'])
+                    failures = 0
+                except Exception:
+                    if options['once']:
+                        raise
+                    # Los servicios que no se despacharon se recargan desde la base de datos.
+                    failures += 1
+                    logger.exception("Error al despachar servicios programados; reintento en el siguiente ciclo")
+                    close_old_connections()
+                    next_refresh = timezone.now()
+                    time.sleep(min(2 ** failures, 60))
+                    continue
+                if options['once']:
+                    break
+                time.sleep(SchedulingService.seconds_until_next(queue, next_refresh))
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Servicios programados asignados: {assigned}"))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from asignacion_servicios.services import AddressService
+
+
+class Command(BaseCommand):
+    help = (
+        'Fusiona las direcciones duplicadas (misma ciudad y calle normalizadas y misma celda de coordenadas), '
+        'reasignando sus conductores, clientes y servicios a la dirección más antigua.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo muestra cuántas direcciones se fusionarían.')
+        parser.add_argument(
+            '--renormalize', action='store_true',
+            help='Recalcula antes los campos normalizados (por ejemplo tras cambiar ADDRESS_GRID_DEGREES).'
+        )
+
+    def handle(self, *args, **options):
+        if options['renormalize']:
+            self.stdout.write(f"Direcciones normalizadas: {AddressService.renormalize()}")
+        groups, removed = AddressService.merge_duplicates(dry_run=options['dry_run'])
+        prefix = 'Se eliminarían' if options['dry_run'] else 'Eliminadas'
+        self.stdout.write(self.style.SUCCESS(f"Grupos de duplicados: {groups}. {prefix}: {removed} direcciones."))
@@ -0,0 +1,41 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from asignacion_servicios.services import TokenRevocationService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Elimina por lotes los tokens de refresco emitidos y revocados que ya expiraron.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=None, help='Tokens por lote (por defecto TOKEN_PURGE_BATCH_SIZE).')
+        parser.add_argument('--every', type=float, default=None, help='Repite la purga cada N segundos en lugar de terminar.')
+
+    def handle(self, *args, **options):
+        purged = failures = 0
+        try:
+            while True:
+                try:
+                    count = TokenRevocationService.purge_expired(batch_size=options['batch'])
+                    failures = 0
+                except Exception:
+                    if options['every'] is None:
+                        raise
+                    # Los lotes ya eliminados no se repiten: se reintenta con los restantes.
+                    failures += 1
+                    logger.exception("Error al purgar tokens expirados; reintento en el siguiente ciclo")
+                    close_old_connections()
+                    time.sleep(min(options['every'], 2 ** failures, 60))
+                    continue
+                purged += count
+                if options['every'] is None:
+                    break
+                if count:
+                    self.stdout.write(f"Tokens expirados eliminados: {count}")
+                time.sleep(options['every'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Tokens expirados eliminados: {purged}"))
@@ -0,0 +1,36 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from asignacion_servicios.db import load_snapshots, request_reset, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Muestra las consultas SQL más costosas según los snapshots de QUERY_STATS_DIR '
+        '(requiere QUERY_STATS_ENABLED en los procesos de la API y los workers).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20, help='Número de filas (por defecto 20).')
+        parser.add_argument('--by', choices=('fingerprint', 'origin'), default='fingerprint', help='Agrupar por huella SQL o por método que la ejecuta.')
+        parser.add_argument('--sort', choices=('total_ms', 'p95_ms', 'max_ms', 'count'), default='total_ms', help='Criterio de orden (por defecto total_ms).')
+        parser.add_argument('--reset', action='store_true', help='Elimina los snapshots después de mostrarlos y reinicia las estadísticas de cada proceso en su siguiente escritura.')
+
+    def handle(self, *args, **options):
+        directory = settings.QUERY_STATS_DIR
+        rows = summarize(load_snapshots(directory), by=options['by'], sort=options['sort'], top=options['top'])
+        if not rows:
+            self.stdout.write("No hay estadísticas de consultas.")
+        related = 'origins' if options['by'] == 'fingerprint' else 'fingerprints'
+        for row in rows:
+            self.stdout.write(
+                f"{row['count']:>8} consultas  total {row['total_ms']:>10.1f} ms  media {row['mean_ms']:>7.2f} ms  "
+                f"p95 {row['p95_ms']:>7.2f} ms  máx {row['max_ms']:>7.1f} ms"
+            )
+            self.stdout.write(f"  {row['key']}")
+            for value in row[related][:5]:
+                self.stdout.write(f"    ← {value}" if related == 'origins' else f"    → {value}")
+        if options['reset']:
+            request_reset(directory)
+            self.stdout.write(self.style.SUCCESS(
+                "Snapshots eliminados; cada proceso reinicia sus estadísticas en su siguiente escritura."
+            ))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from asignacion_servicios.services import HeatmapService
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula las celdas del mapa de demanda a partir de todos los servicios. '
+        'Necesario tras cambiar HEATMAP_GEOHASH_PRECISION o HEATMAP_WINDOW_MINUTES.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Servicios leídos por consulta.')
+
+    def handle(self, *args, **options):
+        tiles = HeatmapService.rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Mapa de demanda reconstruido: {tiles} celdas."))
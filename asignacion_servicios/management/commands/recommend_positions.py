@@ -0,0 +1,19 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from asignacion_servicios.services import RepositioningService
+
+
+class Command(BaseCommand):
+    help = (
+        'Calcula dónde deberían esperar los conductores disponibles según la demanda prevista. '
+        'Pensado para ejecutarse periódicamente (cron), por ejemplo cada 15 minutos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours-ahead', type=float, default=1, help='Horas hasta el momento objetivo.')
+
+    def handle(self, *args, **options):
+        at = timezone.now() + timedelta(hours=options['hours_ahead'])
+        moved = RepositioningService.recommend(at)
+        self.stdout.write(self.style.SUCCESS(f"Sugerencias calculadas: {moved} conductores a reubicar."))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from asignacion_servicios.services import DriverService
+
+
+class Command(BaseCommand):
+    help = (
+        'Recalcula la disponibilidad de los conductores a partir de sus servicios abiertos. '
+        'Pensado para ejecutarse periódicamente (cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Solo muestra cuántos conductores se corregirían.')
+
+    def handle(self, *args, **options):
+        released, occupied = DriverService.reconcile_availability(dry_run=options['dry_run'])
+        prefix = 'Se corregirían' if options['dry_run'] else 'Corregidos'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}: {released} conductores liberados, {occupied} conductores marcados como ocupados."
+        ))
@@ -0,0 +1,48 @@
+import logging
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from asignacion_servicios.outbox import load_sinks
+from asignacion_servicios.services import OutboxService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Publica los eventos pendientes de la tabla outbox en los sinks configurados (OUTBOX_SINKS).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=None, help='Eventos por lote (por defecto OUTBOX_BATCH_SIZE).')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Segundos de espera cuando no hay eventos (por defecto 1).')
+        parser.add_argument('--once', action='store_true', help='Publica los eventos pendientes una vez y termina.')
+        parser.add_argument('--purge-days', type=int, default=None, help='Elimina antes los eventos publicados hace más de N días.')
+
+    def handle(self, *args, **options):
+        if options['purge_days'] is not None:
+            purged = OutboxService.purge_published(options['purge_days'])
+            self.stdout.write(f"Eventos publicados eliminados: {purged}")
+
+        sinks = load_sinks()
+        published = failures = 0
+        try:
+            while True:
+                try:
+                    count = OutboxService.relay_batch(sinks, options['batch'])
+                    failures = 0
+                except Exception:
+                    if options['once']:
+                        raise
+                    # El lote se revirtió: se reintenta en el siguiente ciclo.
+                    failures += 1
+                    logger.exception("Error al publicar eventos de la outbox; reintento en el siguiente ciclo")
+                    close_old_connections()
+                    time.sleep(min(options['sleep'] * 2 ** failures, 60))
+                    continue
+                published += count
+                if count == 0:
+                    if options['once']:
+                        break
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Eventos publicados: {published}"))
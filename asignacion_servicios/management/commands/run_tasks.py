@@ -0,0 +1,50 @@
+import logging
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from asignacion_servicios.services import TaskService
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = 'Ejecuta las tareas en segundo plano encoladas (notificaciones y otros trabajos no críticos).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=50, help='Tareas reclamadas por ciclo (por defecto 50).')
+        parser.add_argument('--sleep', type=float, default=1.0, help='Segundos de espera cuando no hay tareas (por defecto 1).')
+        parser.add_argument('--once', action='store_true', help='Procesa las tareas pendientes una vez y termina.')
+
+    def handle(self, *args, **options):
+        batch, sleep, once = options['batch'], options['sleep'], options['once']
+        requeue_every = getattr(settings, 'TASKS_REQUEUE_SECONDS', 60)
+        next_requeue = 0.0
+        processed = failures = 0
+        try:
+            while True:
+                try:
+                    # Las tareas de workers caídos se reencolan periódicamente, no solo al arrancar.
+                    if time.monotonic() >= next_requeue:
+                        requeued = TaskService.requeue_stale()
+                        if requeued:
+                            self.stdout.write(f"Tareas reencoladas de workers detenidos: {requeued}")
+                        next_requeue = time.monotonic() + requeue_every
+                    count = TaskService.run_due(batch)
+                    failures = 0
+                except Exception:
+                    if once:
+                        raise
+                    failures += 1
+                    logger.exception("Error en el worker de tareas; reintento en el siguiente ciclo")
+                    close_old_connections()
+                    time.sleep(min(sleep * 2 ** failures, 60))
+                    continue
+                processed += count
+                if once and count < batch:
+                    break
+                if count == 0:
+                    time.sleep(sleep)
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Tareas procesadas: {processed}"))
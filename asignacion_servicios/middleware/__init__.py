@@ -0,0 +1,3 @@
+from .replicaMiddleware import ReplicaRoutingMiddleware
+from .profilingMiddleware import ProfilingMiddleware, pyinstrument_available
+from .compressionMiddleware import CompressionMiddleware, brotli_available
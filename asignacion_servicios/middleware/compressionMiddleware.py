@@ -0,0 +1,102 @@
+import gzip
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+
+def brotli_available() -> bool:
+    """
+    Indica si brotli está instalado para comprimir respuestas con 'br'.
+    """
+    return brotli is not None
+
+
+class CompressionMiddleware:
+    """
+    Middleware que comprime las respuestas según Accept-Encoding: brotli ('br', si está
+    instalado) o gzip.
+
+    Solo comprime respuestas no streaming de tipos de texto (JSON, HTML, texto) con al menos
+    COMPRESSION_MIN_BYTES bytes, en las que comprimir compensa. Respeta los valores q de
+    Accept-Encoding (q=0 excluye una codificación) y, con la misma preferencia, elige brotli.
+    Añade 'Vary: Accept-Encoding' para que las cachés intermedias separen las variantes.
+    """
+
+    COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'image/svg+xml')
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'COMPRESSION_ENABLED', True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.min_bytes = getattr(settings, 'COMPRESSION_MIN_BYTES', 1024)
+        self.gzip_level = getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6)
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5)
+        self.encodings = ('br', 'gzip') if brotli_available() else ('gzip',)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or len(response.content) < self.min_bytes
+            or not response.get('Content-Type', '').startswith(self.COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = self._negotiate(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(response.content, compresslevel=self.gzip_level, mtime=0)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # El cuerpo ya no es idéntico byte a byte al de la versión sin comprimir.
+            response['ETag'] = 'W/' + etag
+        return response
+
+    def _negotiate(self, accept_encoding: str):
+        """
+        Elige la codificación soportada con mayor valor q en Accept-Encoding.
+
+        Args:
+            accept_encoding (str): Valor del encabezado, por ejemplo 'gzip, br;q=0.9, *;q=0'.
+
+        Returns:
+            str o None: 'br', 'gzip' o None si el cliente no acepta ninguna.
+        """
+        weights = {}
+        for part in accept_encoding.split(','):
+            name, _, params = part.strip().partition(';')
+            name = name.strip().lower()
+            if not name:
+                continue
+            quality = 1.0
+            params = params.strip()
+            if params.startswith('q='):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            weights[name] = quality
+
+        best, best_quality = None, 0.0
+        for encoding in self.encodings:
+            quality = weights.get(encoding, weights.get('*', 0.0))
+            if quality > best_quality:
+                best, best_quality = encoding, quality
+        return best
@@ -0,0 +1,133 @@
+import cProfile
+import os
+import random
+import re
+import time
+from pathlib import Path
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+try:
+    from pyinstrument import Profiler as StatisticalProfiler
+    from pyinstrument.renderers import SpeedscopeRenderer
+except ImportError:  # pragma: no cover - depende del entorno
+    StatisticalProfiler = None
+
+
+def pyinstrument_available() -> bool:
+    """
+    Indica si pyinstrument está instalado para el perfil estadístico.
+    """
+    return StatisticalProfiler is not None
+
+
+class ProfilingMiddleware:
+    """
+    Middleware que perfila peticiones bajo demanda y guarda el perfil en PROFILING_DIR.
+
+    Se perfila una petición si un usuario staff (autenticado con su JWT) envía el encabezado
+    'X-Profile: 1' o el parámetro '?profile=1', o por muestreo, una de cada PROFILING_SAMPLE_RATE
+    peticiones. El perfil cubre toda la vista (serializers, ServiceService, repositorios y SQL).
+
+    Con PROFILING_ENGINE='cprofile' se guardan archivos .prof (pstats; se abren con
+    'python -m pstats', snakeviz o flameprof). Con 'pyinstrument' (si está instalado) se guarda un
+    perfil estadístico .speedscope.json para https://www.speedscope.app. Solo se conservan los
+    PROFILING_MAX_FILES perfiles más recientes. Si PROFILING_ENABLED es False el middleware
+    se desactiva al arrancar y no añade costo.
+    """
+
+    HEADER = 'HTTP_X_PROFILE'
+    QUERY_PARAM = 'profile'
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.directory = Path(getattr(settings, 'PROFILING_DIR', settings.BASE_DIR / 'profiles'))
+        self.sample_rate = getattr(settings, 'PROFILING_SAMPLE_RATE', 0)
+        self.max_files = getattr(settings, 'PROFILING_MAX_FILES', 200)
+        engine = getattr(settings, 'PROFILING_ENGINE', 'cprofile')
+        self.statistical = engine == 'pyinstrument' and pyinstrument_available()
+
+    def __call__(self, request):
+        requested = self._requested(request)
+        if not requested and not self._sampled():
+            return self.get_response(request)
+
+        started = time.perf_counter()
+        if self.statistical:
+            profiler = StatisticalProfiler()
+            profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                profiler.stop()
+        else:
+            profiler = cProfile.Profile()
+            response = profiler.runcall(self.get_response, request)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        filename = self._save(profiler, request, elapsed_ms)
+        if requested:
+            response['X-Profile-File'] = filename
+        return response
+
+    def _requested(self, request) -> bool:
+        """
+        Indica si la petición pide ser perfilada y la envía un usuario staff con un JWT válido.
+        """
+        if request.META.get(self.HEADER) != '1' and request.GET.get(self.QUERY_PARAM) != '1':
+            return False
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except (InvalidToken, TokenError, APIException):
+            return False
+        return result is not None and result[0].is_staff
+
+    def _sampled(self) -> bool:
+        """
+        Indica si la petición entra en el muestreo de una de cada PROFILING_SAMPLE_RATE.
+        """
+        return self.sample_rate > 0 and random.randrange(self.sample_rate) == 0
+
+    def _save(self, profiler, request, elapsed_ms: float) -> str:
+        """
+        Guarda el perfil con un nombre que identifica la petición y elimina los más antiguos.
+
+        Args:
+            profiler: Perfil de cProfile o pyinstrument ya detenido.
+            request (HttpRequest): Petición perfilada.
+            elapsed_ms (float): Duración de la petición en milisegundos.
+
+        Returns:
+            str: Nombre del archivo guardado.
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', request.path).strip('-') or 'root'
+        stem = f"{time.strftime('%Y%m%dT%H%M%S')}-{time.time_ns() % 1_000_000:06d}-{request.method}-{slug}-{elapsed_ms:.0f}ms"
+        if self.statistical:
+            filename = f"{stem}.speedscope.json"
+            (self.directory / filename).write_text(profiler.output(renderer=SpeedscopeRenderer()))
+        else:
+            filename = f"{stem}.prof"
+            profiler.dump_stats(self.directory / filename)
+        self._rotate()
+        return filename
+
+    def _rotate(self) -> None:
+        """
+        Elimina los perfiles más antiguos cuando hay más de PROFILING_MAX_FILES.
+        """
+        profiles = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.is_file()),
+            key=lambda entry: entry.stat().st_mtime_ns,
+        )
+        for entry in profiles[:max(len(profiles) - self.max_files, 0)]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                # Otro proceso ya lo eliminó.
+                pass
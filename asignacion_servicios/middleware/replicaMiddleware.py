@@ -0,0 +1,66 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import cache
+from asignacion_servicios.db import read_from_replica
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Middleware que decide por petición si las lecturas van a la réplica.
+
+    Los métodos seguros (GET, HEAD, OPTIONS) leen de la réplica. Tras una escritura exitosa
+    (POST, PUT, PATCH, DELETE) la sesión queda fijada a la primaria durante
+    READ_REPLICA_STICKY_SECONDS para que el cliente lea sus propias escrituras. La sesión se
+    identifica por una cookie y, para clientes que no guardan cookies, por el encabezado
+    Authorization.
+    """
+
+    PIN_COOKIE = 'replica_pin'
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        use_replica = request.method in SAFE_METHODS and not self._is_pinned(request)
+        with read_from_replica(use_replica):
+            response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            self._pin(request, response)
+        return response
+
+    def _sticky_seconds(self) -> int:
+        return getattr(settings, 'READ_REPLICA_STICKY_SECONDS', 5)
+
+    def _auth_cache_key(self, request):
+        """
+        Construye la clave de caché que identifica la sesión a partir del encabezado Authorization.
+
+        Returns:
+            str o None: Clave de caché o None si la petición no trae Authorization.
+        """
+        authorization = request.META.get('HTTP_AUTHORIZATION')
+        if not authorization:
+            return None
+        return 'replica_pin:' + hashlib.sha256(authorization.encode()).hexdigest()
+
+    def _is_pinned(self, request) -> bool:
+        """
+        Indica si la sesión hizo una escritura reciente y debe leer de la primaria.
+        """
+        if request.COOKIES.get(self.PIN_COOKIE):
+            return True
+        key = self._auth_cache_key(request)
+        return key is not None and cache.get(key) is not None
+
+    def _pin(self, request, response) -> None:
+        """
+        Fija la sesión a la primaria durante READ_REPLICA_STICKY_SECONDS.
+        """
+        seconds = self._sticky_seconds()
+        response.set_cookie(self.PIN_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+        key = self._auth_cache_key(request)
+        if key is not None:
+            cache.set(key, True, timeout=seconds)
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:21
+
+import math
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+
+# Copias de asignacion_servicios.utils.addressNormalizer al crear la migración, para que cambios
+# posteriores en el normalizador no alteren lo que hace.
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_text(value):
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    without_marks = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(' ', without_marks.casefold()).strip()
+
+
+def grid_cell(latitude, longitude):
+    size = getattr(settings, 'ADDRESS_GRID_DEGREES', 0.0001)
+    return f"{math.floor(latitude / size)}:{math.floor(longitude / size)}"
+
+
+def normalize_addresses(apps, schema_editor):
+    Address = apps.get_model('asignacion_servicios', 'Address')
+    batch = []
+    for address in Address.objects.only('id', 'city', 'street', 'latitude', 'longitude').iterator(chunk_size=2000):
+        address.normalized_city = normalize_text(address.city)
+        address.normalized_street = normalize_text(address.street)
+        address.grid_cell = grid_cell(address.latitude, address.longitude)
+        batch.append(address)
+        if len(batch) >= 2000:
+            Address.objects.bulk_update(batch, ['normalized_city', 'normalized_street', 'grid_cell'])
+            batch = []
+    if batch:
+        Address.objects.bulk_update(batch, ['normalized_city', 'normalized_street', 'grid_cell'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignacion_servicios', '0006_address_lat_lng_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='grid_cell',
+            field=models.CharField(default='', editable=False, max_length=32),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='normalized_city',
+            field=models.CharField(default='', editable=False, max_length=100),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='normalized_street',
+            field=models.CharField(default='', editable=False, max_length=200),
+        ),
+        migrations.RunPython(normalize_addresses, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['grid_cell', 'normalized_city', 'normalized_street'], name='addresses_dedupe_idx'),
+        ),
+    ]
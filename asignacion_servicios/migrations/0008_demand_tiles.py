@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignacion_servicios', '0007_address_normalized_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DemandTile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('geohash', models.CharField(max_length=12)),
+                ('window_start', models.DateTimeField()),
+                ('requested', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+                ('canceled', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Demand tile',
+                'verbose_name_plural': 'Demand tiles',
+                'db_table': 'demand_tiles',
+                'indexes': [models.Index(fields=['window_start'], name='demand_tiles_window_idx')],
+                'constraints': [models.UniqueConstraint(fields=('geohash', 'window_start'), name='unique_demand_tile')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignacion_servicios', '0008_demand_tiles'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DriverRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('target_geohash', models.CharField(max_length=12)),
+                ('target_latitude', models.FloatField()),
+                ('target_longitude', models.FloatField()),
+                ('distance_km', models.FloatField()),
+                ('expected_demand', models.FloatField()),
+                ('valid_for', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('driver', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='recommendation', to='asignacion_servicios.driver')),
+            ],
+            options={
+                'verbose_name': 'Driver recommendation',
+                'verbose_name_plural': 'Driver recommendations',
+                'db_table': 'driver_recommendations',
+                'ordering': ['driver_id'],
+            },
+        ),
+    ]
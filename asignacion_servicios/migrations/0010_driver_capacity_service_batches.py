@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:37
+
+import django.core.validators
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_active_services(apps, schema_editor):
+    Driver = apps.get_model('asignacion_servicios', 'Driver')
+    Service = apps.get_model('asignacion_servicios', 'Service')
+    counts = (
+        Service.objects.filter(driver=OuterRef('pk')).exclude(status__in=['completed', 'canceled'])
+        .order_by().values('driver').annotate(total=Count('pk')).values('total')
+    )
+    Driver.objects.update(active_services=Coalesce(Subquery(counts[:1]), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignacion_servicios', '0009_driver_recommendations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='driver',
+            name='active_services',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='driver',
+            name='capacity',
+            field=models.PositiveSmallIntegerField(default=1, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='batch_id',
+            field=models.UUIDField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='batch_position',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(count_active_services, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignacion_servicios', '0010_driver_capacity_service_batches'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='destination_address',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='destination_services', to='asignacion_servicios.address'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='trip_distance',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='trip_estimated_time',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('asignacion_servicios', '0011_service_destination_legs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='scheduled_for',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['status', 'scheduled_for'], name='services_scheduled_idx'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    Índice sobre token_blacklist_outstandingtoken.expires_at para que purge_tokens lea los
+    tokens expirados sin recorrer la tabla. El modelo pertenece a Simple JWT, por eso se crea
+    con SQL en lugar de con AddIndex.
+    """
+
+    dependencies = [
+        ('asignacion_servicios', '0012_service_scheduled_for'),
+        ('token_blacklist', '0013_alter_blacklistedtoken_options_and_more'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS token_blacklist_outstandingtoken_expires_at_idx '
+            'ON token_blacklist_outstandingtoken (expires_at)',
+            reverse_sql='DROP INDEX IF EXISTS token_blacklist_outstandingtoken_expires_at_idx',
+        ),
+    ]
@@ -1,4 +1,8 @@
 from .driver import Driver
 from .address import Address
 from .service import Service
-from .client import Client
\ No newline at end of file
+from .client import Client
+from .task import Task
+from .outboxEvent import OutboxEvent
+from .demandTile import DemandTile
+from .driverRecommendation import DriverRecommendation
@@ -1,6 +1,7 @@
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
+from asignacion_servicios.utils.addressNormalizer import grid_cell, normalize_text
 
 class Address(models.Model):
     """
@@ -15,10 +16,15 @@ class Address(models.Model):
         street (str, optional): Calle de la dirección. Puede ser nulo o estar en blanco.
         latitude (float): Latitud geográfica, debe estar entre -90 y 90.
         longitude (float): Longitud geográfica, debe estar entre -180 y 180.
+        updated_at (datetime): Fecha de última actualización.
+        normalized_city (str): Ciudad normalizada para detectar duplicados.
+        normalized_street (str): Calle normalizada para detectar duplicados.
+        grid_cell (str): Celda de la rejilla de coordenadas (ADDRESS_GRID_DEGREES).
 
     Métodos:
         __str__(): Retorna una representación legible de la dirección.
         clean(): Valida que ambas coordenadas estén presentes o ninguna.
+        normalize(): Calcula los campos normalizados usados para detectar duplicados.
     """
 
     name = models.CharField(max_length=255)
@@ -31,6 +37,10 @@ class Address(models.Model):
     longitude = models.FloatField(
         validators=[MinValueValidator(-180.0), MaxValueValidator(180.0)]
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    normalized_city = models.CharField(max_length=100, default='', editable=False)
+    normalized_street = models.CharField(max_length=200, default='', editable=False)
+    grid_cell = models.CharField(max_length=32, default='', editable=False)
 
     def __str__(self) -> str:
         """
@@ -54,11 +64,35 @@ class Address(models.Model):
             raise ValidationError("Ambas coordenadas (latitud y longitud) deben estar presentes o ninguna.")
         super().clean()
 
+    def save(self, *args, **kwargs) -> None:
+        """
+        Guarda la dirección recalculando sus campos normalizados.
+
+        Args:
+            *args: Argumentos posicionales.
+            **kwargs: Argumentos de palabra clave.
+        """
+        self.normalize()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'normalized_city', 'normalized_street', 'grid_cell'}
+        super().save(*args, **kwargs)
+
+    def normalize(self) -> None:
+        """
+        Calcula la ciudad y calle normalizadas y la celda de la rejilla de sus coordenadas.
+        """
+        self.normalized_city = normalize_text(self.city)
+        self.normalized_street = normalize_text(self.street)
+        self.grid_cell = grid_cell(self.latitude, self.longitude)
+
     class Meta:
         """
         Metadatos del modelo Address.
 
         - unique_address: Garantiza unicidad por ciudad, país, calle y coordenadas.
+        - indexes: Índice compuesto (latitude, longitude) para búsquedas por radio o bounding box,
+          e índice de la clave normalizada para detectar duplicados.
         - db_table: Nombre de la tabla en la base de datos.
         - ordering: Orden por defecto en consultas.
         - verbose_name: Nombre legible singular.
@@ -70,6 +104,10 @@ class Address(models.Model):
                 name='unique_address'
             )
         ]
+        indexes = [
+            models.Index(fields=['latitude', 'longitude'], name='addresses_lat_lng_idx'),
+            models.Index(fields=['grid_cell', 'normalized_city', 'normalized_street'], name='addresses_dedupe_idx'),
+        ]
         db_table = 'addresses'
         ordering = ['country', 'city', 'name']
         verbose_name = 'Address'
@@ -31,7 +31,7 @@ class Client(models.Model):
     email = models.EmailField(unique=True)
     address = models.ForeignKey(Address, on_delete=models.PROTECT, related_name='clients')
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         """
@@ -0,0 +1,56 @@
+from django.db import models
+
+class DemandTile(models.Model):
+    """
+    Modelo DemandTile
+
+    Agregado precalculado de la demanda: número de servicios creados, completados y cancelados
+    cuya dirección de recogida cae en una celda geohash, por ventana de tiempo de creación.
+
+    Se actualiza de forma incremental al crear o cerrar servicios y se puede reconstruir
+    con el comando rebuild_heatmap.
+
+    Attributes:
+        geohash (str): Celda geohash de la dirección de recogida.
+        window_start (datetime): Inicio de la ventana de tiempo (según created_at del servicio).
+        requested (int): Servicios creados.
+        completed (int): Servicios completados.
+        canceled (int): Servicios cancelados.
+        updated_at (datetime): Fecha de última actualización.
+    """
+
+    geohash = models.CharField(max_length=12)
+    window_start = models.DateTimeField()
+    requested = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    canceled = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    COUNTERS = ('requested', 'completed', 'canceled')
+
+    def __str__(self) -> str:
+        """
+        Retorna una representación legible de la celda.
+
+        Returns:
+            str: Geohash, ventana y servicios creados.
+        """
+        return f"{self.geohash} @ {self.window_start:%Y-%m-%d %H:%M} ({self.requested})"
+
+    class Meta:
+        """
+        Metadatos del modelo DemandTile.
+
+        - unique_demand_tile: Una fila por celda y ventana.
+        - indexes: Índice por ventana para leer un rango de tiempo.
+        - db_table: Nombre de la tabla en la base de datos.
+        - verbose_name: Nombre legible singular.
+        - verbose_name_plural: Nombre legible plural.
+        """
+        db_table = 'demand_tiles'
+        constraints = [
+            models.UniqueConstraint(fields=['geohash', 'window_start'], name='unique_demand_tile')
+        ]
+        indexes = [models.Index(fields=['window_start'], name='demand_tiles_window_idx')]
+        verbose_name = 'Demand tile'
+        verbose_name_plural = 'Demand tiles'
@@ -1,5 +1,5 @@
 from django.db import models
-from django.core.validators import RegexValidator
+from django.core.validators import MinValueValidator, RegexValidator
 from .address import Address
 
 class Driver(models.Model):
@@ -12,7 +12,10 @@ class Driver(models.Model):
         name (str): Nombre del conductor.
         phone (str): Número de teléfono único, validado por formato internacional.
         address (Address): Dirección asociada al conductor.
-        is_available (bool): Estado de disponibilidad del conductor.
+        is_available (bool): Si el conductor acepta servicios nuevos (le queda capacidad libre).
+        capacity (int): Número máximo de servicios abiertos a la vez (más de 1 permite agrupar recogidas).
+        active_services (int): Servicios abiertos asignados actualmente.
+        updated_at (datetime): Fecha de última actualización.
     """
 
     name = models.CharField(max_length=100)
@@ -28,6 +31,9 @@ class Driver(models.Model):
     )
     address = models.ForeignKey(Address, on_delete=models.PROTECT, related_name='drivers')
     is_available = models.BooleanField(default=True)
+    capacity = models.PositiveSmallIntegerField(default=1, validators=[MinValueValidator(1)])
+    active_services = models.PositiveSmallIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         """
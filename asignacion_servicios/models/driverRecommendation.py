@@ -0,0 +1,52 @@
+from django.db import models
+from .driver import Driver
+
+class DriverRecommendation(models.Model):
+    """
+    Modelo DriverRecommendation
+
+    Posición sugerida a un conductor disponible para esperar el próximo servicio, calculada por
+    el comando recommend_positions a partir de la demanda prevista y la densidad de conductores.
+
+    Attributes:
+        driver (Driver): Conductor al que se dirige la sugerencia.
+        target_geohash (str): Celda geohash destino.
+        target_latitude (float): Latitud del centro de la celda destino.
+        target_longitude (float): Longitud del centro de la celda destino.
+        distance_km (float): Distancia entre la celda actual y la celda destino.
+        expected_demand (float): Servicios previstos en la celda destino para la hora objetivo.
+        valid_for (datetime): Inicio de la hora para la que se calculó la sugerencia.
+        created_at (datetime): Fecha de creación.
+    """
+
+    driver = models.OneToOneField(Driver, on_delete=models.CASCADE, related_name='recommendation')
+    target_geohash = models.CharField(max_length=12)
+    target_latitude = models.FloatField()
+    target_longitude = models.FloatField()
+    distance_km = models.FloatField()
+    expected_demand = models.FloatField()
+    valid_for = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        """
+        Retorna una representación legible de la sugerencia.
+
+        Returns:
+            str: Conductor y celda destino.
+        """
+        return f"Driver {self.driver_id} -> {self.target_geohash}"
+
+    class Meta:
+        """
+        Metadatos del modelo DriverRecommendation.
+
+        - db_table: Nombre de la tabla en la base de datos.
+        - ordering: Orden por defecto en consultas.
+        - verbose_name: Nombre legible singular.
+        - verbose_name_plural: Nombre legible plural.
+        """
+        db_table = 'driver_recommendations'
+        ordering = ['driver_id']
+        verbose_name = 'Driver recommendation'
+        verbose_name_plural = 'Driver recommendations'
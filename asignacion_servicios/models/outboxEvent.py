@@ -0,0 +1,65 @@
+from django.db import models
+
+class OutboxEvent(models.Model):
+    """
+    Modelo OutboxEvent
+
+    Representa un evento del ciclo de vida de un servicio, escrito en la misma transacción
+    que el cambio que lo origina y publicado después por el relay (relay_outbox).
+
+    Attributes:
+        aggregate_type (str): Tipo de entidad que originó el evento (por ejemplo 'service').
+        aggregate_id (int): ID de la entidad.
+        event_type (str): Tipo de evento ('service.created', 'service.status_changed', 'service.driver_assigned').
+        payload (dict): Datos del evento.
+        created_at (datetime): Fecha de creación.
+        published_at (datetime): Fecha de publicación, None mientras esté pendiente.
+    """
+
+    aggregate_type = models.CharField(max_length=50)
+    aggregate_id = models.BigIntegerField()
+    event_type = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        """
+        Retorna una representación legible del evento.
+
+        Returns:
+            str: ID, tipo de evento y entidad.
+        """
+        return f"OutboxEvent {self.id} - {self.event_type} ({self.aggregate_type} {self.aggregate_id})"
+
+    def to_dict(self) -> dict:
+        """
+        Retorna el evento en el formato que reciben los sinks.
+
+        Returns:
+            dict: Datos del evento.
+        """
+        return {
+            'id': self.id,
+            'aggregate_type': self.aggregate_type,
+            'aggregate_id': self.aggregate_id,
+            'event_type': self.event_type,
+            'payload': self.payload,
+            'created_at': self.created_at.isoformat(),
+        }
+
+    class Meta:
+        """
+        Metadatos del modelo OutboxEvent.
+
+        - db_table: Nombre de la tabla en la base de datos.
+        - ordering: Orden por defecto en consultas (orden de escritura).
+        - indexes: Índice para leer los eventos pendientes en orden.
+        - verbose_name: Nombre legible singular.
+        - verbose_name_plural: Nombre legible plural.
+        """
+        db_table = 'outbox_events'
+        ordering = ['id']
+        indexes = [models.Index(fields=['published_at', 'id'], name='outbox_pending_idx')]
+        verbose_name = 'Outbox Event'
+        verbose_name_plural = 'Outbox Events'
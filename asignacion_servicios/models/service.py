@@ -1,23 +1,32 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+from asignacion_servicios.workflow import ServiceStateMachine
 from .client import Client
 from .driver import Driver
 from .address import Address
+from .outboxEvent import OutboxEvent
 
 class Service(models.Model):
     """
     Modelo Service
 
-    Representa un servicio solicitado por un cliente, con información de dirección de recogida,
-    cliente, conductor asignado, estado, tiempo estimado y distancia.
+    Representa un servicio solicitado por un cliente, con información de dirección de recogida y
+    de destino, cliente, conductor asignado, estado, y distancia y tiempo de cada tramo del viaje.
 
     Attributes:
         pickup_address (Address): Dirección de recogida.
+        destination_address (Address): Dirección de entrega (opcional).
         client (Client): Cliente que solicita el servicio.
         driver (Driver): Conductor asignado al servicio.
         status (str): Estado del servicio ('pending', 'in_progress', 'completed', 'canceled').
-        estimated_time (float): Tiempo estimado del servicio.
-        distance (float): Distancia estimada del servicio.
+        estimated_time (float): Tiempo estimado (minutos) del conductor hasta la recogida.
+        distance (float): Distancia (km) del conductor hasta la recogida.
+        trip_distance (float): Distancia (km) de la recogida al destino.
+        trip_estimated_time (float): Tiempo estimado (minutos) de la recogida al destino.
+        scheduled_for (datetime): Hora de recogida programada; None para despacho inmediato.
+        batch_id (UUID): Lote de recogidas que atiende el mismo conductor en un viaje, si se agrupó.
+        batch_position (int): Orden de la recogida dentro de la ruta del lote.
         created_at (datetime): Fecha de creación.
         updated_at (datetime): Fecha de última actualización.
     """
@@ -29,13 +38,21 @@ class Service(models.Model):
         ('canceled', 'Canceled'),
     ]
     pickup_address = models.ForeignKey(Address, on_delete=models.PROTECT)
+    destination_address = models.ForeignKey(
+        Address, on_delete=models.PROTECT, null=True, blank=True, related_name='destination_services'
+    )
     client = models.ForeignKey(Client, on_delete=models.PROTECT)
     driver = models.ForeignKey(Driver, on_delete=models.SET_NULL, null=True, blank=True)
     status = models.CharField(max_length=15, choices=STATUS_CHOICES, default='pending')
     estimated_time = models.FloatField(null=True, blank=True)
     distance = models.FloatField(null=True, blank=True)
+    trip_distance = models.FloatField(null=True, blank=True)
+    trip_estimated_time = models.FloatField(null=True, blank=True)
+    scheduled_for = models.DateTimeField(null=True, blank=True)
+    batch_id = models.UUIDField(null=True, blank=True, db_index=True)
+    batch_position = models.PositiveSmallIntegerField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     def __str__(self) -> str:
         """
@@ -53,8 +70,9 @@ class Service(models.Model):
         Raises:
             ValidationError: Si el servicio está completado y no tiene conductor.
         """
-        if self.status == 'completed' and self.driver is None:
-            raise ValidationError("Un servicio completado debe tener un conductor asignado.")
+        error = ServiceStateMachine.driver_error(self.status, self.driver_id is not None)
+        if self.status == 'completed' and error:
+            raise ValidationError(error)
 
     def mark_as_completed(self) -> None:
         """
@@ -63,25 +81,163 @@ class Service(models.Model):
         Raises:
             ValidationError: Si el servicio no está en progreso o no tiene conductor.
         """
-        if self.status != 'in_progress':
-            raise ValidationError("Solo se pueden completar servicios que estén en progreso.")
-        if self.driver is None:
-            raise ValidationError("Un servicio completado debe tener un conductor asignado.")
-        self.status = 'completed'
-        self.save()
+        self.transition_to('completed')
+
+    def transition_to(self, status: str, **changes) -> None:
+        """
+        Cambia el estado del servicio con un UPDATE condicionado al estado actual
+        (UPDATE ... WHERE status = <estado leído>), sin volver a leer la fila.
+
+        Si otra petición cambió el estado entre la lectura y la escritura, el UPDATE no afecta
+        ninguna fila y la transición se rechaza. El evento outbox y los hooks de la máquina de
+        estados se ejecutan en la misma transacción.
+
+        Args:
+            status (str): Estado destino.
+            **changes: Otros campos a actualizar en la misma sentencia (por ejemplo driver_id).
+
+        Raises:
+            ValidationError: Si la transición no es válida o el estado cambió concurrentemente.
+        """
+        from_status = self.status
+        driver_id = changes.get('driver_id', self.driver_id)
+        ServiceStateMachine.check(from_status, status, driver_id is not None)
+
+        using = router.db_for_write(Service, instance=self)
+        now = timezone.now()
+        with transaction.atomic(using=using):
+            updated = Service.objects.using(using).filter(pk=self.pk, status=from_status).update(
+                status=status, updated_at=now, **changes
+            )
+            if not updated:
+                raise ValidationError("El estado del servicio cambió mientras se procesaba la solicitud.")
+            Service.record_transitions([(self.pk, from_status, self.driver_id)], status, using=using)
+
+        for field, value in changes.items():
+            setattr(self, field, value)
+        self.status = status
+        self.updated_at = now
+        self._persisted_state = (self.status, self.driver_id)
+
+    @staticmethod
+    def record_transitions(rows: list, to_status: str, using: str = 'default') -> None:
+        """
+        Escribe los eventos outbox y ejecuta los hooks de transiciones ya aplicadas con UPDATE.
+
+        Args:
+            rows (list): Tuplas (service_id, estado anterior, driver_id).
+            to_status (str): Estado nuevo.
+            using (str, optional): Alias de la base de datos.
+        """
+        OutboxEvent.objects.using(using).bulk_create([
+            Service.status_changed_event(service_id, from_status, to_status, driver_id)
+            for service_id, from_status, driver_id in rows
+        ])
+        ServiceStateMachine.run_hooks_many(rows, to_status)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """
+        Carga la instancia desde la base de datos guardando el estado y conductor persistidos,
+        para detectar cambios al guardar.
+        """
+        instance = super().from_db(db, field_names, values)
+        instance._persisted_state = (instance.__dict__.get('status'), instance.__dict__.get('driver_id'))
+        return instance
 
     def save(self, *args, **kwargs) -> None:
         """
         Guarda la instancia del servicio. Si se asigna un conductor y el estado es 'pending',
         cambia el estado automáticamente a 'in_progress'.
 
+        Los eventos del ciclo de vida (creación, cambio de estado, asignación de conductor) se
+        escriben en la tabla outbox y los hooks de la máquina de estados se ejecutan dentro de
+        la misma transacción.
+
         Args:
             *args: Argumentos posicionales.
             **kwargs: Argumentos de palabra clave.
         """
-        if self.driver is not None and self.status == 'pending':
-            self.status = 'in_progress'
-        super().save(*args, **kwargs)
+        self.status = ServiceStateMachine.status_on_save(self.status, self.driver_id is not None)
+        created = self._state.adding
+        previous_status, previous_driver_id = getattr(self, '_persisted_state', (None, None))
+        using = kwargs.get('using') or router.db_for_write(Service, instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            events = self._lifecycle_events(created)
+            if events:
+                OutboxEvent.objects.using(using).bulk_create(events)
+            if not created and self.status != previous_status:
+                ServiceStateMachine.run_hooks(self.id, previous_status, self.status, previous_driver_id)
+        self._persisted_state = (self.status, self.driver_id)
+
+    def _lifecycle_events(self, created: bool) -> list:
+        """
+        Construye los eventos outbox correspondientes a los cambios de este guardado.
+
+        Args:
+            created (bool): Si el servicio se acaba de crear.
+
+        Returns:
+            list: Instancias de OutboxEvent sin guardar.
+        """
+        if created:
+            return [Service.outbox_event(self.id, 'service.created', {
+                'status': self.status,
+                'client_id': self.client_id,
+                'driver_id': self.driver_id,
+                'pickup_address_id': self.pickup_address_id,
+                'destination_address_id': self.destination_address_id,
+                'scheduled_for': self.scheduled_for.isoformat() if self.scheduled_for else None,
+            })]
+
+        previous_status, previous_driver_id = getattr(self, '_persisted_state', (None, None))
+        events = []
+        if self.driver_id is not None and self.driver_id != previous_driver_id:
+            events.append(Service.outbox_event(self.id, 'service.driver_assigned', {'driver_id': self.driver_id}))
+        if self.status != previous_status:
+            events.append(Service.status_changed_event(self.id, previous_status, self.status, self.driver_id))
+        return events
+
+    @staticmethod
+    def status_changed_event(service_id: int, from_status: str, to_status: str, driver_id) -> OutboxEvent:
+        """
+        Construye el evento outbox de un cambio de estado.
+
+        Args:
+            service_id (int): ID del servicio.
+            from_status (str): Estado anterior.
+            to_status (str): Estado nuevo.
+            driver_id (int o None): ID del conductor asignado.
+
+        Returns:
+            OutboxEvent: Evento sin guardar.
+        """
+        return Service.outbox_event(service_id, 'service.status_changed', {
+            'from': from_status,
+            'to': to_status,
+            'driver_id': driver_id,
+        })
+
+    @staticmethod
+    def outbox_event(service_id: int, event_type: str, payload: dict) -> OutboxEvent:
+        """
+        Construye un evento outbox de un servicio.
+
+        Args:
+            service_id (int): ID del servicio.
+            event_type (str): Tipo de evento.
+            payload (dict): Datos del evento (se añade 'service_id').
+
+        Returns:
+            OutboxEvent: Evento sin guardar.
+        """
+        return OutboxEvent(
+            aggregate_type='service',
+            aggregate_id=service_id,
+            event_type=event_type,
+            payload={'service_id': service_id, **payload},
+        )
 
     class Meta:
         """
@@ -89,10 +245,12 @@ class Service(models.Model):
 
         - db_table: Nombre de la tabla en la base de datos.
         - ordering: Orden por defecto en consultas.
+        - indexes: Índice (status, scheduled_for) para cargar los servicios programados próximos.
         - verbose_name: Nombre legible singular.
         - verbose_name_plural: Nombre legible plural.
         """
         db_table = 'services'
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['status', 'scheduled_for'], name='services_scheduled_idx')]
         verbose_name = 'Service'
         verbose_name_plural = 'Services'
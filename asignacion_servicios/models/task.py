@@ -0,0 +1,60 @@
+from django.db import models
+
+class Task(models.Model):
+    """
+    Modelo Task
+
+    Representa una tarea en segundo plano pendiente de ejecutar por el worker (run_tasks).
+
+    Attributes:
+        name (str): Nombre registrado de la tarea.
+        payload (dict): Argumentos de la tarea en formato JSON.
+        status (str): Estado de la tarea ('pending', 'running', 'done', 'failed').
+        attempts (int): Número de intentos realizados.
+        max_attempts (int): Número máximo de intentos antes de marcarla como fallida.
+        run_after (datetime): Momento a partir del cual puede ejecutarse.
+        last_error (str): Último error registrado.
+        created_at (datetime): Fecha de creación.
+        updated_at (datetime): Fecha de última actualización.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField()
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        """
+        Retorna una representación legible de la tarea.
+
+        Returns:
+            str: Nombre, ID y estado de la tarea.
+        """
+        return f"Task {self.id} - {self.name} ({self.status})"
+
+    class Meta:
+        """
+        Metadatos del modelo Task.
+
+        - db_table: Nombre de la tabla en la base de datos.
+        - ordering: Orden por defecto en consultas.
+        - indexes: Índice para reclamar tareas pendientes por fecha de ejecución.
+        - verbose_name: Nombre legible singular.
+        - verbose_name_plural: Nombre legible plural.
+        """
+        db_table = 'tasks'
+        ordering = ['run_after', 'id']
+        indexes = [models.Index(fields=['status', 'run_after'], name='tasks_status_run_after_idx')]
+        verbose_name = 'Task'
+        verbose_name_plural = 'Tasks'
@@ -0,0 +1 @@
+from .sinks import OutboxSink, FileSink, WebhookSink, InProcessSink, subscribe, unsubscribe, load_sinks
@@ -0,0 +1,107 @@
+import json
+import urllib.request
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_subscribers = {}
+
+
+def subscribe(event_type: str):
+    """
+    Registra una función para recibir en el proceso los eventos de un tipo ('*' para todos).
+
+    Args:
+        event_type (str): Tipo de evento, por ejemplo 'service.status_changed'.
+
+    Returns:
+        callable: Decorador que registra la función y la retorna sin cambios.
+    """
+    def decorator(func):
+        _subscribers.setdefault(event_type, []).append(func)
+        return func
+    return decorator
+
+
+def unsubscribe(event_type: str, func) -> None:
+    """
+    Elimina una suscripción registrada con subscribe().
+    """
+    handlers = _subscribers.get(event_type, [])
+    if func in handlers:
+        handlers.remove(func)
+
+
+class OutboxSink:
+    """
+    Destino de los eventos publicados por el relay. Si send() lanza una excepción, el lote
+    no se marca como publicado y se reintenta en el siguiente ciclo.
+    """
+
+    def send(self, events: list) -> None:
+        """
+        Entrega un lote de eventos.
+
+        Args:
+            events (list): Eventos en formato dict (OutboxEvent.to_dict()), en orden de escritura.
+        """
+        raise NotImplementedError
+
+
+class FileSink(OutboxSink):
+    """
+    Añade cada evento como una línea JSON a un archivo.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, events: list) -> None:
+        with open(self.path, 'a', encoding='utf-8') as output:
+            for event in events:
+                output.write(json.dumps(event, ensure_ascii=False) + '\n')
+
+
+class WebhookSink(OutboxSink):
+    """
+    Envía cada lote como un POST JSON a una URL ({"events": [...]}).
+    """
+
+    def __init__(self, url: str, timeout: float = 5, headers: dict = None):
+        self.url = url
+        self.timeout = timeout
+        self.headers = headers or {}
+
+    def send(self, events: list) -> None:
+        body = json.dumps({'events': events}).encode('utf-8')
+        request = urllib.request.Request(
+            self.url, data=body, method='POST',
+            headers={'Content-Type': 'application/json', **self.headers}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if response.status >= 300:
+                raise RuntimeError(f"El webhook respondió con estado {response.status}.")
+
+
+class InProcessSink(OutboxSink):
+    """
+    Entrega los eventos a las funciones registradas con @subscribe en el proceso del relay.
+    """
+
+    def send(self, events: list) -> None:
+        for event in events:
+            for handler in _subscribers.get(event['event_type'], []) + _subscribers.get('*', []):
+                handler(event)
+
+
+def load_sinks() -> list:
+    """
+    Construye los sinks configurados en OUTBOX_SINKS.
+
+    Returns:
+        list: Instancias de OutboxSink.
+    """
+    sinks = []
+    for config in getattr(settings, 'OUTBOX_SINKS', []):
+        sink_class = import_string(config['BACKEND'])
+        sinks.append(sink_class(**config.get('OPTIONS', {})))
+    return sinks
@@ -0,0 +1 @@
+from .fastJson import FastJSONRenderer, FastJSONParser, orjson_available
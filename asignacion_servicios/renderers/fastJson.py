@@ -0,0 +1,78 @@
+from rest_framework.utils import encoders
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+def orjson_available() -> bool:
+    """
+    Indica si orjson está instalado y se usa para renderizar y parsear JSON.
+    """
+    return orjson is not None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renderizador JSON que usa orjson cuando está instalado.
+
+    Produce JSON compacto en UTF-8 con U+2028 y U+2029 escapados, como JSONRenderer de DRF, y los
+    mismos bytes para cadenas, enteros, decimales y fechas. Los floats pueden escribirse distinto
+    (orjson escribe 1e-05 como 0.00001) y NaN o infinito se escriben como null en lugar de fallar.
+    Si orjson no está disponible, se pide sangría o orjson no puede serializar algún valor, delega
+    en JSONRenderer (biblioteca estándar).
+    """
+
+    _encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Serializa los datos a JSON, retornando bytes.
+        """
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            # Las fechas pasan por el encoder de DRF para mantener su formato exacto.
+            ret = orjson.dumps(data, default=self._encoder.default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parser JSON que usa orjson cuando está instalado, con la biblioteca estándar como alternativa.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Convierte el cuerpo JSON de la petición en datos de Python.
+
+        Raises:
+            ParseError: Si el cuerpo no es JSON válido.
+        """
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', 'utf-8')
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
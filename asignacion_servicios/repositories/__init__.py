@@ -1,4 +1,9 @@
 from .addressRepostory import AddressRepository
 from .driverRepository import DriverRepository
 from .serviceRepository import ServiceRepository
-from .clientRepository import ClientRepository
\ No newline at end of file
+from .clientRepository import ClientRepository
+from .taskRepository import TaskRepository
+from .outboxRepository import OutboxRepository
+from .demandTileRepository import DemandTileRepository
+from .driverRecommendationRepository import DriverRecommendationRepository
+from .tokenRepository import TokenRepository
@@ -1,4 +1,7 @@
-from django.db.models import QuerySet
+import hashlib
+from django.db import connections, router
+from django.db.models import Count, QuerySet
+from django.utils import timezone
 from asignacion_servicios.models import Address
 
 class AddressRepository:
@@ -133,4 +136,124 @@ class AddressRepository:
         Returns:
             Address: Instancia de Address con relaciones cargadas.
         """
-        return Address.objects.select_related().get(pk=address_id)
\ No newline at end of file
+        return Address.objects.select_related().get(pk=address_id)
+
+    @staticmethod
+    def find_duplicate(normalized_city: str, normalized_street: str, cells: list, exclude_id: int = None):
+        """
+        Busca una dirección con la misma ciudad y calle normalizadas en alguna de las celdas dadas.
+
+        Args:
+            normalized_city (str): Ciudad normalizada.
+            normalized_street (str): Calle normalizada.
+            cells (list): Celdas de la rejilla donde buscar.
+            exclude_id (int, optional): ID de una dirección que no cuenta como duplicada (la que se actualiza).
+
+        Returns:
+            Address o None: La dirección más antigua que coincide, o None.
+        """
+        addresses = Address.objects.filter(
+            grid_cell__in=cells,
+            normalized_city=normalized_city,
+            normalized_street=normalized_street
+        )
+        if exclude_id is not None:
+            addresses = addresses.exclude(pk=exclude_id)
+        return addresses.order_by('id').first()
+
+    @staticmethod
+    def lock_dedupe_key(normalized_city: str, normalized_street: str) -> None:
+        """
+        Toma un advisory lock de PostgreSQL sobre la ciudad y calle normalizadas hasta el fin de
+        la transacción, para que dos peticiones concurrentes con la misma dirección no la creen dos
+        veces. Debe llamarse dentro de transaction.atomic(). En otros motores (SQLite serializa las
+        escrituras) no hace nada.
+
+        Args:
+            normalized_city (str): Ciudad normalizada.
+            normalized_street (str): Calle normalizada.
+        """
+        connection = connections[router.db_for_write(Address)]
+        if connection.vendor != 'postgresql':
+            return
+        digest = hashlib.blake2b(f"address:{normalized_city}|{normalized_street}".encode(), digest_size=8).digest()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [int.from_bytes(digest, 'big', signed=True)])
+
+    @staticmethod
+    def duplicate_groups() -> list:
+        """
+        Agrupa los IDs de direcciones con la misma ciudad y calle normalizadas cuyas celdas son
+        iguales o vecinas, con la misma regla que find_duplicate al crear: cada dirección se une
+        al grupo de la más antigua que la habría encontrado, o inicia uno nuevo.
+
+        Returns:
+            list: Listas de IDs (ordenadas) de cada grupo con más de una dirección.
+        """
+        keys = (
+            Address.objects.order_by()
+            .values('normalized_city', 'normalized_street')
+            .annotate(total=Count('id'))
+            .filter(total__gt=1)
+        )
+        wanted = {(key['normalized_city'], key['normalized_street']) for key in keys}
+        if not wanted:
+            return []
+        candidates = Address.objects.filter(
+            normalized_street__in={street for _, street in wanted}
+        ).order_by('id').values_list('id', 'normalized_city', 'normalized_street', 'grid_cell')
+
+        groups = []
+        keepers = {}
+        for address_id, city, street, cell in candidates:
+            if (city, street) not in wanted:
+                continue
+            row, column = (int(part) for part in cell.split(':'))
+            same_key = keepers.setdefault((city, street), [])
+            for keep_row, keep_column, group in same_key:
+                if abs(keep_row - row) <= 1 and abs(keep_column - column) <= 1:
+                    group.append(address_id)
+                    break
+            else:
+                group = [address_id]
+                same_key.append((row, column, group))
+                groups.append(group)
+        return [group for group in groups if len(group) > 1]
+
+    @staticmethod
+    def merge_into(keep_id: int, duplicate_ids: list) -> int:
+        """
+        Reasigna todas las referencias a las direcciones duplicadas hacia la que se conserva y
+        elimina las duplicadas. Debe llamarse dentro de una transacción.
+
+        Args:
+            keep_id (int): ID de la dirección que se conserva.
+            duplicate_ids (list): IDs de las direcciones a fusionar.
+
+        Returns:
+            int: Número de direcciones eliminadas.
+        """
+        now = timezone.now()
+        for relation in Address._meta.related_objects:
+            if not (relation.one_to_many or relation.one_to_one):
+                continue
+            changes = {relation.field.name: keep_id}
+            if any(field.name == 'updated_at' for field in relation.related_model._meta.concrete_fields):
+                changes['updated_at'] = now
+            relation.related_model.objects.filter(**{f'{relation.field.name}__in': duplicate_ids}).update(**changes)
+        deleted, _ = Address.objects.filter(pk__in=duplicate_ids).delete()
+        return deleted
+
+    @staticmethod
+    def bulk_update_normalized(addresses: list) -> int:
+        """
+        Guarda los campos normalizados de varias direcciones con una sola sentencia.
+
+        Args:
+            addresses (list): Instancias de Address con los campos ya recalculados.
+
+        Returns:
+            int: Número de direcciones actualizadas.
+        """
+        return Address.objects.bulk_update(addresses, ['normalized_city', 'normalized_street', 'grid_cell'])
+
@@ -0,0 +1,124 @@
+from datetime import datetime
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import ExtractHour, ExtractWeekDay, Substr
+from asignacion_servicios.models import DemandTile
+
+class DemandTileRepository:
+    """
+    Repositorio para operaciones sobre las celdas precalculadas del mapa de demanda.
+    """
+
+    @staticmethod
+    def increment(geohash: str, window_start: datetime, counter: str, amount: int = 1) -> None:
+        """
+        Suma un valor a un contador de una celda con UPDATE ... SET counter = counter + n,
+        creando la celda si todavía no existe.
+
+        Args:
+            geohash (str): Celda geohash.
+            window_start (datetime): Inicio de la ventana.
+            counter (str): Contador ('requested', 'completed' o 'canceled').
+            amount (int, optional): Valor a sumar.
+        """
+        tiles = DemandTile.objects.filter(geohash=geohash, window_start=window_start)
+        if tiles.update(**{counter: F(counter) + amount}):
+            return
+        try:
+            with transaction.atomic():
+                DemandTile.objects.create(geohash=geohash, window_start=window_start, **{counter: amount})
+        except IntegrityError:
+            # Otra transacción creó la celda entre el UPDATE y el INSERT.
+            tiles.update(**{counter: F(counter) + amount})
+
+    @staticmethod
+    def increment_many(amounts: dict, counter: str) -> None:
+        """
+        Suma valores a un contador de varias celdas: crea las que faltan con un INSERT
+        (ignorando las existentes) y las actualiza con un solo UPDATE ... CASE.
+
+        Args:
+            amounts (dict): {(geohash, window_start): valor a sumar}.
+            counter (str): Contador ('requested', 'completed' o 'canceled').
+        """
+        if len(amounts) <= 1:
+            for (geohash, window_start), amount in amounts.items():
+                DemandTileRepository.increment(geohash, window_start, counter, amount)
+            return
+        DemandTile.objects.bulk_create(
+            [DemandTile(geohash=geohash, window_start=window_start) for geohash, window_start in amounts],
+            ignore_conflicts=True,
+        )
+        conditions = [Q(geohash=geohash, window_start=window_start) for geohash, window_start in amounts]
+        matches = Q()
+        for condition in conditions:
+            matches |= condition
+        DemandTile.objects.filter(matches).update(**{
+            counter: F(counter) + Case(
+                *[When(condition, then=Value(amount)) for condition, amount in zip(conditions, amounts.values())],
+                default=Value(0), output_field=IntegerField(),
+            )
+        })
+
+    @staticmethod
+    def aggregate(since: datetime, until: datetime, precision: int) -> list:
+        """
+        Suma los contadores de las celdas de un rango de ventanas, agrupando por los primeros
+        'precision' caracteres del geohash.
+
+        Args:
+            since (datetime): Inicio del rango (incluido).
+            until (datetime): Fin del rango (excluido).
+            precision (int): Longitud del geohash agrupado.
+
+        Returns:
+            list: Diccionarios con 'cell', 'requested', 'completed' y 'canceled', de mayor a menor demanda.
+        """
+        return list(
+            DemandTile.objects.filter(window_start__gte=since, window_start__lt=until)
+            .annotate(cell=Substr('geohash', 1, precision))
+            .values('cell')
+            .annotate(requested=Sum('requested'), completed=Sum('completed'), canceled=Sum('canceled'))
+            .order_by('-requested', 'cell')
+        )
+
+    @staticmethod
+    def slot_demand(since: datetime, week_day: int, hour: int, precision: int) -> dict:
+        """
+        Suma los servicios creados desde 'since' en las ventanas de un día de la semana y hora,
+        agrupando por los primeros 'precision' caracteres del geohash.
+
+        Args:
+            since (datetime): Inicio del historial.
+            week_day (int): Día de la semana como ExtractWeekDay (1 = domingo ... 7 = sábado).
+            hour (int): Hora local (0 a 23).
+            precision (int): Longitud del geohash agrupado.
+
+        Returns:
+            dict: Servicios creados por celda.
+        """
+        rows = (
+            DemandTile.objects.filter(window_start__gte=since)
+            .annotate(week_day=ExtractWeekDay('window_start'), hour=ExtractHour('window_start'))
+            .filter(week_day=week_day, hour=hour)
+            .annotate(cell=Substr('geohash', 1, precision))
+            .values_list('cell')
+            .annotate(total=Sum('requested'))
+            .order_by()
+        )
+        return dict(rows)
+
+    @staticmethod
+    def replace_all(tiles: list, batch_size: int = 1000) -> int:
+        """
+        Reemplaza todas las celdas por las recalculadas. Debe llamarse dentro de una transacción.
+
+        Args:
+            tiles (list): Instancias de DemandTile sin guardar.
+            batch_size (int, optional): Filas por sentencia INSERT.
+
+        Returns:
+            int: Número de celdas escritas.
+        """
+        DemandTile.objects.all().delete()
+        return len(DemandTile.objects.bulk_create(tiles, batch_size=batch_size))
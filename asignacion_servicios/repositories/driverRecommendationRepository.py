@@ -0,0 +1,34 @@
+from django.db.models import QuerySet
+from asignacion_servicios.models import DriverRecommendation
+
+class DriverRecommendationRepository:
+    """
+    Repositorio para las posiciones sugeridas a los conductores.
+    """
+
+    @staticmethod
+    def replace_all(recommendations: list) -> int:
+        """
+        Reemplaza todas las sugerencias por las del último cálculo. Debe llamarse dentro de una transacción.
+
+        Args:
+            recommendations (list): Instancias de DriverRecommendation sin guardar.
+
+        Returns:
+            int: Número de sugerencias escritas.
+        """
+        DriverRecommendation.objects.all().delete()
+        return len(DriverRecommendation.objects.bulk_create(recommendations))
+
+    @staticmethod
+    def current(**filters) -> QuerySet:
+        """
+        Obtiene las sugerencias de los conductores que siguen disponibles.
+
+        Args:
+            **filters: Filtros adicionales (por ejemplo driver_id).
+
+        Returns:
+            QuerySet: Sugerencias vigentes.
+        """
+        return DriverRecommendation.objects.filter(driver__is_available=True, **filters)
@@ -1,5 +1,8 @@
-from django.db.models import QuerySet
-from asignacion_servicios.models import Driver
+from django.db.models import Case, Count, F, Max, OuterRef, Q, QuerySet, Subquery, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from asignacion_servicios.models import Driver, Service
+from asignacion_servicios.workflow import ServiceStateMachine
 
 class DriverRepository:
     """
@@ -126,4 +129,165 @@ class DriverRepository:
         Args:
             driver (Driver): Instancia de Driver a eliminar.
         """
-        driver.delete()
\ No newline at end of file
+        driver.delete()
+
+    @staticmethod
+    def bulk_set_availability(driver_ids: list, is_available: bool) -> int:
+        """
+        Cambia la disponibilidad de varios conductores con una sola sentencia UPDATE.
+
+        Args:
+            driver_ids (list): IDs de los conductores.
+            is_available (bool): Nuevo estado de disponibilidad.
+
+        Returns:
+            int: Número de conductores actualizados.
+        """
+        return Driver.objects.filter(pk__in=driver_ids).update(
+            is_available=is_available,
+            updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def claim_available(driver_id: int, slots: int = 1) -> bool:
+        """
+        Reserva capacidad de un conductor solo si sigue disponible y le quedan 'slots' servicios
+        libres, con un UPDATE condicionado. El conductor deja de estar disponible cuando agota su capacidad.
+
+        Args:
+            driver_id (int): ID del conductor.
+            slots (int, optional): Número de servicios a reservar.
+
+        Returns:
+            bool: True si el conductor fue reservado, False si ya no tenía capacidad.
+        """
+        return Driver.objects.filter(
+            pk=driver_id, is_available=True, capacity__gte=F('active_services') + slots
+        ).update(
+            active_services=F('active_services') + slots,
+            is_available=Case(
+                When(capacity__gt=F('active_services') + slots, then=Value(True)),
+                default=Value(False),
+            ),
+            updated_at=timezone.now()
+        ) == 1
+
+    @staticmethod
+    def release_if_idle(driver_ids: list) -> int:
+        """
+        Recalcula los servicios abiertos de los conductores indicados y marca como disponibles a
+        los que vuelven a tener capacidad libre.
+
+        Args:
+            driver_ids (list): IDs de los conductores.
+
+        Returns:
+            int: Número de conductores liberados.
+        """
+        if not driver_ids:
+            return 0
+        now = timezone.now()
+        Driver.objects.filter(pk__in=driver_ids).update(active_services=DriverRepository._open_count(), updated_at=now)
+        return Driver.objects.filter(
+            pk__in=driver_ids, is_available=False, capacity__gt=F('active_services')
+        ).update(is_available=True, updated_at=now)
+
+    @staticmethod
+    def reconcile_availability(dry_run: bool = False) -> tuple:
+        """
+        Recalcula la carga y la disponibilidad de todos los conductores a partir de sus servicios
+        abiertos: quien agotó su capacidad queda no disponible y quien tiene capacidad libre, disponible.
+
+        Args:
+            dry_run (bool, optional): Si es True, solo cuenta los conductores a corregir.
+
+        Returns:
+            tuple: (conductores liberados, conductores marcados como ocupados)
+        """
+        drivers = Driver.objects.annotate(open_count=DriverRepository._open_count())
+        to_release = drivers.filter(is_available=False, capacity__gt=F('open_count'))
+        to_occupy = drivers.filter(is_available=True, capacity__lte=F('open_count'))
+        if dry_run:
+            return to_release.count(), to_occupy.count()
+        now = timezone.now()
+        result = (
+            to_release.update(is_available=True, updated_at=now),
+            to_occupy.update(is_available=False, updated_at=now),
+        )
+        drivers.exclude(active_services=F('open_count')).update(
+            active_services=DriverRepository._open_count(), updated_at=now
+        )
+        return result
+
+    @staticmethod
+    def available_positions() -> list:
+        """
+        Obtiene la posición de los conductores disponibles con dirección geolocalizada.
+
+        Returns:
+            list: Tuplas (driver_id, latitud, longitud).
+        """
+        return list(
+            Driver.objects.filter(
+                is_available=True, address__latitude__isnull=False, address__longitude__isnull=False
+            ).order_by('id').values_list('id', 'address__latitude', 'address__longitude')
+        )
+
+    @staticmethod
+    def scoring_candidates(
+        city: str, country: str, exclude_ids=None, completed_since=None, min_slots: int = 1, last_completed: bool = False
+    ) -> list:
+        """
+        Obtiene los datos de los conductores disponibles de una ciudad necesarios para puntuarlos,
+        en una sola consulta y sin instanciar modelos.
+
+        Args:
+            city (str): Ciudad de la recogida.
+            country (str): País de la recogida.
+            exclude_ids (iterable, optional): IDs de conductores a descartar.
+            completed_since (datetime, optional): Si se indica, cuenta los servicios completados desde esa fecha.
+            min_slots (int, optional): Capacidad libre mínima del conductor.
+            last_completed (bool, optional): Si es True, incluye la fecha de su último servicio completado.
+
+        Returns:
+            list: Tuplas (driver_id, latitud, longitud, último servicio completado o None,
+                servicios completados recientes).
+        """
+        drivers = Driver.objects.filter(
+            is_available=True, address__city=city, address__country=country,
+            capacity__gte=F('active_services') + min_slots
+        )
+        if exclude_ids:
+            drivers = drivers.exclude(pk__in=exclude_ids)
+        annotations = {}
+        if last_completed:
+            annotations['last_completed'] = Max('service__updated_at', filter=Q(service__status='completed'))
+        if completed_since is not None:
+            annotations['recent_completed'] = Count(
+                'service', filter=Q(service__status='completed', service__updated_at__gte=completed_since)
+            )
+        rows = drivers.annotate(**annotations).values_list(
+            'id', 'address__latitude', 'address__longitude', *annotations
+        )
+        return [
+            (
+                row[0], row[1], row[2], row[3] if last_completed else None,
+                row[-1] if completed_since is not None else 0,
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _open_services() -> QuerySet:
+        """
+        Subconsulta de servicios abiertos (no finalizados) del conductor de la consulta externa.
+        """
+        return Service.objects.filter(driver=OuterRef('pk')).exclude(status__in=ServiceStateMachine.TERMINAL)
+
+    @staticmethod
+    def _open_count() -> Coalesce:
+        """
+        Expresión con el número de servicios abiertos del conductor de la consulta externa.
+        """
+        counts = DriverRepository._open_services().order_by().values('driver').annotate(total=Count('pk')).values('total')
+        return Coalesce(Subquery(counts[:1]), 0)
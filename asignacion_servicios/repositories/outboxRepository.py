@@ -0,0 +1,78 @@
+from django.db.models import QuerySet
+from django.utils import timezone
+from asignacion_servicios.models import OutboxEvent
+
+class OutboxRepository:
+    """
+    Repositorio para operaciones sobre la tabla outbox de eventos.
+    """
+
+    @staticmethod
+    def create_many(events: list) -> list:
+        """
+        Inserta varios eventos con una sola sentencia INSERT.
+
+        Args:
+            events (list): Instancias de OutboxEvent sin guardar.
+
+        Returns:
+            list: Eventos creados.
+        """
+        return OutboxEvent.objects.bulk_create(events)
+
+    @staticmethod
+    def lock_pending(limit: int) -> list:
+        """
+        Bloquea y obtiene los eventos pendientes de publicar más antiguos.
+
+        Usa SELECT ... FOR UPDATE SKIP LOCKED, por lo que debe llamarse dentro de una transacción;
+        varios relays pueden trabajar a la vez sin publicar los mismos eventos.
+
+        Args:
+            limit (int): Número máximo de eventos.
+
+        Returns:
+            list: Eventos pendientes en orden de escritura.
+        """
+        return list(
+            OutboxEvent.objects.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True)
+            .order_by('id')[:limit]
+        )
+
+    @staticmethod
+    def mark_published(event_ids: list) -> int:
+        """
+        Marca varios eventos como publicados.
+
+        Args:
+            event_ids (list): IDs de los eventos.
+
+        Returns:
+            int: Número de eventos actualizados.
+        """
+        return OutboxEvent.objects.filter(pk__in=event_ids).update(published_at=timezone.now())
+
+    @staticmethod
+    def delete_published_before(before) -> int:
+        """
+        Elimina los eventos publicados antes de una fecha.
+
+        Args:
+            before (datetime): Fecha límite.
+
+        Returns:
+            int: Número de eventos eliminados.
+        """
+        deleted, _ = OutboxEvent.objects.filter(published_at__lt=before).delete()
+        return deleted
+
+    @staticmethod
+    def pending() -> QuerySet:
+        """
+        Lista los eventos pendientes de publicar.
+
+        Returns:
+            QuerySet: QuerySet de eventos sin publicar.
+        """
+        return OutboxEvent.objects.filter(published_at__isnull=True)
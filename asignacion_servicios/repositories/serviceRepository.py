@@ -1,4 +1,5 @@
 from django.db.models import QuerySet
+from django.utils import timezone
 from asignacion_servicios.models import Service
 
 class ServiceRepository:
@@ -56,17 +57,18 @@ class ServiceRepository:
         return Service.objects.filter(status__iexact=status)
 
     @staticmethod
-    def filter_by(**filters) -> QuerySet:
+    def filter_by(*conditions, **filters) -> QuerySet:
         """
         Filtra servicios por campos arbitrarios.
 
         Args:
+            *conditions: Expresiones Q adicionales.
             **filters: Campos y valores para filtrar.
 
         Returns:
             QuerySet: QuerySet con los servicios filtrados.
         """
-        return Service.objects.filter(**filters)
+        return Service.objects.filter(*conditions, **filters)
 
     @staticmethod
     def exists(**filters) -> bool:
@@ -107,4 +109,86 @@ class ServiceRepository:
         Args:
             service (Service): Instancia de Service a eliminar.
         """
-        service.delete()
\ No newline at end of file
+        service.delete()
+
+    @staticmethod
+    def lock_for_transition(service_ids: list) -> list:
+        """
+        Bloquea los servicios indicados y obtiene los datos necesarios para validar una transición de estado.
+
+        Debe ejecutarse dentro de una transacción para que el bloqueo tenga efecto.
+
+        Args:
+            service_ids (list): IDs de los servicios.
+
+        Returns:
+            list: Tuplas (id, status, driver_id) de los servicios encontrados.
+        """
+        return list(
+            Service.objects.select_for_update()
+            .filter(pk__in=service_ids)
+            .order_by('pk')
+            .values_list('id', 'status', 'driver_id')
+        )
+
+    @staticmethod
+    def bulk_update_status(service_ids: list, from_statuses: tuple, status: str) -> int:
+        """
+        Cambia el estado de varios servicios con una sola sentencia UPDATE,
+        solo si su estado actual está entre los estados de origen permitidos.
+
+        Args:
+            service_ids (list): IDs de los servicios.
+            from_statuses (tuple): Estados de origen permitidos.
+            status (str): Nuevo estado.
+
+        Returns:
+            int: Número de servicios actualizados.
+        """
+        return Service.objects.filter(pk__in=service_ids, status__in=from_statuses).update(
+            status=status,
+            updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def scheduled_until(until) -> list:
+        """
+        Obtiene los servicios programados pendientes y sin conductor con hora de recogida hasta 'until'
+        (incluidos los atrasados), usando el índice (status, scheduled_for).
+
+        Args:
+            until (datetime): Hora de recogida máxima.
+
+        Returns:
+            list: Tuplas (service_id, scheduled_for).
+        """
+        return list(
+            Service.objects.filter(status='pending', driver__isnull=True, scheduled_for__lte=until)
+            .order_by('scheduled_for')
+            .values_list('id', 'scheduled_for')
+        )
+
+    @staticmethod
+    def assign_if_pending(service_id: int, driver_id: int, distance: float, estimated_time: float, **changes) -> bool:
+        """
+        Asigna un conductor a un servicio solo si sigue pendiente y sin conductor,
+        con un UPDATE condicionado.
+
+        Args:
+            service_id (int): ID del servicio.
+            driver_id (int): ID del conductor.
+            distance (float): Distancia del conductor a la recogida en km.
+            estimated_time (float): Tiempo estimado en minutos.
+            **changes: Otros campos a actualizar en la misma sentencia (por ejemplo batch_id).
+
+        Returns:
+            bool: True si el servicio fue asignado, False si ya no estaba pendiente.
+        """
+        return Service.objects.filter(pk=service_id, status='pending', driver__isnull=True).update(
+            driver_id=driver_id,
+            status='in_progress',
+            distance=distance,
+            estimated_time=estimated_time,
+            updated_at=timezone.now(),
+            **changes
+        ) == 1
@@ -0,0 +1,104 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from asignacion_servicios.models import Task
+
+class TaskRepository:
+    """
+    Repositorio para operaciones sobre la cola de tareas en segundo plano (modelo Task).
+    """
+
+    @staticmethod
+    def create(name: str, payload: dict, run_after, max_attempts: int) -> Task:
+        """
+        Crea una nueva tarea pendiente.
+
+        Args:
+            name (str): Nombre registrado de la tarea.
+            payload (dict): Argumentos de la tarea.
+            run_after (datetime): Momento a partir del cual puede ejecutarse.
+            max_attempts (int): Número máximo de intentos.
+
+        Returns:
+            Task: Instancia creada de Task.
+        """
+        return Task.objects.create(name=name, payload=payload, run_after=run_after, max_attempts=max_attempts)
+
+    @staticmethod
+    def claim_due(limit: int) -> list:
+        """
+        Reclama hasta 'limit' tareas pendientes cuya fecha de ejecución ya pasó.
+
+        Las filas se bloquean con SELECT ... FOR UPDATE SKIP LOCKED, de modo que varios workers
+        pueden reclamar tareas a la vez sin tomar las mismas.
+
+        Args:
+            limit (int): Número máximo de tareas a reclamar.
+
+        Returns:
+            list: Tareas reclamadas, ya marcadas como 'running' y con el intento contabilizado.
+        """
+        with transaction.atomic():
+            tasks = list(
+                Task.objects.select_for_update(skip_locked=True)
+                .filter(status='pending', run_after__lte=timezone.now())
+                .order_by('run_after', 'id')[:limit]
+            )
+            if tasks:
+                Task.objects.filter(pk__in=[task.pk for task in tasks]).update(
+                    status='running', attempts=F('attempts') + 1, updated_at=timezone.now()
+                )
+                for task in tasks:
+                    task.status = 'running'
+                    task.attempts += 1
+        return tasks
+
+    @staticmethod
+    def mark_done(task_id: int) -> None:
+        """
+        Marca una tarea como completada.
+
+        Args:
+            task_id (int): ID de la tarea.
+        """
+        Task.objects.filter(pk=task_id).update(status='done', last_error='', updated_at=timezone.now())
+
+    @staticmethod
+    def reschedule(task_id: int, error: str, run_after) -> None:
+        """
+        Devuelve una tarea fallida a la cola para reintentarla más tarde.
+
+        Args:
+            task_id (int): ID de la tarea.
+            error (str): Error del intento fallido.
+            run_after (datetime): Momento del próximo intento.
+        """
+        Task.objects.filter(pk=task_id).update(
+            status='pending', last_error=error, run_after=run_after, updated_at=timezone.now()
+        )
+
+    @staticmethod
+    def mark_failed(task_id: int, error: str) -> None:
+        """
+        Marca una tarea como fallida definitivamente.
+
+        Args:
+            task_id (int): ID de la tarea.
+            error (str): Último error registrado.
+        """
+        Task.objects.filter(pk=task_id).update(status='failed', last_error=error, updated_at=timezone.now())
+
+    @staticmethod
+    def requeue_stale(older_than) -> int:
+        """
+        Devuelve a la cola las tareas que quedaron en 'running' porque su worker se detuvo.
+
+        Args:
+            older_than (datetime): Las tareas en ejecución sin cambios desde antes de esta fecha se reencolan.
+
+        Returns:
+            int: Número de tareas reencoladas.
+        """
+        return Task.objects.filter(status='running', updated_at__lt=older_than).update(
+            status='pending', run_after=timezone.now(), updated_at=timezone.now()
+        )
@@ -0,0 +1,61 @@
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+class TokenRepository:
+    """
+    Repositorio para los tokens de refresco emitidos (OutstandingToken) y revocados (BlacklistedToken).
+    """
+
+    @staticmethod
+    def is_blacklisted(jti: str) -> bool:
+        """
+        Args:
+            jti (str): Identificador del token.
+
+        Returns:
+            bool: True si el token está en la lista de revocados.
+        """
+        return BlacklistedToken.objects.filter(token__jti=jti).exists()
+
+    @staticmethod
+    def blacklisted_after(after_id: int, now) -> list:
+        """
+        Lista los tokens revocados con ID mayor que 'after_id' que aún no expiraron.
+
+        Args:
+            after_id (int): ID de BlacklistedToken a partir del cual leer (0 para todos).
+            now (datetime): Momento actual; los tokens expirados se omiten.
+
+        Returns:
+            list: Tuplas (id, jti) ordenadas por ID.
+        """
+        return list(
+            BlacklistedToken.objects.filter(id__gt=after_id, token__expires_at__gt=now)
+            .order_by('id').values_list('id', 'token__jti')
+        )
+
+    @staticmethod
+    def last_blacklisted_id() -> int:
+        """
+        Returns:
+            int: Mayor ID de BlacklistedToken, o 0 si no hay ninguno.
+        """
+        return BlacklistedToken.objects.order_by('-id').values_list('id', flat=True).first() or 0
+
+    @staticmethod
+    def delete_expired(now, batch_size: int) -> int:
+        """
+        Elimina un lote de tokens emitidos ya expirados junto con sus revocaciones.
+
+        Args:
+            now (datetime): Momento actual.
+            batch_size (int): Número máximo de tokens por lote.
+
+        Returns:
+            int: Número de tokens emitidos eliminados.
+        """
+        ids = list(OutstandingToken.objects.filter(expires_at__lte=now).values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return 0
+        BlacklistedToken.objects.filter(token_id__in=ids).delete()
+        deleted, _ = OutstandingToken.objects.filter(id__in=ids).delete()
+        return deleted
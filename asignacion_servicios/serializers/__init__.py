@@ -1,4 +1,6 @@
 from .addressSerializer import AddressSerializer
-from .driverSerializer import DriverSerializer
-from .serviceSerializer import ServiceSerializer
-from .clientSerializer import ClientSerializer
\ No newline at end of file
+from .driverSerializer import DriverSerializer, DriverListSerializer
+from .serviceSerializer import ServiceSerializer, ServiceListSerializer, ServiceBulkTransitionSerializer, DistanceMatrixSerializer
+from .clientSerializer import ClientSerializer
+from .validationContext import ValidationContext
+from .sparseFields import SparseFieldsMixin, parse_sparse_fields
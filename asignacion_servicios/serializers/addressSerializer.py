@@ -1,17 +1,21 @@
 from rest_framework import serializers
 from asignacion_servicios.models import Address
+from .sparseFields import SparseFieldsMixin
 
-class AddressSerializer(serializers.ModelSerializer):
+class AddressSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Address.
 
-    Valida que los campos obligatorios no estén vacíos, que las coordenadas sean válidas y que la dirección sea única.
+    Valida que los campos obligatorios no estén vacíos, que las coordenadas sean válidas y que al actualizar
+    la dirección no coincida con otra existente.
     """
 
     class Meta:
         model = Address
         fields = ['id', 'name', 'country', 'city', 'street', 'latitude', 'longitude']
         read_only_fields = ['id']
+        # La unicidad se valida en validate() solo al actualizar; al crear se retorna la dirección existente.
+        validators = []
 
     def _validate_not_empty(self, value, field_name):
         """
@@ -103,7 +107,7 @@ class AddressSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         """
-        Valida que ambas coordenadas estén presentes o ninguna, y que la dirección sea única.
+        Valida que ambas coordenadas estén presentes o ninguna y, al actualizar, que la dirección sea única.
 
         Args:
             attrs (dict): Diccionario de atributos validados.
@@ -119,7 +123,10 @@ class AddressSerializer(serializers.ModelSerializer):
         if (latitude is None and longitude is not None) or (latitude is not None and longitude is None):
             raise serializers.ValidationError("Ambas coordenadas (latitud y longitud) deben estar presentes o ninguna.")
 
+        # Al crear, una dirección equivalente no es un error: AddressService retorna la existente.
         instance = getattr(self, 'instance', None)
+        if instance is None:
+            return attrs
         queryset = Address.objects.filter(
             city=attrs.get('city', instance.city if instance else None),
             country=attrs.get('country', instance.country if instance else None),
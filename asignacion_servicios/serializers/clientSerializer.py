@@ -1,18 +1,28 @@
 from rest_framework import serializers
-from asignacion_servicios.models import Client
+from asignacion_servicios.models import Client, Address
+from .sparseFields import SparseFieldsMixin
+from .validationContext import ValidationContextMixin, ContextPrimaryKeyRelatedField
 import re
 
-class ClientSerializer(serializers.ModelSerializer):
+class ClientSerializer(SparseFieldsMixin, ValidationContextMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Client.
 
     Valida los campos obligatorios, el formato del teléfono, unicidad del email y que la dirección sea obligatoria.
+    La existencia de la dirección y la unicidad del email y del teléfono se resuelven juntas en el
+    ValidationContext de la petición (una consulta por modelo).
     """
+    address = ContextPrimaryKeyRelatedField(queryset=Address.objects.all())
+
+    context_related_fields = {'address': Address}
+    context_unique_fields = ('email', 'phone')
 
     class Meta:
         model = Client
         fields = ['id', 'name', 'phone', 'email', 'address', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # La unicidad se valida en validate_email y validate_phone a través del ValidationContext.
+        extra_kwargs = {'email': {'validators': []}, 'phone': {'validators': []}}
 
     def validate_name(self, value: str) -> str:
         """
@@ -35,19 +45,21 @@ class ClientSerializer(serializers.ModelSerializer):
 
     def validate_phone(self, value: str) -> str:
         """
-        Valida el formato del número de teléfono.
+        Valida el formato y unicidad del número de teléfono.
 
         Args:
             value (str): Número de teléfono.
 
         Raises:
-            serializers.ValidationError: Si el teléfono es inválido.
+            serializers.ValidationError: Si el teléfono es inválido o ya está registrado.
 
         Returns:
             str: Teléfono validado.
         """
         if not re.match(r'^\+?\d{9,15}$', value):
             raise serializers.ValidationError("El número de teléfono debe tener entre 9 y 15 dígitos y puede incluir un '+' al inicio.")
+        if self.validation_context.is_taken(Client, 'phone', value, exclude_pk=self._instance_pk()):
+            raise serializers.ValidationError("El número de teléfono ya está registrado.")
         return value
 
     def validate_email(self, value: str) -> str:
@@ -63,10 +75,16 @@ class ClientSerializer(serializers.ModelSerializer):
         Returns:
             str: Correo validado.
         """
-        if Client.objects.filter(email=value).exists():
+        if self.validation_context.is_taken(Client, 'email', value, exclude_pk=self._instance_pk()):
             raise serializers.ValidationError("El correo electrónico ya está registrado.")
         return value
 
+    def _instance_pk(self):
+        """
+        Retorna la PK del cliente que se está actualizando, o None al crear.
+        """
+        return self.instance.pk if self.instance is not None else None
+
     def validate_address(self, value) -> int:
         """
         Valida que la dirección no sea nula.
@@ -1,18 +1,29 @@
 from rest_framework import serializers
 from asignacion_servicios.models import Driver, Address
+from .valuesSerializer import ValuesListSerializer
+from .sparseFields import SparseFieldsMixin
+from .validationContext import ValidationContextMixin, ContextPrimaryKeyRelatedField
 import re
 
-class DriverSerializer(serializers.ModelSerializer):
+class DriverSerializer(SparseFieldsMixin, ValidationContextMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Driver.
 
     Valida el nombre, el formato y unicidad del teléfono, y la existencia de la dirección.
+    La existencia de la dirección y la unicidad del teléfono se resuelven juntas en el
+    ValidationContext de la petición (una consulta por modelo).
     """
+    address = ContextPrimaryKeyRelatedField(queryset=Address.objects.all())
+
+    context_related_fields = {'address': Address}
+    context_unique_fields = ('phone',)
 
     class Meta:
         model = Driver
-        fields = ['id', 'name', 'phone', 'address', 'is_available']
-        read_only_fields = ['id']
+        fields = ['id', 'name', 'phone', 'address', 'is_available', 'capacity', 'active_services']
+        read_only_fields = ['id', 'active_services']
+        # La unicidad del teléfono se valida en validate_phone a través del ValidationContext.
+        extra_kwargs = {'phone': {'validators': []}}
 
     def validate_name(self, value: str) -> str:
         """
@@ -44,11 +55,8 @@ class DriverSerializer(serializers.ModelSerializer):
         Returns:
             int: ID de la dirección validada.
         """
-        if isinstance(value, int):
-            try:
-                Address.objects.get(pk=value)
-            except Address.DoesNotExist:
-                raise serializers.ValidationError(f"La dirección con ID {value} no existe.")
+        if isinstance(value, int) and self.validation_context.get_instance(Address, value) is None:
+            raise serializers.ValidationError(f"La dirección con ID {value} no existe.")
         return value
 
     def validate_phone(self, value: str) -> str:
@@ -68,9 +76,15 @@ class DriverSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("El teléfono debe tener entre 9 y 15 dígitos y puede incluir un '+' al inicio.")
 
         instance = getattr(self, 'instance', None)
-        qs = Driver.objects.filter(phone=value)
-        if instance:
-            qs = qs.exclude(pk=instance.pk)
-        if qs.exists():
+        if self.validation_context.is_taken(Driver, 'phone', value, exclude_pk=instance.pk if instance else None):
             raise serializers.ValidationError("Ya existe un conductor con este teléfono.")
-        return value
\ No newline at end of file
+        return value
+
+
+class DriverListSerializer(ValuesListSerializer):
+    """
+    Serializador de solo lectura para listados de conductores a partir de .values_list().
+
+    Produce exactamente la misma salida que DriverSerializer.
+    """
+    serializer_class = DriverSerializer
@@ -1,7 +1,13 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
 from rest_framework import serializers
 from asignacion_servicios.models import Service, Driver, Address
+from asignacion_servicios.workflow import ServiceStateMachine
+from .valuesSerializer import ValuesListSerializer
+from .sparseFields import SparseFieldsMixin
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Service.
 
@@ -13,11 +19,21 @@ class ServiceSerializer(serializers.ModelSerializer):
         required=False
     )
     pickup_address = serializers.PrimaryKeyRelatedField(queryset=Address.objects.all())
+    destination_address = serializers.PrimaryKeyRelatedField(
+        queryset=Address.objects.all(),
+        allow_null=True,
+        required=False
+    )
 
     class Meta:
         model = Service
-        fields = ['id', 'pickup_address', 'client', 'driver', 'status', 'estimated_time', 'distance', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        fields = [
+            'id', 'pickup_address', 'destination_address', 'client', 'driver', 'status', 'estimated_time', 'distance',
+            'trip_distance', 'trip_estimated_time', 'scheduled_for', 'batch_id', 'batch_position', 'created_at', 'updated_at'
+        ]
+        read_only_fields = [
+            'id', 'trip_distance', 'trip_estimated_time', 'batch_id', 'batch_position', 'created_at', 'updated_at'
+        ]
 
     def validate_status(self, value: str) -> str:
         """
@@ -27,18 +43,14 @@ class ServiceSerializer(serializers.ModelSerializer):
             value (str): Estado del servicio.
 
         Raises:
-            serializers.ValidationError: Si el estado es inválido o si se intenta cambiar el estado de un servicio completado.
+            serializers.ValidationError: Si el estado es inválido o la transición desde el estado actual no está permitida.
 
         Returns:
             str: Estado validado.
         """
-        if self.instance and self.instance.status == 'completed':
-            raise serializers.ValidationError("No se puede cambiar el estado de un servicio ya completado.")
-        valid_statuses = [choice[0] for choice in Service.STATUS_CHOICES]
-        if value not in valid_statuses:
-            raise serializers.ValidationError(
-                f"El estado '{value}' no es válido. Los estados permitidos son: {', '.join(valid_statuses)}."
-            )
+        error = ServiceStateMachine.status_error(self.instance.status if self.instance else None, value)
+        if error:
+            raise serializers.ValidationError(error)
         return value
 
     def validate_estimated_time(self, value: float) -> float:
@@ -58,6 +70,28 @@ class ServiceSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("El tiempo estimado debe ser mayor que 0.")
         return value
 
+    def validate_scheduled_for(self, value):
+        """
+        Valida que la hora programada sea futura y no supere SCHEDULED_SERVICES_MAX_DAYS.
+
+        Args:
+            value (datetime): Hora de recogida programada.
+
+        Raises:
+            serializers.ValidationError: Si la hora ya pasó o está demasiado lejos.
+
+        Returns:
+            datetime: Hora validada.
+        """
+        if value is None:
+            return value
+        now = timezone.now()
+        if value <= now:
+            raise serializers.ValidationError("La hora programada debe ser futura.")
+        if value > now + timedelta(days=getattr(settings, 'SCHEDULED_SERVICES_MAX_DAYS', 30)):
+            raise serializers.ValidationError("La hora programada excede el máximo permitido.")
+        return value
+
     def validate_distance(self, value: float) -> float:
         """
         Valida que la distancia sea mayor que 0.
@@ -88,13 +122,77 @@ class ServiceSerializer(serializers.ModelSerializer):
         Returns:
             dict: Atributos validados.
         """
-        status = attrs.get('status')
-        driver = attrs.get('driver')
+        error = ServiceStateMachine.driver_error(attrs.get('status'), attrs.get('driver') is not None)
+        if error:
+            raise serializers.ValidationError(error)
+        return attrs
 
-        if status == 'completed' and driver is None:
-            raise serializers.ValidationError("Un servicio completado debe tener un conductor asignado.")
 
-        if status == 'pending' and driver is not None:
-            raise serializers.ValidationError("Un servicio pendiente no debe tener un conductor asignado.")
+class ServiceListSerializer(ValuesListSerializer):
+    """
+    Serializador de solo lectura para listados de servicios a partir de .values_list().
+
+    Produce exactamente la misma salida que ServiceSerializer.
+    """
+    serializer_class = ServiceSerializer
+
+
+class ServiceBulkTransitionSerializer(serializers.Serializer):
+    """
+    Serializador de entrada para la transición masiva de estado de servicios.
 
-        return attrs
\ No newline at end of file
+    Valida la lista de IDs y que el estado destino admita transiciones masivas.
+    """
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000
+    )
+    status = serializers.ChoiceField(choices=ServiceStateMachine.BULK_TARGETS)
+
+
+class DistancePointField(serializers.Field):
+    """
+    Punto de una matriz de distancias: el ID de una dirección o un par [latitud, longitud].
+    """
+
+    default_error_messages = {
+        'invalid': "Cada punto debe ser el ID de una dirección o un par [latitud, longitud].",
+        'out_of_range': "La latitud debe estar entre -90 y 90 y la longitud entre -180 y 180.",
+    }
+
+    def to_internal_value(self, data):
+        """
+        Convierte el valor recibido en un ID (int) o en una tupla (latitud, longitud).
+
+        Raises:
+            serializers.ValidationError: Si el valor no es un ID ni un par de coordenadas válido.
+        """
+        if isinstance(data, bool):
+            self.fail('invalid')
+        if isinstance(data, int):
+            if data < 1:
+                self.fail('invalid')
+            return data
+        if not isinstance(data, (list, tuple)) or len(data) != 2:
+            self.fail('invalid')
+        try:
+            latitude, longitude = float(data[0]), float(data[1])
+        except (TypeError, ValueError):
+            self.fail('invalid')
+        if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+            self.fail('out_of_range')
+        return latitude, longitude
+
+    def to_representation(self, value):
+        return value
+
+
+class DistanceMatrixSerializer(serializers.Serializer):
+    """
+    Serializador de entrada para la matriz de distancias (cotizaciones).
+
+    Valida que 'origins' y 'destinations' sean listas no vacías de IDs de dirección o pares de coordenadas.
+    """
+    origins = serializers.ListField(child=DistancePointField(), allow_empty=False)
+    destinations = serializers.ListField(child=DistancePointField(), allow_empty=False)
@@ -0,0 +1,36 @@
+class SparseFieldsMixin:
+    """
+    Mixin para ModelSerializer que limita la representación a un subconjunto de campos
+    (?fields=id,status,driver), recibido con el argumento 'fields'.
+
+    Los campos no pedidos se eliminan del serializador, así que tampoco se leen del modelo.
+    """
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+def parse_sparse_fields(value: str, available) -> list:
+    """
+    Convierte el parámetro 'fields' en la lista de campos pedidos, en el orden del serializador.
+
+    Args:
+        value (str): Nombres separados por comas, o None.
+        available (iterable): Campos del serializador en su orden.
+
+    Raises:
+        ValueError: Si se pide algún campo que el serializador no tiene.
+
+    Returns:
+        list o None: Campos pedidos, o None si no se pidió un subconjunto.
+    """
+    if not value:
+        return None
+    requested = {name.strip() for name in value.split(',') if name.strip()}
+    unknown = requested - set(available)
+    if unknown:
+        raise ValueError(f"Campos desconocidos en 'fields': {', '.join(sorted(unknown))}.")
+    return [name for name in available if name in requested]
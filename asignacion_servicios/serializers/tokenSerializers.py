@@ -0,0 +1,29 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ValidationError
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from asignacion_servicios.services import TokenRevocationService
+
+
+class RefreshToken(tokens.RefreshToken):
+    """
+    RefreshToken que comprueba la revocación con el filtro de TokenRevocationService antes de consultar la base de datos.
+    """
+
+    def check_blacklist(self) -> None:
+        if TokenRevocationService.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
+
+
+class TokenVerifySerializer(jwt_serializers.TokenVerifySerializer):
+    def validate(self, attrs: dict) -> dict:
+        token = tokens.UntypedToken(attrs["token"])
+        if api_settings.BLACKLIST_AFTER_ROTATION and TokenRevocationService.is_revoked(token.get(api_settings.JTI_CLAIM)):
+            raise ValidationError(_("Token is blacklisted"))
+        return {}
@@ -0,0 +1,176 @@
+from collections import defaultdict
+from collections.abc import Mapping
+from django.db.models import Q
+from rest_framework import serializers
+
+
+class ValidationContext:
+    """
+    Contexto de validación compartido durante una petición.
+
+    Acumula las comprobaciones de existencia de claves foráneas y de unicidad que necesita
+    una petición y las resuelve con una sola consulta por modelo. Los resultados quedan en
+    caché para que el serializador y la capa de servicios no repitan las mismas consultas.
+    Las comprobaciones que no se registraron antes de resolve() se consultan al momento.
+    """
+
+    def __init__(self):
+        self._pending_pks = defaultdict(set)
+        self._pending_unique = defaultdict(lambda: defaultdict(set))
+        self._instances = {}
+        self._unique_owners = {}
+
+    def require_pk(self, model, pk) -> None:
+        """
+        Registra que se necesita la instancia de 'model' con la PK dada.
+
+        Args:
+            model (Model): Modelo Django.
+            pk: PK de la instancia (se ignora si no es un entero válido).
+        """
+        pk = self._normalize_pk(pk)
+        if pk is not None and (model, pk) not in self._instances:
+            self._pending_pks[model].add(pk)
+
+    def require_unique(self, model, field: str, value) -> None:
+        """
+        Registra que se debe comprobar si 'value' ya está usado en el campo único 'field' de 'model'.
+
+        Args:
+            model (Model): Modelo Django.
+            field (str): Nombre del campo único.
+            value: Valor a comprobar.
+        """
+        if value is not None and (model, field, value) not in self._unique_owners:
+            self._pending_unique[model][field].add(value)
+
+    def resolve(self) -> None:
+        """
+        Ejecuta las comprobaciones pendientes con una consulta por modelo.
+        """
+        for model in set(self._pending_pks) | set(self._pending_unique):
+            pks = self._pending_pks.pop(model, set())
+            unique = self._pending_unique.pop(model, {})
+
+            condition = Q(pk__in=pks) if pks else Q()
+            for field, values in unique.items():
+                condition |= Q(**{f'{field}__in': values})
+
+            owners = defaultdict(set)
+            for obj in model._default_manager.filter(condition):
+                if obj.pk in pks:
+                    self._instances[(model, obj.pk)] = obj
+                for field in unique:
+                    owners[(field, getattr(obj, field))].add(obj.pk)
+
+            for pk in pks:
+                self._instances.setdefault((model, pk), None)
+            for field, values in unique.items():
+                for value in values:
+                    self._unique_owners[(model, field, value)] = owners.get((field, value), set())
+
+    def get_instance(self, model, pk):
+        """
+        Obtiene la instancia de 'model' con la PK dada, consultando solo si no está en caché.
+
+        Args:
+            model (Model): Modelo Django.
+            pk: PK de la instancia.
+
+        Returns:
+            Model o None: Instancia o None si no existe.
+        """
+        pk = self._normalize_pk(pk)
+        if pk is None:
+            return None
+        if (model, pk) not in self._instances:
+            self.require_pk(model, pk)
+            self.resolve()
+        return self._instances[(model, pk)]
+
+    def is_taken(self, model, field: str, value, exclude_pk=None) -> bool:
+        """
+        Indica si 'value' ya está usado en el campo único 'field' por otra instancia.
+
+        Args:
+            model (Model): Modelo Django.
+            field (str): Nombre del campo único.
+            value: Valor a comprobar.
+            exclude_pk (int, optional): PK de la instancia que se está actualizando.
+
+        Returns:
+            bool: True si otra instancia ya usa el valor.
+        """
+        if value is None:
+            return False
+        if (model, field, value) not in self._unique_owners:
+            self.require_unique(model, field, value)
+            self.resolve()
+        owners = self._unique_owners[(model, field, value)]
+        if exclude_pk is not None:
+            owners = owners - {self._normalize_pk(exclude_pk)}
+        return bool(owners)
+
+    @staticmethod
+    def _normalize_pk(pk):
+        if isinstance(pk, bool):
+            return None
+        if hasattr(pk, 'pk'):
+            return pk.pk
+        try:
+            return int(pk)
+        except (TypeError, ValueError):
+            return None
+
+
+class ContextPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que obtiene la instancia relacionada del ValidationContext
+    del serializador en lugar de hacer su propia consulta.
+    """
+
+    def to_internal_value(self, data):
+        validation = self.root.context.get('validation') if self.root else None
+        if validation is None or ValidationContext._normalize_pk(data) is None:
+            return super().to_internal_value(data)
+
+        instance = validation.get_instance(self.get_queryset().model, data)
+        if instance is None:
+            self.fail('does_not_exist', pk_value=data)
+        return instance
+
+
+class ValidationContextMixin:
+    """
+    Mixin para ModelSerializers que registra en el ValidationContext todas las comprobaciones
+    de la petición antes de validar campo por campo, para resolverlas juntas.
+
+    Las subclases definen:
+        context_related_fields (dict): Campo -> modelo de las claves foráneas a comprobar.
+        context_unique_fields (tuple): Campos únicos del modelo a comprobar.
+    """
+
+    context_related_fields = {}
+    context_unique_fields = ()
+
+    @property
+    def validation_context(self) -> ValidationContext:
+        """
+        Retorna el ValidationContext de la petición, creándolo si el contexto no trae uno.
+        """
+        context = self.context
+        if 'validation' not in context:
+            context['validation'] = ValidationContext()
+        return context['validation']
+
+    def run_validation(self, data=serializers.empty):
+        if isinstance(data, Mapping):
+            validation = self.validation_context
+            for field, model in self.context_related_fields.items():
+                validation.require_pk(model, data.get(field))
+            for field in self.context_unique_fields:
+                value = data.get(field)
+                if isinstance(value, str):
+                    validation.require_unique(self.Meta.model, field, value.strip())
+            validation.resolve()
+        return super().run_validation(data)
@@ -0,0 +1,63 @@
+from rest_framework.relations import RelatedField
+
+
+class ValuesListSerializer:
+    """
+    Serializador de solo lectura para listados, construido sobre tuplas de .values_list().
+
+    Reproduce la salida de un ModelSerializer (mismos campos, mismo orden y mismo formato de
+    cada valor) sin instanciar modelos ni un serializador por fila. Los campos relacionados se
+    leen de su columna '<campo>_id' y el resto se convierte con el to_representation del campo
+    del ModelSerializer original, por lo que fechas, decimales y choices mantienen su formato.
+
+    Las subclases definen 'serializer_class' con el ModelSerializer a imitar. Con 'fields'
+    (?fields=...) solo se leen y representan esas columnas.
+    """
+
+    serializer_class = None
+
+    def __init__(self, fields=None):
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        self.columns = []
+        self._plan = []
+        for name, field in serializer.fields.items():
+            if field.write_only or (fields is not None and name not in fields):
+                continue
+            if isinstance(field, RelatedField):
+                self.columns.append(model._meta.get_field(field.source).attname)
+                self._plan.append((name, None))
+            else:
+                self.columns.append(field.source)
+                self._plan.append((name, field.to_representation))
+
+    def values(self, queryset):
+        """
+        Limita el queryset a las columnas que necesita el serializador.
+
+        Args:
+            queryset (QuerySet): QuerySet del modelo.
+
+        Returns:
+            QuerySet: QuerySet de tuplas en el orden de 'columns'.
+        """
+        return queryset.values_list(*self.columns)
+
+    def to_representation(self, rows) -> list:
+        """
+        Convierte las tuplas en la representación del ModelSerializer.
+
+        Args:
+            rows (iterable): Tuplas obtenidas con values().
+
+        Returns:
+            list: Lista de diccionarios, uno por fila.
+        """
+        plan = self._plan
+        return [
+            {
+                name: value if value is None or convert is None else convert(value)
+                for (name, convert), value in zip(plan, row)
+            }
+            for row in rows
+        ]
@@ -1,4 +1,12 @@
 from .addressService import AddressService
 from .driverService import DriverService
 from .serviceService import ServiceService
-from .clientService import ClientService
\ No newline at end of file
+from .clientService import ClientService
+from .offerService import OfferService
+from .taskService import TaskService
+from .outboxService import OutboxService
+from .heatmapService import HeatmapService
+from .repositioningService import RepositioningService
+from .batchingService import BatchingService
+from .schedulingService import SchedulingService
+from .tokenRevocationService import TokenRevocationService
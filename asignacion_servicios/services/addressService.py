@@ -2,7 +2,9 @@ from asignacion_servicios.repositories import AddressRepository
 from asignacion_servicios.models import Address
 from asignacion_servicios.serializers import AddressSerializer
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import router, transaction
 from django.db.models import QuerySet
+from asignacion_servicios.utils import GeoArea, neighbour_cells, normalize_text
 
 class AddressService:
     """
@@ -12,31 +14,51 @@ class AddressService:
     @staticmethod
     def create_address(data: dict) -> Address:
         """
-        Crea una nueva dirección si no existe una igual.
+        Crea una nueva dirección o retorna la existente si ya hay una equivalente.
 
         Args:
             data (dict): Diccionario con los datos de la dirección.
 
         Raises:
-            ValidationError: Si los datos no son válidos o la dirección ya existe.
+            ValidationError: Si los datos no son válidos.
 
         Returns:
-            Address: Instancia creada de Address.
+            Address: Instancia de Address creada o existente.
+        """
+        address, _ = AddressService.get_or_create_address(data)
+        return address
+
+    @staticmethod
+    def get_or_create_address(data: dict) -> tuple:
+        """
+        Busca una dirección equivalente (misma ciudad y calle normalizadas y coordenadas en la
+        misma celda de la rejilla o en una vecina) y, si no existe, la crea. La búsqueda y la
+        creación se hacen bajo un lock sobre la ciudad y calle normalizadas, así que las peticiones
+        concurrentes con la misma dirección retornan la misma fila.
+
+        Args:
+            data (dict): Diccionario con los datos de la dirección.
+
+        Raises:
+            ValidationError: Si los datos no son válidos.
+
+        Returns:
+            tuple: (Address, bool) La dirección y True si se creó.
         """
         serializer = AddressSerializer(data=data)
         if not serializer.is_valid():
             raise ValidationError(serializer.errors)
 
-        if AddressRepository.exists(
-            city=data.get('city'),
-            country=data.get('country'),
-            street=data.get('street'),
-            latitude=data.get('latitude'),
-            longitude=data.get('longitude')
-        ):
-            raise ValidationError("Esta dirección ya existe.")
-
-        return AddressRepository.create(serializer.validated_data)
+        validated = serializer.validated_data
+        city, street = normalize_text(validated.get('city')), normalize_text(validated.get('street'))
+        with transaction.atomic(using=router.db_for_write(Address)):
+            AddressRepository.lock_dedupe_key(city, street)
+            existing = AddressRepository.find_duplicate(
+                city, street, neighbour_cells(validated['latitude'], validated['longitude'])
+            )
+            if existing is not None:
+                return existing, False
+            return AddressRepository.create(validated), True
 
     @staticmethod
     def get_address(address_id: int) -> Address:
@@ -58,9 +80,26 @@ class AddressService:
             raise ObjectDoesNotExist(f"La dirección con ID {address_id} no existe.")
 
     @staticmethod
-    def list_addresses(filters: dict = None) -> QuerySet:
+    def list_addresses(filters: dict = None, area: GeoArea = None) -> QuerySet:
+        """
+        Lista direcciones, opcionalmente filtrando por país y/o ciudad y por zona geográfica.
+
+        Args:
+            filters (dict, optional): Diccionario con filtros de país y/o ciudad.
+            area (GeoArea, optional): Radio o bounding box; con radio se ordena por cercanía.
+
+        Returns:
+            QuerySet: QuerySet con las direcciones filtradas o todas si no hay filtros.
+        """
+        addresses = AddressService._filter_addresses(filters)
+        if area is not None:
+            addresses = area.apply(addresses)
+        return addresses
+
+    @staticmethod
+    def _filter_addresses(filters: dict = None) -> QuerySet:
         """
-        Lista direcciones, opcionalmente filtrando por país y/o ciudad.
+        Filtra direcciones por país y/o ciudad.
 
         Args:
             filters (dict, optional): Diccionario con filtros de país y/o ciudad.
@@ -108,13 +147,20 @@ class AddressService:
         if not serializer.is_valid():
             raise ValidationError(serializer.errors)
 
-        unique_fields = ['city', 'country', 'street', 'latitude', 'longitude']
-        if all(field in serializer.validated_data for field in unique_fields):
-            filters = {field: serializer.validated_data[field] for field in unique_fields}
-            if Address.objects.filter(**filters).exclude(pk=address_id).exists():
+        validated = serializer.validated_data
+        if not any(field in validated for field in ('city', 'street', 'latitude', 'longitude')):
+            return AddressRepository.update(address, validated)
+
+        # Misma regla y mismo lock que get_or_create_address: la dirección resultante no puede
+        # coincidir con otra en la misma celda o en una vecina.
+        city = normalize_text(validated.get('city', address.city))
+        street = normalize_text(validated.get('street', address.street))
+        cells = neighbour_cells(validated.get('latitude', address.latitude), validated.get('longitude', address.longitude))
+        with transaction.atomic(using=router.db_for_write(Address)):
+            AddressRepository.lock_dedupe_key(city, street)
+            if AddressRepository.find_duplicate(city, street, cells, exclude_id=address.id) is not None:
                 raise ValidationError("Otra dirección con estos datos ya existe.")
-
-        return AddressRepository.update(address, serializer.validated_data)
+            return AddressRepository.update(address, validated)
 
     @staticmethod
     def delete_address(address_id: int) -> None:
@@ -133,3 +179,50 @@ class AddressService:
             raise ObjectDoesNotExist(f"La dirección con ID {address_id} no existe.")
 
         AddressRepository.delete(address)
+
+    @staticmethod
+    def merge_duplicates(dry_run: bool = False) -> tuple:
+        """
+        Fusiona las direcciones duplicadas (misma ciudad y calle normalizadas, en la misma celda o
+        en una vecina, como en get_or_create_address): conserva la más antigua de cada grupo y
+        reasigna a ella conductores, clientes y servicios.
+
+        Args:
+            dry_run (bool, optional): Si es True, solo cuenta lo que se fusionaría.
+
+        Returns:
+            tuple: (grupos de duplicados, direcciones eliminadas)
+        """
+        groups = AddressRepository.duplicate_groups()
+        if dry_run:
+            return len(groups), sum(len(group) - 1 for group in groups)
+        removed = 0
+        for keep_id, *duplicate_ids in groups:
+            with transaction.atomic():
+                removed += AddressRepository.merge_into(keep_id, duplicate_ids)
+        return len(groups), removed
+
+    @staticmethod
+    def renormalize(batch_size: int = 2000) -> int:
+        """
+        Recalcula los campos normalizados de todas las direcciones, por ejemplo tras cambiar
+        ADDRESS_GRID_DEGREES.
+
+        Args:
+            batch_size (int, optional): Direcciones por sentencia UPDATE.
+
+        Returns:
+            int: Número de direcciones procesadas.
+        """
+        total = 0
+        batch = []
+        for address in AddressRepository.list_all().order_by('id').iterator(chunk_size=batch_size):
+            address.normalize()
+            batch.append(address)
+            if len(batch) >= batch_size:
+                total += AddressRepository.bulk_update_normalized(batch)
+                batch = []
+        if batch:
+            total += AddressRepository.bulk_update_normalized(batch)
+        return total
+
@@ -0,0 +1,139 @@
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from asignacion_servicios.dispatch import city_key, group_pickups, route_order
+from asignacion_servicios.models import Service
+from asignacion_servicios.repositories import DriverRepository, OutboxRepository, ServiceRepository
+from asignacion_servicios.tasks.serviceTasks import notify_driver_assigned
+from .taskService import TaskService
+
+class BatchingService:
+    """
+    Servicio que agrupa servicios pendientes con recogidas cercanas y los asigna a un solo
+    conductor con capacidad suficiente, ordenando las recogidas en una ruta.
+
+    Con DISPATCH_BATCHING_ENABLED los servicios nuevos quedan pendientes y el worker
+    (python manage.py batch_services) los asigna en lotes.
+    """
+
+    @staticmethod
+    def enabled() -> bool:
+        """
+        Indica si los servicios nuevos se asignan en lotes en lugar de inmediatamente.
+
+        Returns:
+            bool: Valor de DISPATCH_BATCHING_ENABLED.
+        """
+        return getattr(settings, 'DISPATCH_BATCHING_ENABLED', False)
+
+    @staticmethod
+    def run_once(now=None) -> tuple:
+        """
+        Agrupa los servicios pendientes sin conductor y asigna los grupos listos: los que alcanzaron
+        DISPATCH_BATCH_MAX_SIZE recogidas o cuya recogida más antigua esperó DISPATCH_BATCH_HOLD_SECONDS.
+
+        Args:
+            now (datetime, optional): Momento de referencia; por defecto ahora.
+
+        Returns:
+            tuple: (grupos asignados, servicios asignados)
+        """
+        now = now or timezone.now()
+        max_size = getattr(settings, 'DISPATCH_BATCH_MAX_SIZE', 3)
+        hold_seconds = getattr(settings, 'DISPATCH_BATCH_HOLD_SECONDS', 30)
+        # Los servicios programados entran en los lotes a partir de DISPATCH_SCHEDULE_LEAD_SECONDS antes de su hora.
+        lead = timedelta(seconds=getattr(settings, 'DISPATCH_SCHEDULE_LEAD_SECONDS', 600))
+        pending = list(
+            ServiceRepository.filter_by(
+                Q(scheduled_for__isnull=True) | Q(scheduled_for__lte=now + lead),
+                status='pending', driver__isnull=True,
+                pickup_address__latitude__isnull=False, pickup_address__longitude__isnull=False,
+            ).select_related('pickup_address').order_by('created_at', 'id')
+        )
+        groups = group_pickups(
+            [
+                (
+                    city_key(service.pickup_address.country, service.pickup_address.city),
+                    service.pickup_address.latitude, service.pickup_address.longitude, service.created_at,
+                )
+                for service in pending
+            ],
+            radius_km=getattr(settings, 'DISPATCH_BATCH_RADIUS_KM', 1.5),
+            window_seconds=getattr(settings, 'DISPATCH_BATCH_WINDOW_SECONDS', 120),
+            max_size=max_size,
+        )
+
+        assigned_groups = assigned_services = 0
+        for group in groups:
+            services = [pending[index] for index in group]
+            waited = (now - services[0].created_at).total_seconds()
+            if len(services) < max_size and waited < hold_seconds:
+                continue
+            assigned = BatchingService.assign_group(services)
+            if assigned:
+                assigned_groups += 1
+                assigned_services += assigned
+        return assigned_groups, assigned_services
+
+    @staticmethod
+    def assign_group(services: list) -> int:
+        """
+        Asigna un grupo de servicios pendientes al mejor conductor con capacidad libre para todos.
+
+        Si ningún conductor tiene capacidad para el grupo completo, se descartan las recogidas
+        más lejanas hasta encontrar uno. La reserva del conductor y las asignaciones se confirman
+        en una sola transacción; si algún servicio dejó de estar pendiente, el grupo se revierte
+        y se reintenta en el siguiente ciclo.
+
+        Args:
+            services (list): Servicios pendientes; el primero es la recogida más antigua.
+
+        Returns:
+            int: Número de servicios asignados (0 si no hubo conductor o el grupo cambió).
+        """
+        from .serviceService import ServiceService
+
+        driver = None
+        while services:
+            driver, _ = ServiceService._find_closest_driver(services[0].pickup_address, min_slots=len(services))
+            if driver is not None:
+                break
+            services = services[:-1]
+        if driver is None:
+            return 0
+
+        start = (driver.address.latitude, driver.address.longitude)
+        order, cumulative = route_order(
+            start, [(service.pickup_address.latitude, service.pickup_address.longitude) for service in services]
+        )
+        batch_id = uuid.uuid4() if len(services) > 1 else None
+        speed = getattr(settings, 'DISPATCH_AVERAGE_SPEED_KMH', 40)
+        try:
+            with transaction.atomic():
+                if not DriverRepository.claim_available(driver.id, slots=len(services)):
+                    raise ValidationError("El conductor no tiene capacidad libre.")
+                for position, (index, distance) in enumerate(zip(order, cumulative)):
+                    service_id = services[index].id
+                    assigned = ServiceRepository.assign_if_pending(
+                        service_id, driver.id, distance, (distance / speed) * 60,
+                        batch_id=batch_id, batch_position=position if batch_id else None,
+                    )
+                    if not assigned:
+                        raise ValidationError("El servicio ya no está pendiente.")
+                ids = [service.id for service in services]
+                OutboxRepository.create_many([
+                    Service.outbox_event(service_id, 'service.driver_assigned', {
+                        'driver_id': driver.id, 'batch_id': str(batch_id) if batch_id else None,
+                    })
+                    for service_id in ids
+                ])
+                Service.record_transitions([(service_id, 'pending', None) for service_id in ids], 'in_progress')
+                for service_id in ids:
+                    TaskService.enqueue(notify_driver_assigned, service_id=service_id)
+        except ValidationError:
+            return 0
+        return len(services)
@@ -1,5 +1,6 @@
 from asignacion_servicios.repositories import ClientRepository
 from asignacion_servicios.models import Client
+from asignacion_servicios.serializers import ValidationContext
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db.models import QuerySet
 
@@ -9,12 +10,14 @@ class ClientService:
     """
 
     @staticmethod
-    def create_client(data: dict) -> Client:
+    def create_client(data: dict, validation_context: ValidationContext = None) -> Client:
         """
         Crea un nuevo cliente si el email y el teléfono no están registrados.
 
         Args:
             data (dict): Diccionario con los datos del cliente.
+            validation_context (ValidationContext, optional): Contexto de validación de la petición,
+                para reutilizar las comprobaciones ya hechas por el serializador.
 
         Raises:
             ValidationError: Si el email o el teléfono ya están registrados.
@@ -22,9 +25,10 @@ class ClientService:
         Returns:
             Client: Instancia creada de Client.
         """
-        if ClientRepository.exists(email=data.get('email')):
+        validation_context = validation_context or ValidationContext()
+        if validation_context.is_taken(Client, 'email', data.get('email')):
             raise ValidationError("El correo electrónico ya está registrado.")
-        if ClientRepository.exists(phone=data.get('phone')):
+        if validation_context.is_taken(Client, 'phone', data.get('phone')):
             raise ValidationError("El número de teléfono ya está registrado.")
 
         return ClientRepository.create(data)
@@ -59,13 +63,15 @@ class ClientService:
         return ClientRepository.list_all()
 
     @staticmethod
-    def update_client(client_id: int, data: dict) -> Client:
+    def update_client(client_id: int, data: dict, validation_context: ValidationContext = None) -> Client:
         """
         Actualiza los datos de un cliente existente.
 
         Args:
             client_id (int): ID del cliente a actualizar.
             data (dict): Diccionario con los nuevos datos.
+            validation_context (ValidationContext, optional): Contexto de validación de la petición,
+                para reutilizar las comprobaciones ya hechas por el serializador.
 
         Raises:
             ObjectDoesNotExist: Si el cliente no existe.
@@ -79,10 +85,11 @@ class ClientService:
         except Client.DoesNotExist:
             raise ObjectDoesNotExist(f"El cliente con ID {client_id} no existe.")
 
-        if 'email' in data and Client.objects.filter(email=data['email']).exclude(pk=client_id).exists():
+        validation_context = validation_context or ValidationContext()
+        if 'email' in data and validation_context.is_taken(Client, 'email', data['email'], exclude_pk=client_id):
             raise ValidationError("Ya existe un cliente con este email.")
 
-        if 'phone' in data and Client.objects.filter(phone=data['phone']).exclude(pk=client_id).exists():
+        if 'phone' in data and validation_context.is_taken(Client, 'phone', data['phone'], exclude_pk=client_id):
             raise ValidationError("Ya existe un cliente con este teléfono.")
 
         for field, value in data.items():
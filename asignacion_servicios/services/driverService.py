@@ -1,6 +1,9 @@
 from asignacion_servicios.repositories import DriverRepository, AddressRepository
 from asignacion_servicios.models import Driver, Service
+from asignacion_servicios.serializers import ValidationContext
+from asignacion_servicios.utils import GeoArea
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
 
 class DriverService:
     """
@@ -8,12 +11,14 @@ class DriverService:
     """
 
     @staticmethod
-    def create_driver(data: dict) -> Driver:
+    def create_driver(data: dict, validation_context: ValidationContext = None) -> Driver:
         """
         Crea un nuevo conductor.
 
         Args:
             data (dict): Diccionario con los datos del conductor.
+            validation_context (ValidationContext, optional): Contexto de validación de la petición,
+                para reutilizar las comprobaciones ya hechas por el serializador.
 
         Raises:
             ObjectDoesNotExist: Si la dirección no existe.
@@ -30,7 +35,8 @@ class DriverService:
             except ObjectDoesNotExist:
                 raise ObjectDoesNotExist(f"La dirección con ID {data['address']} no existe.")
 
-        if 'phone' in data and Driver.objects.filter(phone=data['phone']).exists():
+        validation_context = validation_context or ValidationContext()
+        if 'phone' in data and validation_context.is_taken(Driver, 'phone', data['phone']):
             raise ValidationError(f"Ya existe un conductor con el teléfono {data['phone']}")
 
         return DriverRepository.create(data)
@@ -56,25 +62,20 @@ class DriverService:
         except Service.DoesNotExist:
             raise ObjectDoesNotExist(f"El servicio con ID {service_id} no existe.")
 
-        if service.driver is None or service.driver.id != int(driver_id):
+        if service.driver_id is None or service.driver_id != int(driver_id):
             raise ValidationError("El conductor no está asignado a este servicio.")
 
-        if service.status != 'in_progress':
-            raise ValidationError("Solo se pueden completar servicios que estén en progreso.")
-
-        service.status = 'completed'
-        service.save()
-
-        driver = service.driver
-        driver.is_available = True
-        driver.save()
+        with transaction.atomic():
+            service.transition_to('completed')
+            DriverRepository.release_if_idle([service.driver_id])
 
         return service
 
     @staticmethod
     def assign_driver_to_service(driver_id: int, service_id: int) -> Service:
         """
-        Asigna un conductor a un servicio.
+        Asigna un conductor a un servicio pendiente, reservando su capacidad y guardando la distancia
+        y el tiempo estimado del conductor a la recogida.
 
         Args:
             driver_id (int): ID del conductor.
@@ -82,24 +83,44 @@ class DriverService:
 
         Raises:
             ObjectDoesNotExist: Si el conductor o el servicio no existen.
+            ValidationError: Si el servicio ya no está pendiente o el conductor no está disponible.
 
         Returns:
             Service: Instancia de Service actualizada.
         """
+        from .serviceService import ServiceService
+
         try:
-            service = Service.objects.get(pk=service_id)
+            service = Service.objects.select_related('pickup_address').get(pk=service_id)
         except Service.DoesNotExist:
             raise ObjectDoesNotExist(f"El servicio con ID {service_id} no existe.")
 
         try:
-            driver = Driver.objects.get(pk=driver_id)
+            driver = DriverRepository.filter_by(pk=driver_id).select_related('address').get()
         except Driver.DoesNotExist:
             raise ObjectDoesNotExist(f"El conductor con ID {driver_id} no existe.")
 
-        service.driver = driver
-        service.save()
+        if service.status != 'pending' or service.driver_id is not None:
+            raise ValidationError("El servicio ya no está pendiente.")
+        if not ServiceService.assign_driver(service, driver):
+            raise ValidationError("El conductor no está disponible.")
+        service.refresh_from_db()
         return service
 
+    @staticmethod
+    def reconcile_availability(dry_run: bool = False) -> tuple:
+        """
+        Recalcula en bloque la disponibilidad de los conductores según sus servicios abiertos.
+
+        Args:
+            dry_run (bool, optional): Si es True, solo cuenta los conductores a corregir.
+
+        Returns:
+            tuple: (conductores liberados, conductores marcados como ocupados)
+        """
+        with transaction.atomic():
+            return DriverRepository.reconcile_availability(dry_run=dry_run)
+
     @staticmethod
     def get_driver(driver_id: int) -> Driver:
         """
@@ -120,31 +141,38 @@ class DriverService:
             raise ObjectDoesNotExist(f"El conductor con ID {driver_id} no existe.")
 
     @staticmethod
-    def list_drivers(filters: dict = None):
+    def list_drivers(filters: dict = None, area: GeoArea = None):
         """
-        Lista conductores, opcionalmente filtrando por disponibilidad u otros campos.
+        Lista conductores, opcionalmente filtrando por disponibilidad u otros campos y por la
+        zona geográfica de su dirección.
 
         Args:
             filters (dict, optional): Diccionario de filtros.
+            area (GeoArea, optional): Radio o bounding box; con radio se ordena por cercanía.
 
         Returns:
             QuerySet: QuerySet con los conductores filtrados o todos si no hay filtros.
         """
         if filters is None:
-            return DriverRepository.list_all()
+            drivers = DriverRepository.list_all()
         elif 'is_available' in filters and len(filters) == 1:
-            return DriverRepository.filter_by_status(filters['is_available'])
+            drivers = DriverRepository.filter_by_status(filters['is_available'])
         else:
-            return DriverRepository.filter_by(**filters)
+            drivers = DriverRepository.filter_by(**filters)
+        if area is not None:
+            drivers = area.apply(drivers, prefix='address__')
+        return drivers
 
     @staticmethod
-    def update_driver(driver_id: int, data: dict) -> Driver:
+    def update_driver(driver_id: int, data: dict, validation_context: ValidationContext = None) -> Driver:
         """
         Actualiza los datos de un conductor existente.
 
         Args:
             driver_id (int): ID del conductor.
             data (dict): Diccionario con los nuevos datos.
+            validation_context (ValidationContext, optional): Contexto de validación de la petición,
+                para reutilizar las comprobaciones ya hechas por el serializador.
 
         Raises:
             ObjectDoesNotExist: Si el conductor o la dirección no existen.
@@ -166,8 +194,9 @@ class DriverService:
             except ObjectDoesNotExist:
                 raise ObjectDoesNotExist(f"La dirección con ID {data['address']} no existe.")
 
+        validation_context = validation_context or ValidationContext()
         if 'phone' in data:
-            if Driver.objects.filter(phone=data['phone']).exclude(pk=driver_id).exists():
+            if validation_context.is_taken(Driver, 'phone', data['phone'], exclude_pk=driver_id):
                 raise ValidationError(f"Ya existe un conductor con el teléfono {data['phone']}")
 
         return DriverRepository.update(driver, data)
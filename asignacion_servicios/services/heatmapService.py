@@ -0,0 +1,214 @@
+from collections import Counter
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from asignacion_servicios.models import DemandTile, Service
+from asignacion_servicios.repositories import DemandTileRepository, ServiceRepository
+from asignacion_servicios.utils import geohash_bounds, geohash_encode
+from asignacion_servicios.workflow import on_transition
+
+class HeatmapService:
+    """
+    Servicio del mapa de demanda: mantiene las celdas DemandTile (geohash x ventana de tiempo)
+    y las agrega para GET /api/services/heatmap/ sin recorrer la tabla de servicios.
+    """
+
+    @staticmethod
+    def precision() -> int:
+        """
+        Returns:
+            int: Precisión geohash de las celdas guardadas (HEATMAP_GEOHASH_PRECISION).
+        """
+        return getattr(settings, 'HEATMAP_GEOHASH_PRECISION', 6)
+
+    @staticmethod
+    def window_start(moment: datetime) -> datetime:
+        """
+        Calcula el inicio de la ventana de tiempo que contiene un instante.
+
+        Args:
+            moment (datetime): Instante con zona horaria.
+
+        Returns:
+            datetime: Inicio de la ventana en UTC.
+        """
+        size = getattr(settings, 'HEATMAP_WINDOW_MINUTES', 60) * 60
+        seconds = int(moment.timestamp()) // size * size
+        return datetime.fromtimestamp(seconds, tz=dt_timezone.utc)
+
+    @staticmethod
+    def tile_key(latitude: float, longitude: float, created_at: datetime):
+        """
+        Calcula la celda a la que pertenece un servicio.
+
+        Args:
+            latitude (float): Latitud de la dirección de recogida.
+            longitude (float): Longitud de la dirección de recogida.
+            created_at (datetime): Fecha de creación del servicio.
+
+        Returns:
+            tuple o None: (geohash, inicio de ventana), o None si la dirección no tiene coordenadas.
+        """
+        if latitude is None or longitude is None or created_at is None:
+            return None
+        return geohash_encode(latitude, longitude, HeatmapService.precision()), HeatmapService.window_start(created_at)
+
+    @staticmethod
+    def record_created(service: Service) -> None:
+        """
+        Suma un servicio creado a su celda al confirmarse la transacción, para no bloquear la fila
+        de la celda (compartida por todos los servicios de la zona) mientras se crea el servicio.
+
+        Args:
+            service (Service): Servicio recién creado.
+        """
+        address = service.pickup_address
+        key = HeatmapService.tile_key(address.latitude, address.longitude, service.created_at)
+        if key is not None:
+            transaction.on_commit(lambda: DemandTileRepository.increment(*key, 'requested'))
+
+    @staticmethod
+    def record_closed(service_ids: list, counter: str) -> None:
+        """
+        Suma servicios completados o cancelados a las celdas de su creación, leyendo todas
+        las coordenadas en una consulta y actualizando las celdas en bloque. Como en
+        record_created, las celdas se actualizan al confirmarse la transacción.
+
+        Args:
+            service_ids (list): IDs de los servicios.
+            counter (str): 'completed' o 'canceled'.
+        """
+        rows = ServiceRepository.filter_by(pk__in=service_ids).values_list(
+            'pickup_address__latitude', 'pickup_address__longitude', 'created_at'
+        )
+        amounts = Counter(HeatmapService.tile_key(*row) for row in rows)
+        amounts.pop(None, None)
+        if amounts:
+            transaction.on_commit(lambda: DemandTileRepository.increment_many(amounts, counter))
+
+    @staticmethod
+    def heatmap(since: str = None, until: str = None, precision: str = None) -> dict:
+        """
+        Agrega las celdas precalculadas de un rango de tiempo.
+
+        Args:
+            since (str, optional): Inicio ISO 8601; por defecto HEATMAP_DEFAULT_HOURS antes de 'until'.
+            until (str, optional): Fin ISO 8601; por defecto ahora.
+            precision (str, optional): Longitud del geohash agrupado (1 a HEATMAP_GEOHASH_PRECISION).
+
+        Raises:
+            ValidationError: Si las fechas o la precisión no son válidas o el rango excede HEATMAP_MAX_HOURS.
+
+        Returns:
+            dict: Rango, precisión y celdas con sus contadores y límites.
+        """
+        max_precision = HeatmapService.precision()
+        until_dt = HeatmapService._parse_moment(until, 'until') or timezone.now()
+        since_dt = HeatmapService._parse_moment(since, 'since') or (
+            until_dt - timedelta(hours=getattr(settings, 'HEATMAP_DEFAULT_HOURS', 24))
+        )
+        if since_dt >= until_dt:
+            raise ValidationError("'since' debe ser anterior a 'until'.")
+        if until_dt - since_dt > timedelta(hours=getattr(settings, 'HEATMAP_MAX_HOURS', 24 * 31)):
+            raise ValidationError("El rango de tiempo excede el máximo permitido.")
+        try:
+            precision = int(precision) if precision not in (None, '') else max_precision
+        except (TypeError, ValueError):
+            raise ValidationError("La precisión debe ser un número entero.")
+        if not 1 <= precision <= max_precision:
+            raise ValidationError(f"La precisión debe estar entre 1 y {max_precision}.")
+
+        # Las ventanas se incluyen completas: la que contiene 'since' y las que empiezan antes de 'until'.
+        rows = DemandTileRepository.aggregate(HeatmapService.window_start(since_dt), until_dt, precision)
+        tiles = []
+        for row in rows:
+            lat_min, lng_min, lat_max, lng_max = geohash_bounds(row['cell'])
+            tiles.append({
+                'geohash': row['cell'],
+                'bounds': [lng_min, lat_min, lng_max, lat_max],
+                'requested': row['requested'],
+                'completed': row['completed'],
+                'canceled': row['canceled'],
+                'open': row['requested'] - row['completed'] - row['canceled'],
+            })
+        return {
+            'since': since_dt.isoformat(),
+            'until': until_dt.isoformat(),
+            'precision': precision,
+            'window_minutes': getattr(settings, 'HEATMAP_WINDOW_MINUTES', 60),
+            'tiles': tiles,
+        }
+
+    @staticmethod
+    def rebuild(chunk_size: int = 2000) -> int:
+        """
+        Recalcula todas las celdas a partir de los servicios (por ejemplo tras cambiar la precisión
+        o la duración de las ventanas).
+
+        Args:
+            chunk_size (int, optional): Filas leídas por consulta.
+
+        Returns:
+            int: Número de celdas escritas.
+        """
+        counters = {name: Counter() for name in DemandTile.COUNTERS}
+        rows = ServiceRepository.filter_by().order_by().values_list(
+            'pickup_address__latitude', 'pickup_address__longitude', 'created_at', 'status'
+        ).iterator(chunk_size=chunk_size)
+        for latitude, longitude, created_at, status in rows:
+            key = HeatmapService.tile_key(latitude, longitude, created_at)
+            if key is None:
+                continue
+            counters['requested'][key] += 1
+            if status in ('completed', 'canceled'):
+                counters[status][key] += 1
+
+        tiles = [
+            DemandTile(
+                geohash=geohash, window_start=window_start,
+                **{name: counters[name][(geohash, window_start)] for name in DemandTile.COUNTERS}
+            )
+            for geohash, window_start in counters['requested']
+        ]
+        with transaction.atomic():
+            return DemandTileRepository.replace_all(tiles)
+
+    @staticmethod
+    def _parse_moment(value: str, name: str):
+        """
+        Convierte un parámetro ISO 8601 en datetime con zona horaria.
+
+        Args:
+            value (str): Valor recibido, o None.
+            name (str): Nombre del parámetro para el mensaje de error.
+
+        Raises:
+            ValidationError: Si el valor no es una fecha válida.
+
+        Returns:
+            datetime o None: Fecha (UTC si no traía zona horaria) o None si no se recibió.
+        """
+        if value in (None, ''):
+            return None
+        try:
+            moment = parse_datetime(value)
+        except ValueError:
+            moment = None
+        if moment is None:
+            raise ValidationError(f"'{name}' debe ser una fecha ISO 8601.")
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment, dt_timezone.utc)
+        return moment
+
+
+@on_transition(to_status='completed', batch=True)
+def _count_completed(rows, to_status):
+    HeatmapService.record_closed([service_id for service_id, _, _ in rows], 'completed')
+
+
+@on_transition(to_status='canceled', batch=True)
+def _count_canceled(rows, to_status):
+    HeatmapService.record_closed([service_id for service_id, _, _ in rows], 'canceled')
@@ -0,0 +1,256 @@
+import logging
+import math
+import threading
+import time
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import close_old_connections, transaction
+from asignacion_servicios.dispatch import Offer, OfferBroker, city_key
+from asignacion_servicios.models import Service
+from asignacion_servicios.repositories import DriverRepository, OutboxRepository, ServiceRepository
+from asignacion_servicios.tasks.serviceTasks import notify_driver_assigned
+from .driverService import DriverService
+from .taskService import TaskService
+
+logger = logging.getLogger(__name__)
+
+class OfferService:
+    """
+    Servicio para ofrecer servicios a los conductores y gestionar su aceptación.
+
+    Las ofertas viven en memoria en el OfferBroker. Cuando una oferta expira o se rechaza,
+    el servicio se ofrece al siguiente conductor más cercano hasta agotar los intentos. Un hilo
+    del proceso barre las ofertas expiradas cada DISPATCH_OFFER_SWEEP_SECONDS, aunque ningún
+    conductor esté esperando.
+
+    Como el broker es del proceso, un conductor solo ve las ofertas del proceso que las publicó y
+    las ofertas pendientes se pierden al reiniciarlo (el servicio queda en 'pending' sin oferta).
+    Con DISPATCH_OFFERS_ENABLED el servidor debe correr en un solo proceso o enrutar a cada
+    conductor siempre al mismo.
+    """
+
+    broker = OfferBroker()
+    _sweeper = None
+    _sweeper_lock = threading.Lock()
+
+    # Segundos máximos que un long-poll espera entre barridos de ofertas expiradas.
+    SWEEP_INTERVAL = 1.0
+
+    @staticmethod
+    def enabled() -> bool:
+        """
+        Indica si los servicios nuevos se ofrecen a los conductores en lugar de asignarse directamente.
+
+        Returns:
+            bool: Valor de DISPATCH_OFFERS_ENABLED.
+        """
+        return getattr(settings, 'DISPATCH_OFFERS_ENABLED', False)
+
+    @staticmethod
+    def offer_service(service: Service, excluded: frozenset = frozenset()):
+        """
+        Ofrece un servicio pendiente al conductor disponible más cercano que no esté excluido
+        ni tenga otra oferta pendiente.
+
+        Args:
+            service (Service): Servicio pendiente.
+            excluded (frozenset, optional): IDs de conductores que ya recibieron la oferta.
+
+        Returns:
+            Offer o None: Oferta publicada o None si no hay conductores o se agotaron los intentos.
+        """
+        if len(excluded) >= getattr(settings, 'DISPATCH_OFFER_MAX_ATTEMPTS', 5):
+            return None
+
+        pickup_address = service.pickup_address
+        shard = city_key(pickup_address.country, pickup_address.city)
+        driver, distance = OfferService._closest_free_driver(pickup_address, excluded)
+        if driver is None:
+            return None
+
+        ttl = getattr(settings, 'DISPATCH_OFFER_TTL_SECONDS', 20)
+        offer = Offer(service.id, driver.id, shard, distance, time.monotonic() + ttl, excluded)
+        OfferService.broker.publish(offer)
+        OfferService.start_sweeper()
+        return offer
+
+    @staticmethod
+    def has_candidate(pickup_address) -> bool:
+        """
+        Indica si hay un conductor disponible, sin oferta pendiente, al que ofrecer un servicio.
+
+        Args:
+            pickup_address (Address): Dirección de recogida.
+
+        Returns:
+            bool: True si offer_service encontraría un conductor.
+        """
+        driver, _ = OfferService._closest_free_driver(pickup_address)
+        return driver is not None
+
+    @staticmethod
+    def _closest_free_driver(pickup_address, excluded: frozenset = frozenset()):
+        from .serviceService import ServiceService
+
+        shard = city_key(pickup_address.country, pickup_address.city)
+        skip_ids = excluded | OfferService.broker.busy_drivers(shard)
+        return ServiceService._find_closest_driver(pickup_address, exclude_ids=skip_ids)
+
+    @staticmethod
+    def start_sweeper() -> None:
+        """
+        Inicia, si no está corriendo, el hilo que barre las ofertas expiradas del proceso cada
+        DISPATCH_OFFER_SWEEP_SECONDS (0 lo desactiva).
+        """
+        interval = getattr(settings, 'DISPATCH_OFFER_SWEEP_SECONDS', 1.0)
+        if interval <= 0:
+            return
+        with OfferService._sweeper_lock:
+            if OfferService._sweeper is not None and OfferService._sweeper.is_alive():
+                return
+            OfferService._sweeper = threading.Thread(target=OfferService._sweep_forever, name='offer-sweeper', daemon=True)
+            OfferService._sweeper.start()
+
+    @staticmethod
+    def _sweep_forever() -> None:
+        # El intervalo se relee en cada vuelta: al ponerlo en 0 el hilo termina.
+        while (interval := getattr(settings, 'DISPATCH_OFFER_SWEEP_SECONDS', 1.0)) > 0:
+            time.sleep(interval)
+            try:
+                OfferService.sweep_expired()
+            except Exception:
+                logger.exception("Error al escalar las ofertas expiradas")
+            finally:
+                close_old_connections()
+
+    @staticmethod
+    def poll_offer(driver_id: int, timeout: float = 0):
+        """
+        Espera la siguiente oferta para un conductor (long-poll).
+
+        Mientras espera, barre periódicamente las ofertas expiradas para escalarlas.
+
+        Args:
+            driver_id (int): ID del conductor.
+            timeout (float): Segundos de espera, limitados por DISPATCH_OFFER_POLL_SECONDS (un valor
+                no finito no espera).
+
+        Raises:
+            ObjectDoesNotExist: Si el conductor no existe.
+
+        Returns:
+            Offer o None: Oferta vigente o None si no llegó ninguna.
+        """
+        driver = DriverService.get_driver(driver_id)
+        shard = city_key(driver.address.country, driver.address.city)
+        # max() y min() devuelven NaN si lo reciben primero: un 'wait' no finito no espera.
+        timeout = min(max(timeout, 0), getattr(settings, 'DISPATCH_OFFER_POLL_SECONDS', 25)) if math.isfinite(timeout) else 0
+        deadline = time.monotonic() + timeout
+
+        while True:
+            OfferService.sweep_expired()
+            remaining = deadline - time.monotonic()
+            offer = OfferService.broker.poll(driver.id, shard, min(max(remaining, 0), OfferService.SWEEP_INTERVAL))
+            if offer is not None or deadline <= time.monotonic():
+                return offer
+
+    @staticmethod
+    def accept_offer(driver_id: int, service_id: int) -> Service:
+        """
+        Acepta una oferta: reserva al conductor y le asigna el servicio en una transacción.
+
+        Args:
+            driver_id (int): ID del conductor.
+            service_id (int): ID del servicio ofrecido.
+
+        Raises:
+            ObjectDoesNotExist: Si el conductor no existe.
+            ValidationError: Si la oferta no existe o expiró, el conductor ya no está disponible
+                o el servicio ya no está pendiente.
+
+        Returns:
+            Service: Servicio asignado al conductor.
+        """
+        driver = DriverService.get_driver(driver_id)
+        offer = OfferService.broker.take(
+            int(service_id), city_key(driver.address.country, driver.address.city), driver_id=driver.id
+        )
+        if offer is None:
+            raise ValidationError("La oferta no existe o ya expiró.")
+
+        from .serviceService import ServiceService
+
+        estimated_time = ServiceService.estimate_minutes(offer.distance)
+        with transaction.atomic():
+            claimed = DriverRepository.claim_available(driver.id)
+            if claimed:
+                if not ServiceRepository.assign_if_pending(offer.service_id, driver.id, offer.distance, estimated_time):
+                    raise ValidationError("El servicio ya no está pendiente.")
+                OutboxRepository.create_many([
+                    Service.outbox_event(offer.service_id, 'service.driver_assigned', {'driver_id': driver.id}),
+                ])
+                Service.record_transitions([(offer.service_id, 'pending', None)], 'in_progress')
+                TaskService.enqueue(notify_driver_assigned, service_id=offer.service_id)
+        if not claimed:
+            OfferService._escalate(offer)
+            raise ValidationError("El conductor no está disponible.")
+
+        try:
+            return ServiceRepository.get_by_id(offer.service_id)
+        except Service.DoesNotExist:
+            raise ObjectDoesNotExist(f"El servicio con ID {offer.service_id} no existe.")
+
+    @staticmethod
+    def reject_offer(driver_id: int, service_id: int):
+        """
+        Rechaza una oferta y la escala al siguiente conductor más cercano.
+
+        Args:
+            driver_id (int): ID del conductor.
+            service_id (int): ID del servicio ofrecido.
+
+        Raises:
+            ObjectDoesNotExist: Si el conductor no existe.
+            ValidationError: Si la oferta no existe o ya expiró.
+
+        Returns:
+            Offer o None: Nueva oferta publicada para otro conductor, o None.
+        """
+        driver = DriverService.get_driver(driver_id)
+        offer = OfferService.broker.take(
+            int(service_id), city_key(driver.address.country, driver.address.city), driver_id=driver.id
+        )
+        if offer is None:
+            raise ValidationError("La oferta no existe o ya expiró.")
+        return OfferService._escalate(offer)
+
+    @staticmethod
+    def sweep_expired() -> int:
+        """
+        Retira las ofertas expiradas y escala cada una al siguiente conductor.
+
+        Returns:
+            int: Número de ofertas expiradas.
+        """
+        expired = OfferService.broker.pop_expired()
+        for offer in expired:
+            OfferService._escalate(offer)
+        return len(expired)
+
+    @staticmethod
+    def _escalate(offer: Offer):
+        """
+        Vuelve a ofrecer el servicio de una oferta excluyendo a los conductores que ya la recibieron.
+
+        Args:
+            offer (Offer): Oferta expirada o rechazada.
+
+        Returns:
+            Offer o None: Nueva oferta o None si el servicio ya no está pendiente o no hay conductores.
+        """
+        service = ServiceRepository.filter_by(
+            pk=offer.service_id, status='pending', driver__isnull=True
+        ).select_related('pickup_address').first()
+        if service is None:
+            return None
+        return OfferService.offer_service(service, excluded=offer.excluded | {offer.driver_id})
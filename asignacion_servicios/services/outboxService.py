@@ -0,0 +1,51 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from asignacion_servicios.outbox import load_sinks
+from asignacion_servicios.repositories import OutboxRepository
+
+class OutboxService:
+    """
+    Servicio para publicar los eventos de la tabla outbox en los sinks configurados.
+    """
+
+    @staticmethod
+    def relay_batch(sinks: list = None, batch_size: int = None) -> int:
+        """
+        Publica un lote de eventos pendientes en todos los sinks y los marca como publicados.
+
+        El lote se bloquea durante el envío; si algún sink falla, la transacción se revierte y
+        los eventos se vuelven a enviar en el siguiente ciclo (entrega al menos una vez).
+
+        Args:
+            sinks (list, optional): Sinks destino; por defecto los de OUTBOX_SINKS.
+            batch_size (int, optional): Tamaño del lote; por defecto OUTBOX_BATCH_SIZE.
+
+        Returns:
+            int: Número de eventos publicados.
+        """
+        sinks = load_sinks() if sinks is None else sinks
+        batch_size = batch_size or getattr(settings, 'OUTBOX_BATCH_SIZE', 500)
+        with transaction.atomic():
+            events = OutboxRepository.lock_pending(batch_size)
+            if not events:
+                return 0
+            payload = [event.to_dict() for event in events]
+            for sink in sinks:
+                sink.send(payload)
+            OutboxRepository.mark_published([event.id for event in events])
+        return len(events)
+
+    @staticmethod
+    def purge_published(older_than_days: int) -> int:
+        """
+        Elimina los eventos publicados hace más de 'older_than_days' días.
+
+        Args:
+            older_than_days (int): Antigüedad mínima en días.
+
+        Returns:
+            int: Número de eventos eliminados.
+        """
+        return OutboxRepository.delete_published_before(timezone.now() - timedelta(days=older_than_days))
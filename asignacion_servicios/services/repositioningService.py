@@ -0,0 +1,116 @@
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from asignacion_servicios.dispatch import plan_moves
+from asignacion_servicios.models import DriverRecommendation
+from asignacion_servicios.repositories import DemandTileRepository, DriverRecommendationRepository, DriverRepository
+from asignacion_servicios.utils import geohash_bounds, geohash_encode
+from .heatmapService import HeatmapService
+
+class RepositioningService:
+    """
+    Servicio que sugiere a los conductores disponibles dónde esperar el próximo servicio.
+
+    La demanda de cada celda se prevé con la media móvil de los servicios creados en la misma
+    hora de la semana durante las últimas REPOSITION_HISTORY_WEEKS semanas (leída de las celdas
+    del mapa de demanda). Los conductores disponibles se reparten entre las celdas en proporción
+    a esa demanda y los excedentes se mueven a las celdas con déficit más cercanas.
+    """
+
+    @staticmethod
+    def precision() -> int:
+        """
+        Returns:
+            int: Precisión geohash de las celdas de rebalanceo, sin superar la del mapa de demanda.
+        """
+        return min(getattr(settings, 'REPOSITION_GEOHASH_PRECISION', 5), HeatmapService.precision())
+
+    @staticmethod
+    def forecast(at=None) -> dict:
+        """
+        Prevé la demanda por celda para la hora que contiene 'at'.
+
+        Args:
+            at (datetime, optional): Momento objetivo; por defecto ahora.
+
+        Returns:
+            dict: Servicios previstos por celda geohash.
+        """
+        at = timezone.localtime(at or timezone.now())
+        weeks = getattr(settings, 'REPOSITION_HISTORY_WEEKS', 4)
+        counts = DemandTileRepository.slot_demand(
+            since=at - timedelta(weeks=weeks),
+            week_day=at.isoweekday() % 7 + 1,
+            hour=at.hour,
+            precision=RepositioningService.precision(),
+        )
+        return {cell: total / weeks for cell, total in counts.items() if total}
+
+    @staticmethod
+    def recommend(at=None) -> int:
+        """
+        Calcula y guarda las posiciones sugeridas, reemplazando las anteriores.
+
+        Args:
+            at (datetime, optional): Momento objetivo; por defecto dentro de una hora.
+
+        Returns:
+            int: Número de conductores con sugerencia de moverse.
+        """
+        at = at or timezone.now() + timedelta(hours=1)
+        precision = RepositioningService.precision()
+        demand = RepositioningService.forecast(at)
+
+        drivers_by_cell = {}
+        for driver_id, latitude, longitude in DriverRepository.available_positions():
+            drivers_by_cell.setdefault(geohash_encode(latitude, longitude, precision), []).append(driver_id)
+
+        cells = sorted(set(demand) | set(drivers_by_cell))
+        centers = []
+        for cell in cells:
+            lat_min, lng_min, lat_max, lng_max = geohash_bounds(cell)
+            centers.append(((lat_min + lat_max) / 2, (lng_min + lng_max) / 2))
+
+        moves = plan_moves(
+            [len(drivers_by_cell.get(cell, ())) for cell in cells],
+            [demand.get(cell, 0.0) for cell in cells],
+            centers,
+            getattr(settings, 'REPOSITION_MAX_DISTANCE_KM', 10),
+        )
+
+        valid_for = HeatmapService.window_start(at)
+        recommendations = []
+        for source, target, count, distance in moves:
+            drivers = drivers_by_cell[cells[source]]
+            for driver_id in drivers[:count]:
+                recommendations.append(DriverRecommendation(
+                    driver_id=driver_id,
+                    target_geohash=cells[target],
+                    target_latitude=centers[target][0],
+                    target_longitude=centers[target][1],
+                    distance_km=round(distance, 3),
+                    expected_demand=round(demand.get(cells[target], 0.0), 3),
+                    valid_for=valid_for,
+                ))
+            del drivers[:count]
+
+        with transaction.atomic():
+            return DriverRecommendationRepository.replace_all(recommendations)
+
+    @staticmethod
+    def list_recommendations(driver_id=None) -> list:
+        """
+        Lista las sugerencias vigentes de los conductores que siguen disponibles.
+
+        Args:
+            driver_id (int, optional): Limita el resultado a un conductor.
+
+        Returns:
+            list: Diccionarios con el conductor, la celda destino y la demanda prevista.
+        """
+        filters = {'driver_id': driver_id} if driver_id is not None else {}
+        return list(DriverRecommendationRepository.current(**filters).values(
+            'driver_id', 'target_geohash', 'target_latitude', 'target_longitude',
+            'distance_km', 'expected_demand', 'valid_for'
+        ))
@@ -0,0 +1,111 @@
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from asignacion_servicios.dispatch import ScheduleQueue
+from asignacion_servicios.repositories import ServiceRepository
+from .batchingService import BatchingService
+
+class SchedulingService:
+    """
+    Despacho de servicios programados (scheduled_for).
+
+    El dispatcher (python manage.py dispatch_scheduled) carga cada DISPATCH_SCHEDULE_REFRESH_SECONDS
+    los servicios programados de la próxima DISPATCH_SCHEDULE_HORIZON_SECONDS en un ScheduleQueue
+    y duerme hasta el siguiente despacho, en lugar de consultar la tabla cada segundo. Cada servicio
+    se despacha DISPATCH_SCHEDULE_LEAD_SECONDS antes de su hora de recogida.
+    """
+
+    @staticmethod
+    def lead_time() -> timedelta:
+        """
+        Returns:
+            timedelta: Antelación con la que se despacha un servicio programado.
+        """
+        return timedelta(seconds=getattr(settings, 'DISPATCH_SCHEDULE_LEAD_SECONDS', 600))
+
+    @staticmethod
+    def refresh(queue: ScheduleQueue, now=None) -> int:
+        """
+        Carga en la cola los servicios programados pendientes cuya hora de despacho cae dentro del horizonte.
+
+        Un servicio vencido que ya espera su reintento (dispatch_due lo reprogramó a como mucho
+        DISPATCH_SCHEDULE_RETRY_SECONDS desde ahora) conserva ese momento en lugar de volver a
+        quedar vencido en cada recarga.
+
+        Args:
+            queue (ScheduleQueue): Cola del dispatcher.
+            now (datetime, optional): Momento actual.
+
+        Returns:
+            int: Servicios programados en la cola tras la carga.
+        """
+        now = now or timezone.now()
+        lead = SchedulingService.lead_time()
+        horizon = timedelta(seconds=getattr(settings, 'DISPATCH_SCHEDULE_HORIZON_SECONDS', 3600))
+        retry_until = now + timedelta(seconds=getattr(settings, 'DISPATCH_SCHEDULE_RETRY_SECONDS', 30))
+        for service_id, scheduled_for in ServiceRepository.scheduled_until(now + lead + horizon):
+            due = scheduled_for - lead
+            pending_retry = queue.due_at(service_id)
+            if due <= now and pending_retry is not None and pending_retry <= retry_until:
+                continue
+            queue.push(service_id, due)
+        return len(queue)
+
+    @staticmethod
+    def dispatch_due(queue: ScheduleQueue, now=None, batch_size: int = None) -> int:
+        """
+        Despacha los servicios de la cola cuya hora de despacho llegó, cargándolos con una sola consulta.
+
+        Cada servicio se asigna al conductor con mejor puntuación; si no hay conductores, se
+        reintenta tras DISPATCH_SCHEDULE_RETRY_SECONDS. Con DISPATCH_BATCHING_ENABLED los servicios
+        vencidos quedan para el worker de lotes, que ya los incluye.
+
+        Args:
+            queue (ScheduleQueue): Cola del dispatcher.
+            now (datetime, optional): Momento actual.
+            batch_size (int, optional): Servicios por lote; por defecto DISPATCH_SCHEDULE_BATCH_SIZE.
+
+        Returns:
+            int: Número de servicios asignados.
+        """
+        from .serviceService import ServiceService
+
+        now = now or timezone.now()
+        batch_size = batch_size or getattr(settings, 'DISPATCH_SCHEDULE_BATCH_SIZE', 200)
+        retry = timedelta(seconds=getattr(settings, 'DISPATCH_SCHEDULE_RETRY_SECONDS', 30))
+        assigned = 0
+        while True:
+            due_ids = queue.pop_due(now, batch_size)
+            if not due_ids:
+                return assigned
+            if BatchingService.enabled():
+                continue
+            services = ServiceRepository.filter_by(
+                pk__in=due_ids, status='pending', driver__isnull=True,
+                scheduled_for__lte=now + SchedulingService.lead_time(),
+            ).select_related('pickup_address').order_by('scheduled_for')
+            for service in services:
+                if ServiceService.assign_best_driver(service):
+                    assigned += 1
+                else:
+                    queue.push(service.id, now + retry)
+
+    @staticmethod
+    def seconds_until_next(queue: ScheduleQueue, next_refresh, now=None) -> float:
+        """
+        Calcula cuánto puede dormir el dispatcher: hasta el próximo despacho o la próxima recarga.
+
+        Args:
+            queue (ScheduleQueue): Cola del dispatcher.
+            next_refresh (datetime): Momento de la próxima recarga desde la base de datos.
+            now (datetime, optional): Momento actual.
+
+        Returns:
+            float: Segundos de espera (0 si hay despachos vencidos).
+        """
+        now = now or timezone.now()
+        wake_at = next_refresh
+        next_due = queue.next_due()
+        if next_due is not None and next_due < wake_at:
+            wake_at = next_due
+        return max((wake_at - now).total_seconds(), 0.0)
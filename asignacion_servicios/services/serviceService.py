@@ -1,8 +1,22 @@
 from asignacion_servicios.repositories.serviceRepository import ServiceRepository
+from asignacion_servicios.repositories.driverRepository import DriverRepository
+from asignacion_servicios.repositories.outboxRepository import OutboxRepository
+from asignacion_servicios.services.offerService import OfferService
+from asignacion_servicios.services.taskService import TaskService
+from asignacion_servicios.services.heatmapService import HeatmapService
+from asignacion_servicios.services.batchingService import BatchingService
+from asignacion_servicios.tasks.serviceTasks import notify_driver_assigned
+from asignacion_servicios.workflow import ServiceStateMachine
+from asignacion_servicios.dispatch import best_candidate, candidate_distances, eta_minutes, scoring_weights
+from asignacion_servicios.dispatch import distance_matrix as pairwise_distances
+from asignacion_servicios.utils import haversine_km
 from asignacion_servicios.models import Service, Driver, Address, Client
+from datetime import timedelta
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.db import transaction
 from django.db.models import QuerySet
-from geopy.distance import geodesic
+from django.utils import timezone
 
 class ServiceService:
     """
@@ -10,16 +24,26 @@ class ServiceService:
     """
 
     @staticmethod
+    @transaction.atomic
     def create_service(data: dict):
         """
-        Crea un nuevo servicio, asignando el conductor más cercano si hay disponibles.
+        Crea un nuevo servicio, asignando el conductor más cercano si hay disponibles. Si tiene
+        dirección de destino, guarda también la distancia y el tiempo del tramo recogida → destino.
+        Con DISPATCH_OFFERS_ENABLED el servicio queda pendiente y se ofrece al conductor más cercano
+        al confirmarse la transacción;
+        con DISPATCH_BATCHING_ENABLED queda pendiente hasta que el worker batch_services lo asigne en lote.
+        Si 'scheduled_for' está más allá de DISPATCH_SCHEDULE_LEAD_SECONDS, el servicio queda pendiente
+        y lo asigna el dispatcher de servicios programados (dispatch_scheduled).
+
+        La reserva del conductor, el servicio y las tareas en segundo plano se confirman en una
+        sola transacción; la notificación al conductor se ejecuta después en el worker.
 
         Args:
             data (dict): Diccionario con los datos del servicio.
 
         Raises:
             ValidationError: Si falta el cliente o el conductor no está disponible.
-            ObjectDoesNotExist: Si la dirección o el cliente no existen.
+            ObjectDoesNotExist: Si las direcciones o el cliente no existen.
 
         Returns:
             tuple: (Service, warning) El servicio creado y advertencia si no hay conductores disponibles.
@@ -30,22 +54,38 @@ class ServiceService:
 
         data['pickup_address'] = ServiceService._get_instance(Address, data.get('pickup_address'), "La dirección")
         pickup_address = data['pickup_address']
-
+        if data.get('destination_address') is not None:
+            data['destination_address'] = ServiceService._get_instance(
+                Address, data['destination_address'], "La dirección de destino"
+            )
+        data['trip_distance'], data['trip_estimated_time'] = ServiceService._trip_leg(
+            pickup_address, data.get('destination_address')
+        )
+
+        deferred = ServiceService.is_deferred(data.get('scheduled_for'))
         if 'driver' in data and data['driver'] is not None:
             driver_instance = ServiceService._get_instance(Driver, data['driver'], "El conductor")
-            if not driver_instance.is_available:
+            # Reserva capacidad igual que la asignación automática, para que active_services y
+            # is_available reflejen también los servicios con conductor explícito.
+            if not DriverRepository.claim_available(driver_instance.id):
                 raise ValidationError("El conductor no está disponible.")
             data['driver'] = driver_instance
+            data['distance'], data['estimated_time'] = ServiceService._trip_leg(driver_instance.address, pickup_address)
+        elif deferred or BatchingService.enabled() or OfferService.enabled():
+            # Los servicios programados los asigna dispatch_scheduled poco antes de la hora de recogida.
+            # El conductor se asigna en lote (batch_services) o cuando acepte la oferta que se publica tras crear el servicio.
+            data['driver'] = None
+            data['distance'] = None
+            data['estimated_time'] = None
+            warning = None
         else:
             closest_driver, min_distance = ServiceService._find_closest_driver(pickup_address)
+            if closest_driver and not DriverRepository.claim_available(closest_driver.id):
+                closest_driver = None
             if closest_driver:
-                closest_driver.is_available = False
-                closest_driver.save()
                 data['driver'] = closest_driver
-                average_speed_kmh = 40
-                estimated_time = (min_distance / average_speed_kmh) * 60
                 data['distance'] = min_distance
-                data['estimated_time'] = estimated_time
+                data['estimated_time'] = ServiceService.estimate_minutes(min_distance)
                 warning = None
             else:
                 data['driver'] = None
@@ -56,37 +96,131 @@ class ServiceService:
         data['client'] = ServiceService._get_instance(Client, data.get('client'), "El cliente")
 
         service = ServiceRepository.create(data)
+        HeatmapService.record_created(service)
+        if service.driver is not None:
+            # La notificación al conductor no es crítica: la ejecuta el worker (run_tasks).
+            TaskService.enqueue(notify_driver_assigned, service_id=service.id)
+        if service.driver is None and OfferService.enabled() and not BatchingService.enabled() and not deferred:
+            # La oferta se publica al confirmarse la transacción: antes, aceptarla o escalarla no
+            # encontraría el servicio, y si se revierte no debe quedar una oferta huérfana.
+            if not OfferService.has_candidate(pickup_address):
+                warning = "No hay conductores disponibles en este momento."
+            transaction.on_commit(lambda: OfferService.offer_service(service))
         # Si se pasó un driver explícitamente, warning siempre será None
         if 'driver' in data and data['driver'] is not None:
             warning = None
         return service, warning
 
     @staticmethod
-    def _find_closest_driver(pickup_address: Address):
+    def is_deferred(scheduled_for, now=None) -> bool:
+        """
+        Indica si un servicio programado debe esperar al dispatcher en lugar de asignarse ya.
+
+        Args:
+            scheduled_for (datetime o None): Hora de recogida programada.
+            now (datetime, optional): Momento actual.
+
+        Returns:
+            bool: True si la recogida es posterior a ahora + DISPATCH_SCHEDULE_LEAD_SECONDS.
+        """
+        if scheduled_for is None:
+            return False
+        lead = timedelta(seconds=getattr(settings, 'DISPATCH_SCHEDULE_LEAD_SECONDS', 600))
+        return scheduled_for > (now or timezone.now()) + lead
+
+    @staticmethod
+    def assign_best_driver(service: Service) -> bool:
+        """
+        Asigna un servicio pendiente al conductor con mejor puntuación, reservándolo con un UPDATE
+        condicionado, y registra el evento y la notificación en la misma transacción.
+
+        Args:
+            service (Service): Servicio pendiente sin conductor (con pickup_address cargada).
+
+        Returns:
+            bool: True si se asignó, False si no hay conductores o el servicio ya no estaba pendiente.
+        """
+        driver, distance = ServiceService._find_closest_driver(service.pickup_address)
+        if driver is None:
+            return False
+        return ServiceService.assign_driver(service, driver, distance)
+
+    @staticmethod
+    def assign_driver(service: Service, driver: Driver, distance: float = None) -> bool:
         """
-        Encuentra el conductor disponible más cercano a la dirección de recogida.
+        Reserva capacidad de un conductor y le asigna un servicio pendiente con UPDATE condicionados,
+        y registra el evento y la notificación en la misma transacción.
+
+        Args:
+            service (Service): Servicio pendiente sin conductor (con pickup_address cargada).
+            driver (Driver): Conductor (con address cargada).
+            distance (float, optional): Distancia del conductor a la recogida en km; por defecto se
+                calcula con haversine.
+
+        Returns:
+            bool: True si se asignó, False si el conductor no tiene capacidad o el servicio ya no estaba pendiente.
+        """
+        if distance is None:
+            distance, estimated_time = ServiceService._trip_leg(driver.address, service.pickup_address)
+        else:
+            estimated_time = ServiceService.estimate_minutes(distance)
+        with transaction.atomic():
+            if not DriverRepository.claim_available(driver.id):
+                return False
+            if not ServiceRepository.assign_if_pending(service.id, driver.id, distance, estimated_time):
+                transaction.set_rollback(True)
+                return False
+            OutboxRepository.create_many([
+                Service.outbox_event(service.id, 'service.driver_assigned', {'driver_id': driver.id}),
+            ])
+            Service.record_transitions([(service.id, 'pending', None)], 'in_progress')
+            TaskService.enqueue(notify_driver_assigned, service_id=service.id)
+        return True
+
+    @staticmethod
+    def _find_closest_driver(pickup_address: Address, exclude_ids=None, min_slots: int = 1):
+        """
+        Elige el conductor disponible de la ciudad con mejor puntuación para la dirección de recogida.
+
+        Los criterios (distancia, ETA, servicios completados recientes y tiempo desde el último
+        servicio completado) y sus pesos se configuran por ciudad (ver dispatch.scoring_weights); el preset por defecto,
+        'distance', elige el conductor más cercano. Todos los candidatos se puntúan a la vez
+        sobre arreglos, con una sola consulta.
 
         Args:
             pickup_address (Address): Dirección de recogida.
+            exclude_ids (iterable, optional): IDs de conductores a descartar.
+            min_slots (int, optional): Capacidad libre mínima del conductor (servicios que se le asignarán).
 
         Returns:
-            tuple: (Driver o None, distancia mínima o None)
+            tuple: (Driver o None, distancia en km al conductor elegido o None)
         """
-        available_drivers = Driver.objects.filter(is_available=True, address__city=pickup_address.city, address__country=pickup_address.country)
+        weights = scoring_weights(pickup_address.country, pickup_address.city)
+        now = timezone.now()
+        completed_since = None
+        if 'recent_completed' in weights:
+            completed_since = now - timedelta(hours=getattr(settings, 'DISPATCH_SCORING_RECENT_HOURS', 24))
+        candidates = DriverRepository.scoring_candidates(
+            pickup_address.city, pickup_address.country, exclude_ids, completed_since, min_slots,
+            last_completed='idle' in weights,
+        )
+        if not candidates:
+            return None, None
+
         pickup_coords = (pickup_address.latitude, pickup_address.longitude)
-        closest_driver = None
-        min_distance = None
-
-        if available_drivers.exists():
-            min_distance = float('inf')
-            for driver in available_drivers:
-                driver_coords = (driver.address.latitude, driver.address.longitude)
-                distance = geodesic(pickup_coords, driver_coords).kilometers
-                if distance < min_distance:
-                    min_distance = distance
-                    closest_driver = driver
-            return closest_driver, min_distance
-        return None, None
+        distances = candidate_distances(pickup_coords, [(lat, lng) for _, lat, lng, _, _ in candidates])
+        # Tiempo desde el último servicio completado; quien nunca completó uno empata con el que más espera.
+        waited = [(now - row[3]).total_seconds() if row[3] is not None else None for row in candidates]
+        longest = max((seconds for seconds in waited if seconds is not None), default=0.0)
+        criteria = {
+            'distance': distances,
+            'eta': eta_minutes(distances, getattr(settings, 'DISPATCH_AVERAGE_SPEED_KMH', 40)),
+            'recent_completed': [row[4] for row in candidates],
+            'idle': [longest if seconds is None else seconds for seconds in waited],
+        }
+        index = best_candidate(criteria, weights)
+        driver = DriverRepository.filter_by(pk=candidates[index][0]).select_related('address').get()
+        return driver, float(distances[index])
 
     @staticmethod
     def _get_instance(model, pk, label):
@@ -146,17 +280,21 @@ class ServiceService:
         return ServiceRepository.list_all()
 
     @staticmethod
+    @transaction.atomic
     def update_service(service_id: int, data: dict) -> Service:
         """
         Actualiza los datos de un servicio existente.
 
+        Al cambiar de conductor, la reserva del nuevo y la liberación del anterior ocurren en la
+        misma transacción; al cancelar o completar el servicio, su conductor vuelve a quedar disponible.
+
         Args:
             service_id (int): ID del servicio.
             data (dict): Diccionario con los nuevos datos.
 
         Raises:
             ObjectDoesNotExist: Si el servicio, dirección, cliente o conductor no existen.
-            ValidationError: Si el conductor no está disponible.
+            ValidationError: Si el conductor no está disponible o el cambio de estado no es válido.
 
         Returns:
             Service: Instancia de Service actualizada.
@@ -169,25 +307,50 @@ class ServiceService:
         data = data.copy()
         if 'pickup_address' in data:
             data['pickup_address'] = ServiceService._get_instance(Address, data['pickup_address'], "La dirección")
-
+        if data.get('destination_address') is not None:
+            data['destination_address'] = ServiceService._get_instance(
+                Address, data['destination_address'], "La dirección de destino"
+            )
+        if 'pickup_address' in data or 'destination_address' in data:
+            data['trip_distance'], data['trip_estimated_time'] = ServiceService._trip_leg(
+                data.get('pickup_address', service.pickup_address),
+                data['destination_address'] if 'destination_address' in data else service.destination_address,
+            )
+
+        previous_driver_id = service.driver_id
         if 'driver' in data and data['driver'] is not None:
             driver_instance = ServiceService._get_instance(Driver, data['driver'], "El conductor")
-            if not driver_instance.is_available:
-                raise ValidationError("El conductor no está disponible.")
-            
-            driver_instance.is_available = False
-            driver_instance.save()
+            # Al reasignar, el nuevo conductor se reserva con un UPDATE condicionado a que siga disponible.
+            if driver_instance.id != previous_driver_id:
+                if not DriverRepository.claim_available(driver_instance.id):
+                    raise ValidationError("El conductor no está disponible.")
+                driver_instance.is_available = False
             data['driver'] = driver_instance
 
         if 'client' in data:
             data['client'] = ServiceService._get_instance(Client, data['client'], "El cliente")
 
-        return ServiceRepository.update(service, data)
+        if 'status' in data and data['status'] != service.status:
+            has_driver = (data['driver'] if 'driver' in data else service.driver) is not None
+            ServiceStateMachine.check(
+                service.status, ServiceStateMachine.status_on_save(data['status'], has_driver), has_driver
+            )
+
+        service = ServiceRepository.update(service, data)
+
+        # Se liberan el conductor reemplazado y el del servicio si quedó finalizado.
+        released_driver_ids = []
+        if previous_driver_id is not None and previous_driver_id != service.driver_id:
+            released_driver_ids.append(previous_driver_id)
+        if service.status in ServiceStateMachine.TERMINAL and service.driver_id is not None:
+            released_driver_ids.append(service.driver_id)
+        DriverRepository.release_if_idle(released_driver_ids)
+        return service
 
     @staticmethod
     def delete_service(service_id: int) -> None:
         """
-        Elimina un servicio por su ID.
+        Elimina un servicio por su ID, liberando a su conductor si no tiene otros servicios abiertos.
 
         Args:
             service_id (int): ID del servicio.
@@ -199,12 +362,76 @@ class ServiceService:
             service = ServiceRepository.get_by_id(service_id)
         except Service.DoesNotExist:
             raise ObjectDoesNotExist(f"El servicio con ID {service_id} no existe.")
-        ServiceRepository.delete(service)
+        with transaction.atomic():
+            ServiceRepository.delete(service)
+            if service.driver_id is not None:
+                DriverRepository.release_if_idle([service.driver_id])
+
+    @staticmethod
+    def bulk_transition(service_ids: list, target_status: str) -> list:
+        """
+        Cambia el estado de varios servicios en una sola pasada.
+
+        Valida las reglas de transición para todos los servicios, aplica el cambio con una
+        única sentencia UPDATE y libera en bloque a los conductores de los servicios que
+        estaban en progreso.
+
+        Args:
+            service_ids (list): IDs de los servicios.
+            target_status (str): Estado destino ('completed' o 'canceled').
+
+        Raises:
+            ValidationError: Si el estado destino no admite transiciones masivas.
+
+        Returns:
+            list: Resultado por ID con las claves 'id', 'result' ('updated', 'not_found' o
+            'invalid_transition') y 'error' cuando aplica.
+        """
+        if target_status not in ServiceStateMachine.BULK_TARGETS:
+            raise ValidationError(
+                f"El estado '{target_status}' no admite transiciones masivas. "
+                f"Los estados permitidos son: {', '.join(ServiceStateMachine.BULK_TARGETS)}."
+            )
+        service_ids = list(dict.fromkeys(int(service_id) for service_id in service_ids))
+
+        with transaction.atomic():
+            rows = {row[0]: row for row in ServiceRepository.lock_for_transition(service_ids)}
+            results = []
+            eligible_ids = []
+            released_driver_ids = []
+
+            for service_id in service_ids:
+                row = rows.get(service_id)
+                if row is None:
+                    results.append({
+                        'id': service_id,
+                        'result': 'not_found',
+                        'error': f"El servicio con ID {service_id} no existe."
+                    })
+                    continue
+
+                _, current_status, driver_id = row
+                error = ServiceStateMachine.transition_error(current_status, target_status, driver_id is not None)
+                if error:
+                    results.append({'id': service_id, 'result': 'invalid_transition', 'error': error})
+                    continue
+
+                eligible_ids.append(service_id)
+                if current_status == 'in_progress' and driver_id is not None:
+                    released_driver_ids.append(driver_id)
+                results.append({'id': service_id, 'result': 'updated'})
+
+            if eligible_ids:
+                ServiceRepository.bulk_update_status(eligible_ids, ServiceStateMachine.SOURCES[target_status], target_status)
+                Service.record_transitions([rows[service_id] for service_id in eligible_ids], target_status)
+            DriverRepository.release_if_idle(released_driver_ids)
+
+        return results
 
     @staticmethod
     def calculate_distance(pickup_address: Address, destination_address: Address) -> float:
         """
-        Calcula la distancia en kilómetros entre dos direcciones.
+        Calcula la distancia en kilómetros entre dos direcciones (haversine).
 
         Args:
             pickup_address (Address): Dirección de recogida.
@@ -215,4 +442,84 @@ class ServiceService:
         """
         pickup_coords = (pickup_address.latitude, pickup_address.longitude)
         destination_coords = (destination_address.latitude, destination_address.longitude)
-        return geodesic(pickup_coords, destination_coords).kilometers
+        return haversine_km(pickup_coords, destination_coords)
+
+    @staticmethod
+    def estimate_minutes(distance: float) -> float:
+        """
+        Estima el tiempo de recorrido de una distancia a la velocidad media DISPATCH_AVERAGE_SPEED_KMH.
+
+        Args:
+            distance (float): Distancia en kilómetros.
+
+        Returns:
+            float: Tiempo estimado en minutos.
+        """
+        return (distance / getattr(settings, 'DISPATCH_AVERAGE_SPEED_KMH', 40)) * 60
+
+    @staticmethod
+    def distance_matrix(origins: list, destinations: list) -> dict:
+        """
+        Calcula en una sola llamada la distancia y el tiempo estimado entre cada origen y cada destino.
+
+        Cada punto puede ser el ID de una dirección o un par (latitud, longitud); las direcciones
+        se cargan con una sola consulta y la matriz se calcula de forma vectorizada.
+
+        Args:
+            origins (list): Puntos de origen.
+            destinations (list): Puntos de destino.
+
+        Raises:
+            ValidationError: Si la matriz excede DISTANCE_MATRIX_MAX_ELEMENTS o una dirección no tiene coordenadas.
+            ObjectDoesNotExist: Si alguna dirección no existe.
+
+        Returns:
+            dict: Matrices 'distances' (km) y 'durations' (minutos), una fila por origen.
+        """
+        max_elements = getattr(settings, 'DISTANCE_MATRIX_MAX_ELEMENTS', 2500)
+        if len(origins) * len(destinations) > max_elements:
+            raise ValidationError(f"La matriz no puede tener más de {max_elements} pares origen/destino.")
+
+        address_ids = {point for point in origins + destinations if isinstance(point, int)}
+        coordinates = {
+            address_id: (latitude, longitude)
+            for address_id, latitude, longitude in Address.objects.filter(pk__in=address_ids).values_list(
+                'id', 'latitude', 'longitude'
+            )
+        }
+        missing = sorted(address_ids - set(coordinates))
+        if missing:
+            raise ObjectDoesNotExist(f"Las direcciones con ID {', '.join(map(str, missing))} no existen.")
+        if any(None in position for position in coordinates.values()):
+            raise ValidationError("Todas las direcciones deben tener coordenadas.")
+
+        def resolve(points):
+            return [coordinates[point] if isinstance(point, int) else tuple(point) for point in points]
+
+        matrix = pairwise_distances(resolve(origins), resolve(destinations))
+        distances = [[round(value, 3) for value in row] for row in matrix]
+        return {
+            'distances': distances,
+            'durations': [[round(ServiceService.estimate_minutes(value), 1) for value in row] for row in distances],
+        }
+
+    @staticmethod
+    def _trip_leg(pickup_address: Address, destination_address: Address) -> tuple:
+        """
+        Calcula el tramo entre dos direcciones: recogida → destino de un servicio, o posición del
+        conductor → recogida.
+
+        Args:
+            pickup_address (Address): Dirección de recogida.
+            destination_address (Address o None): Dirección de destino.
+
+        Returns:
+            tuple: (distancia en km, tiempo estimado en minutos), o (None, None) sin destino o coordenadas.
+        """
+        if destination_address is None or None in (
+            pickup_address.latitude, pickup_address.longitude,
+            destination_address.latitude, destination_address.longitude,
+        ):
+            return None, None
+        distance = ServiceService.calculate_distance(pickup_address, destination_address)
+        return distance, ServiceService.estimate_minutes(distance)
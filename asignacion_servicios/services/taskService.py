@@ -0,0 +1,106 @@
+import logging
+import random
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from asignacion_servicios.models import Task
+from asignacion_servicios.repositories import TaskRepository
+from asignacion_servicios.tasks import get_task
+
+logger = logging.getLogger(__name__)
+
+class TaskService:
+    """
+    Servicio para encolar y ejecutar tareas en segundo plano.
+    """
+
+    @staticmethod
+    def enqueue(func, delay_seconds: float = 0, **payload) -> Task:
+        """
+        Encola una tarea registrada para que la ejecute el worker (run_tasks).
+
+        La fila se inserta en la transacción actual, así que la tarea solo queda visible
+        para el worker si el cambio que la originó se confirma.
+
+        Args:
+            func (callable): Función registrada con @task.
+            delay_seconds (float, optional): Segundos de espera antes de ejecutarla.
+            **payload: Argumentos serializables en JSON para la tarea.
+
+        Returns:
+            Task: Tarea encolada.
+        """
+        run_after = timezone.now() + timedelta(seconds=delay_seconds)
+        return TaskRepository.create(func.task_name, payload, run_after, func.max_attempts)
+
+    @staticmethod
+    def run_due(limit: int = 50) -> int:
+        """
+        Reclama y ejecuta las tareas pendientes cuyo momento de ejecución ya llegó.
+
+        Las tareas que fallan se reintentan con backoff exponencial hasta agotar sus intentos.
+
+        Args:
+            limit (int, optional): Número máximo de tareas a ejecutar.
+
+        Returns:
+            int: Número de tareas ejecutadas (con éxito o no).
+        """
+        tasks = TaskRepository.claim_due(limit)
+        for task in tasks:
+            TaskService._execute(task)
+        return len(tasks)
+
+    @staticmethod
+    def requeue_stale() -> int:
+        """
+        Reencola las tareas en ejecución de workers que se detuvieron hace más de TASKS_STALE_SECONDS.
+
+        Returns:
+            int: Número de tareas reencoladas.
+        """
+        older_than = timezone.now() - timedelta(seconds=getattr(settings, 'TASKS_STALE_SECONDS', 600))
+        return TaskRepository.requeue_stale(older_than)
+
+    @staticmethod
+    def retry_delay(attempts: int) -> float:
+        """
+        Calcula la espera antes del siguiente intento: base * 2^(intentos - 1), con un tope
+        y hasta un 10% de variación aleatoria para no reintentar en bloque.
+
+        Args:
+            attempts (int): Intentos realizados.
+
+        Returns:
+            float: Segundos de espera.
+        """
+        base = getattr(settings, 'TASKS_RETRY_BASE_SECONDS', 5)
+        cap = getattr(settings, 'TASKS_RETRY_MAX_SECONDS', 300)
+        delay = min(base * 2 ** (attempts - 1), cap)
+        return delay + random.uniform(0, delay * 0.1)
+
+    @staticmethod
+    def _execute(task: Task) -> None:
+        """
+        Ejecuta una tarea reclamada y registra su resultado.
+
+        Args:
+            task (Task): Tarea en estado 'running'.
+        """
+        func = get_task(task.name)
+        if func is None:
+            TaskRepository.mark_failed(task.id, f"La tarea '{task.name}' no está registrada.")
+            return
+
+        try:
+            func(**task.payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            if task.attempts >= task.max_attempts:
+                logger.error("La tarea %s (%s) falló definitivamente: %s", task.id, task.name, error)
+                TaskRepository.mark_failed(task.id, error)
+            else:
+                run_after = timezone.now() + timedelta(seconds=TaskService.retry_delay(task.attempts))
+                TaskRepository.reschedule(task.id, error, run_after)
+            return
+        TaskRepository.mark_done(task.id)
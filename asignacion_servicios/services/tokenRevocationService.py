@@ -0,0 +1,179 @@
+import threading
+import time
+import uuid
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+from asignacion_servicios.repositories import TokenRepository
+from asignacion_servicios.utils import BloomFilter
+
+VERSION_KEY = 'token_blacklist:version'
+# IDs que se releen en cada sincronización: una revocación con un ID menor puede confirmarse
+# después de otra con un ID mayor si sus transacciones terminan en distinto orden.
+SYNC_OVERLAP = 1000
+# Backends que viven en la memoria del proceso: los demás procesos no ven la versión.
+LOCAL_CACHE_BACKENDS = (LocMemCache, DummyCache)
+
+_lock = threading.Lock()
+_state = {'filter': None, 'last_id': 0, 'version': None, 'built_at': 0.0}
+
+
+class TokenRevocationService:
+    """
+    Revocación de tokens de refresco (token_blacklist de Simple JWT) con un filtro de Bloom en memoria.
+
+    Cada proceso mantiene un BloomFilter con los 'jti' revocados y aún vigentes. Al refrescar un
+    token se consulta primero el filtro: si el 'jti' no está, el token no está revocado y no se
+    toca la base de datos; si está (o es un falso positivo) se confirma con una consulta por 'jti'.
+
+    Cada revocación se añade al filtro del proceso que la hizo y, al confirmarse la transacción,
+    guarda una versión nueva (un valor aleatorio, para que dos revocaciones simultáneas no
+    escriban la misma) en la caché TOKEN_BLACKLIST_CACHE. Los procesos que ven una versión
+    distinta de la suya leen solo las revocaciones posteriores a la última que conocen (por ID).
+    El filtro se reconstruye cada TOKEN_BLACKLIST_REBUILD_SECONDS o al superar su capacidad, lo
+    que descarta los tokens expirados.
+
+    La versión solo llega a los demás procesos si la caché es compartida (la caché 'shared' en
+    base de datos de settings, Redis o Memcached). Con una caché del proceso (LocMemCache,
+    DummyCache) el filtro no vería las revocaciones de otros procesos, así que se omite y cada
+    comprobación consulta la base de datos.
+    """
+
+    @staticmethod
+    def is_revoked(jti: str) -> bool:
+        """
+        Args:
+            jti (str): Identificador del token de refresco.
+
+        Returns:
+            bool: True si el token está revocado.
+        """
+        if not TokenRevocationService.cache_is_shared():
+            return TokenRepository.is_blacklisted(jti)
+        bloom = TokenRevocationService.sync()
+        if jti not in bloom:
+            return False
+        return TokenRepository.is_blacklisted(jti)
+
+    @staticmethod
+    def sync(now=None) -> BloomFilter:
+        """
+        Pone al día el filtro del proceso: lo reconstruye si hace falta o lee las revocaciones nuevas.
+
+        Args:
+            now (datetime, optional): Momento actual.
+
+        Returns:
+            BloomFilter: Filtro actualizado.
+        """
+        now = now or timezone.now()
+        rebuild_seconds = getattr(settings, 'TOKEN_BLACKLIST_REBUILD_SECONDS', 3600)
+        with _lock:
+            bloom = _state['filter']
+            if bloom is None or bloom.full() or time.monotonic() - _state['built_at'] >= rebuild_seconds:
+                return TokenRevocationService._rebuild(now)
+            # La versión se lee antes que las filas: una revocación confirmada durante la lectura
+            # cambia la versión y se lee en la siguiente sincronización.
+            version = TokenRevocationService._cache().get(VERSION_KEY)
+            if version != _state['version']:
+                rows = TokenRepository.blacklisted_after(max(_state['last_id'] - SYNC_OVERLAP, 0), now)
+                for blacklisted_id, jti in rows:
+                    bloom.add(jti)
+                if rows:
+                    _state['last_id'] = max(_state['last_id'], rows[-1][0])
+                _state['version'] = version
+            return bloom
+
+    @staticmethod
+    def _rebuild(now) -> BloomFilter:
+        """
+        Crea el filtro con todas las revocaciones vigentes. Se llama con _lock adquirido.
+        """
+        version = TokenRevocationService._cache().get(VERSION_KEY)
+        rows = TokenRepository.blacklisted_after(0, now)
+        capacity = max(getattr(settings, 'TOKEN_BLACKLIST_BLOOM_CAPACITY', 1_000_000), 2 * len(rows))
+        bloom = BloomFilter(capacity, getattr(settings, 'TOKEN_BLACKLIST_BLOOM_ERROR_RATE', 0.001))
+        for blacklisted_id, jti in rows:
+            bloom.add(jti)
+        _state.update(
+            filter=bloom, last_id=rows[-1][0] if rows else 0, version=version, built_at=time.monotonic(),
+        )
+        return bloom
+
+    @staticmethod
+    def record(jti: str) -> None:
+        """
+        Añade al filtro del proceso un token recién revocado y avisa a los demás procesos al confirmarse.
+
+        Args:
+            jti (str): Identificador del token revocado.
+        """
+        with _lock:
+            if _state['filter'] is not None:
+                _state['filter'].add(jti)
+        transaction.on_commit(TokenRevocationService._bump_version)
+
+    @staticmethod
+    def _bump_version() -> None:
+        # incr() no es atómico en todos los backends (DatabaseCache lee y escribe): dos incrementos
+        # simultáneos podrían dejar un valor que un proceso ya vio. Un valor nuevo siempre difiere.
+        TokenRevocationService._cache().set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+    @staticmethod
+    def cache_is_shared() -> bool:
+        """
+        Returns:
+            bool: False si TOKEN_BLACKLIST_CACHE vive en la memoria del proceso (LocMemCache, DummyCache).
+        """
+        return not isinstance(TokenRevocationService._cache(), LOCAL_CACHE_BACKENDS)
+
+    @staticmethod
+    def _cache():
+        return caches[getattr(settings, 'TOKEN_BLACKLIST_CACHE', 'shared')]
+
+    @staticmethod
+    def reset() -> None:
+        """
+        Descarta el filtro del proceso; se reconstruye en la siguiente comprobación.
+        """
+        with _lock:
+            _state.update(filter=None, last_id=0, version=None, built_at=0.0)
+
+    @staticmethod
+    def purge_expired(now=None, batch_size: int = None) -> int:
+        """
+        Elimina por lotes los tokens emitidos y revocados que ya expiraron.
+
+        Args:
+            now (datetime, optional): Momento actual.
+            batch_size (int, optional): Tokens por lote; por defecto TOKEN_PURGE_BATCH_SIZE.
+
+        Returns:
+            int: Número de tokens emitidos eliminados.
+        """
+        now = now or timezone.now()
+        batch_size = batch_size or getattr(settings, 'TOKEN_PURGE_BATCH_SIZE', 1000)
+        purged = 0
+        while True:
+            deleted = TokenRepository.delete_expired(now, batch_size)
+            purged += deleted
+            if deleted < batch_size:
+                return purged
+
+    @staticmethod
+    def install() -> None:
+        """
+        Conecta la señal que registra las revocaciones en el filtro. Se llama desde AppConfig.ready().
+        """
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        post_save.connect(_on_blacklisted, sender=BlacklistedToken, dispatch_uid='asignacion_servicios.token_revocation')
+
+
+def _on_blacklisted(sender, instance, created, **kwargs) -> None:
+    if created:
+        TokenRevocationService.record(instance.token.jti)
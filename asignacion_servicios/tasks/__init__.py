@@ -0,0 +1,2 @@
+from .registry import task, get_task
+from . import serviceTasks
@@ -0,0 +1,35 @@
+_registry = {}
+
+
+def task(name: str, max_attempts: int = 3):
+    """
+    Registra una función como tarea en segundo plano.
+
+    Args:
+        name (str): Nombre único de la tarea, el que se guarda en la cola.
+        max_attempts (int): Número máximo de intentos por defecto.
+
+    Returns:
+        callable: Decorador que registra la función y la retorna sin cambios.
+    """
+    def decorator(func):
+        if name in _registry:
+            raise ValueError(f"La tarea '{name}' ya está registrada.")
+        func.task_name = name
+        func.max_attempts = max_attempts
+        _registry[name] = func
+        return func
+    return decorator
+
+
+def get_task(name: str):
+    """
+    Obtiene la función registrada para una tarea.
+
+    Args:
+        name (str): Nombre de la tarea.
+
+    Returns:
+        callable o None: Función de la tarea o None si no está registrada.
+    """
+    return _registry.get(name)
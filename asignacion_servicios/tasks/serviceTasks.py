@@ -0,0 +1,26 @@
+import logging
+from asignacion_servicios.models import Service
+from .registry import task
+
+logger = logging.getLogger(__name__)
+
+
+@task('notify_driver_assigned', max_attempts=5)
+def notify_driver_assigned(service_id: int) -> None:
+    """
+    Notifica al conductor que se le asignó un servicio.
+
+    Por ahora solo registra la notificación en el log: el proyecto no tiene proveedor de push ni
+    SMS. Los sistemas externos reciben la asignación por el evento 'service.driver_assigned' de
+    la outbox.
+
+    Args:
+        service_id (int): ID del servicio asignado.
+    """
+    service = Service.objects.select_related('driver', 'pickup_address').filter(pk=service_id).first()
+    if service is None or service.driver is None:
+        return
+    logger.info(
+        "Servicio %s asignado a %s: recogida en %s, llegada estimada en %.0f min.",
+        service.id, service.driver.name, service.pickup_address.street, service.estimated_time or 0
+    )
@@ -1,5 +1,19 @@
 from .repositories import AddressRepositoryTestCase, ClientRepositoryTestCase, DriverRepositoryTestCase, ServiceRepositoryTestCase
 
-from .services import AddressServiceTestCase, ClientServiceTestCase, DriverServiceTestCase, ServiceServiceTestCase
+from .services import AddressServiceTestCase, ClientServiceTestCase, DriverServiceTestCase, ServiceServiceTestCase, OfferServiceTestCase, TaskServiceTestCase, OutboxServiceTestCase, HeatmapServiceTestCase, RepositioningServiceTestCase, BatchingServiceTestCase, SchedulingServiceTestCase, TokenRevocationServiceTestCase
 
-from .views import AddressViewSetTest, ClientViewSetTest, DriverViewSetTest, ServiceViewSetTest
+from .views import AddressViewSetTest, ClientViewSetTest, DriverViewSetTest, ServiceViewSetTest, ConditionalGetViewTest, SparseFieldsViewTest, TokenBucketThrottleTest, CachedJWTAuthenticationTest
+
+from .db import ReplicaRouterTestCase, QueryStatsTestCase
+
+from .middleware import ProfilingMiddlewareTestCase, CompressionMiddlewareTestCase
+
+from .serializers import ValuesListSerializerTestCase, ValidationContextTestCase
+
+from .workflow import ServiceStateMachineTestCase
+
+from .utils import GeoQueryTestCase
+
+from .dispatch import NumpyParityTestCase
+
+from .performance import EndpointBudgetTest
@@ -0,0 +1,2 @@
+from .replicaRouterTest import ReplicaRouterTestCase
+from .queryStatsTest import QueryStatsTestCase
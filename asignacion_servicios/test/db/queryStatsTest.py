@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from asignacion_servicios.db import QueryStats, QueryStatsWrapper, fingerprint, load_snapshots, write_snapshot
+from asignacion_servicios.models import Address
+from asignacion_servicios.repositories import AddressRepository
+
+
+class QueryStatsTestCase(TestCase):
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Base", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.60971, longitude=-74.08175
+        )
+
+    def test_fingerprint_strips_literals_and_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s,%s) AND name = 'O''Hara' AND x > 4.5 LIMIT 21"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? AND x > ? LIMIT ?",
+        )
+        self.assertEqual(fingerprint('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s)'), 'INSERT INTO "t" ("a", "b") VALUES (...)')
+        self.assertEqual(fingerprint('RELEASE SAVEPOINT "s1399_x40"'), fingerprint('RELEASE SAVEPOINT "s1234_x2"'))
+
+    def test_wrapper_aggregates_by_repository_and_logs_slow_queries(self):
+        stats = QueryStats()
+        with self.assertLogs('asignacion_servicios.db.queryStats', level='WARNING') as logs:
+            with connection.execute_wrapper(QueryStatsWrapper(stats, slow_ms=0)):
+                for _ in range(3):
+                    AddressRepository.get_by_id(self.address.id)
+
+        [entry] = stats.snapshot()
+        self.assertEqual((entry['origin'], entry['count']), ('AddressRepository.get_by_id', 3))
+        self.assertNotIn(str(self.address.id), entry['fingerprint'])
+        self.assertIn('repositories/addressRepostory.py', logs.output[0])
+
+    def test_command_merges_process_snapshots(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        stats = QueryStats()
+        for duration in (1.0, 2.0, 30.0):
+            stats.record('SELECT ?', 'AddressRepository.get_by_id', duration)
+        stats.record('UPDATE t SET a = ?', 'DriverRepository.claim_available', 5.0)
+        write_snapshot(stats, directory)
+
+        out = StringIO()
+        with override_settings(QUERY_STATS_DIR=directory):
+            call_command('query_stats', '--sort', 'p95_ms', stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertIn('3 consultas', lines[0])
+        self.assertIn('p95   30.00 ms', lines[0])
+        self.assertEqual(lines[1].strip(), 'SELECT ?')
+
+    def test_flush_errors_do_not_break_queries(self):
+        wrapper = QueryStatsWrapper(QueryStats(), slow_ms=1000, directory=tempfile.mkdtemp(), flush_seconds=0)
+        self.addCleanup(shutil.rmtree, wrapper.directory, True)
+        with mock.patch('asignacion_servicios.db.queryStats.write_snapshot', side_effect=OSError("disco lleno")), \
+                mock.patch('asignacion_servicios.db.queryStats.threading.Thread') as thread, \
+                self.assertLogs('asignacion_servicios.db.queryStats', level='ERROR'):
+            with connection.execute_wrapper(wrapper):
+                self.assertEqual(AddressRepository.get_by_id(self.address.id), self.address)
+            thread.assert_called_once_with(target=wrapper.flush, name='query-stats-flush', daemon=True)
+            wrapper.flush()
+
+    def test_reset_reaches_running_processes_on_next_flush(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, True)
+        stats = QueryStats()
+        wrapper = QueryStatsWrapper(stats, slow_ms=1000, directory=directory)
+        stats.record('SELECT ?', 'AddressRepository.get_by_id', 1.0)
+        wrapper.flush()
+        self.assertEqual(len(load_snapshots(directory)), 1)
+
+        with override_settings(QUERY_STATS_DIR=directory):
+            call_command('query_stats', '--reset', stdout=StringIO())
+        self.assertEqual(load_snapshots(directory), [])
+        wrapper.flush()
+        self.assertEqual(load_snapshots(directory), [])
+        stats.record('SELECT ?', 'AddressRepository.get_by_id', 1.0)
+        wrapper.flush()
+        self.assertEqual(load_snapshots(directory)[0]['count'], 1)
@@ -0,0 +1,71 @@
+from django.db import connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITransactionTestCase
+from asignacion_servicios.db import read_from_replica
+from asignacion_servicios.models import Address, Driver
+
+
+@override_settings(READ_REPLICA_ENABLED=True)
+class ReplicaRouterTestCase(APITransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Base", country="Colombia", city="Bogotá", street="Calle 1",
+            latitude=4.60971, longitude=-74.08175
+        )
+        self.driver = Driver.objects.create(
+            name="Pedro Ruiz", phone="+573001234567", address=self.address, is_available=True
+        )
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.list_url = reverse('drivers-list')
+
+    def test_reads_outside_request_use_primary(self):
+        self.assertEqual(Driver.objects.all().db, 'default')
+
+    def test_reads_in_replica_context(self):
+        with read_from_replica():
+            self.assertEqual(Driver.objects.all().db, 'replica')
+            driver = Driver.objects.get(pk=self.driver.pk)
+        self.assertEqual(driver._state.db, 'replica')
+
+    def test_writes_always_use_primary(self):
+        with read_from_replica():
+            driver = Driver.objects.get(pk=self.driver.pk)
+            driver.name = "Pedro Actualizado"
+            with CaptureQueriesContext(connections['replica']) as replica_queries:
+                driver.save()
+        self.assertEqual(len(replica_queries), 0)
+        self.driver.refresh_from_db()
+        self.assertEqual(self.driver.name, "Pedro Actualizado")
+
+    def test_get_request_reads_from_replica(self):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(self.list_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertGreater(len(replica_queries), 0)
+
+    def test_read_your_writes_after_post(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.list_url, {
+            "name": "Nuevo Conductor",
+            "phone": "+573003456789",
+            "address": self.address.id,
+            "is_available": True
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            response = self.client.get(self.list_url)
+        self.assertEqual(len(response.data['results']), 2)
+        self.assertEqual(len(replica_queries), 0)
+
+    @override_settings(READ_REPLICA_ENABLED=False)
+    def test_disabled_replica_uses_primary(self):
+        with CaptureQueriesContext(connections['replica']) as replica_queries:
+            self.client.get(self.list_url)
+        self.assertEqual(len(replica_queries), 0)
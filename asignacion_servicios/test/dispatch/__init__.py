@@ -0,0 +1 @@
+from .numpyParityTest import NumpyParityTestCase
@@ -0,0 +1,55 @@
+from unittest import mock, skipUnless
+from django.test import SimpleTestCase
+from asignacion_servicios.dispatch import (
+    allocate, best_candidate, candidate_distances, distance_matrix, eta_minutes, numpy_available, plan_moves
+)
+from asignacion_servicios.dispatch import driverScoring, rebalancer
+
+CENTERS = [(4.60, -74.08), (4.65, -74.05), (4.70, -74.10), (4.62, -74.12), (4.58, -74.06)]
+
+
+@skipUnless(numpy_available(), "NumPy no está instalado")
+class NumpyParityTestCase(SimpleTestCase):
+    """
+    Las rutas vectorizadas (NumPy) y en Python puro deben dar los mismos resultados.
+    """
+
+    def both(self, function, *args):
+        vectorized = function(*args)
+        with mock.patch.object(rebalancer, 'np', None), mock.patch.object(driverScoring, 'np', None):
+            fallback = function(*args)
+        return vectorized, fallback
+
+    def assertMatrixAlmostEqual(self, first, second):
+        self.assertEqual(len(first), len(second))
+        for row_a, row_b in zip(first, second):
+            for a, b in zip(list(row_a), list(row_b)):
+                self.assertAlmostEqual(float(a), float(b), places=9)
+
+    def test_allocate(self):
+        for total, weights in [(3, [1, 1, 1]), (4, [2.5, 1.0, 0.5]), (7, [0.3, 0.3, 0.3, 0.1]), (3, [0, 0])]:
+            vectorized, fallback = self.both(allocate, total, weights)
+            self.assertEqual(vectorized, fallback)
+
+    def test_distance_matrix_and_candidate_distances(self):
+        vectorized, fallback = self.both(distance_matrix, CENTERS[:2], CENTERS)
+        self.assertMatrixAlmostEqual(vectorized, fallback)
+        vectorized, fallback = self.both(lambda: eta_minutes(candidate_distances(CENTERS[0], CENTERS), 40))
+        self.assertMatrixAlmostEqual([vectorized], [fallback])
+
+    def test_eta_and_best_candidate(self):
+        distances = [3.2, 1.1, 5.0, 1.1]
+        criteria = {
+            'distance': distances, 'eta': eta_minutes(distances, 40),
+            'recent_completed': [4, 0, 2, 1], 'idle': [600, 60, 1200, 3600],
+        }
+        for weights in [{'distance': 1.0}, {'eta': 1.0, 'recent_completed': 0.5}, {'distance': 0.5, 'idle': 1.0}]:
+            vectorized, fallback = self.both(best_candidate, criteria, weights)
+            self.assertEqual(vectorized, fallback)
+        self.assertEqual(self.both(best_candidate, {'distance': [2.0, 2.0]}, {'distance': 1.0}), (0, 0))
+
+    def test_plan_moves(self):
+        vectorized, fallback = self.both(plan_moves, [4, 0, 1, 0, 3], [0, 2, 1, 3, 0], CENTERS, 20)
+        self.assertEqual([move[:3] for move in vectorized], [move[:3] for move in fallback])
+        for a, b in zip(vectorized, fallback):
+            self.assertAlmostEqual(a[3], b[3], places=9)
@@ -0,0 +1,2 @@
+from .profilingMiddlewareTest import ProfilingMiddlewareTestCase
+from .compressionMiddlewareTest import CompressionMiddlewareTestCase
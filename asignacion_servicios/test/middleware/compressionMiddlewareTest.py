@@ -0,0 +1,53 @@
+import gzip
+import json
+from unittest import mock, skipUnless
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from asignacion_servicios.middleware import brotli_available
+from asignacion_servicios.middleware import compressionMiddleware
+from asignacion_servicios.models import Address
+
+
+@override_settings(COMPRESSION_ENABLED=True, COMPRESSION_MIN_BYTES=500)
+class CompressionMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        User.objects.create_user(username='testuser', password='testpass')
+        token = self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['access']
+        self.authorization = f'Bearer {token}'
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+        for i in range(10):
+            Address.objects.create(
+                name=f"Dirección {i}", country="Colombia", city="Bogotá", street=f"Calle {i}",
+                latitude=4.6 + i * 0.01, longitude=-74.08
+            )
+
+    def test_gzip_when_accepted(self):
+        response = self.client.get('/api/addresses/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), 10)
+
+    def test_identity_when_not_accepted_or_small(self):
+        for accept_encoding in ('', 'gzip;q=0, identity', 'compress'):
+            response = self.client.get('/api/addresses/', HTTP_ACCEPT_ENCODING=accept_encoding)
+            self.assertFalse(response.has_header('Content-Encoding'), accept_encoding)
+            self.assertEqual(len(response.json()['results']), 10)
+
+        response = self.client.get('/api/addresses/', {'fields': 'id'}, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    @skipUnless(brotli_available(), "brotli no está instalado")
+    def test_brotli_preferred_when_installed(self):
+        response = self.client.get('/api/addresses/', HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        content = compressionMiddleware.brotli.decompress(response.content)
+        self.assertEqual(len(json.loads(content)['results']), 10)
+
+    def test_gzip_fallback_without_brotli(self):
+        with mock.patch.object(compressionMiddleware, 'brotli', None):
+            # El middleware elige las codificaciones al cargarse: un cliente nuevo recarga la cadena.
+            self.client = self.client_class()
+            self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+            response = self.client.get('/api/addresses/', HTTP_ACCEPT_ENCODING='br, gzip;q=0.5')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
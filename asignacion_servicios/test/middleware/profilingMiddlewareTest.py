@@ -0,0 +1,58 @@
+import pstats
+import shutil
+import tempfile
+from pathlib import Path
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+
+class ProfilingMiddlewareTestCase(APITestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory)
+        User.objects.create_user(username='staff', password='testpass', is_staff=True)
+        User.objects.create_user(username='testuser', password='testpass')
+
+    def _login(self, username):
+        token = self.client.post('/api/token/', {'username': username, 'password': 'testpass'}).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _profiles(self):
+        return sorted(self.directory.iterdir())
+
+    def test_staff_header_profiles_request(self):
+        with override_settings(PROFILING_ENABLED=True, PROFILING_DIR=self.directory):
+            self._login('staff')
+            response = self.client.get('/api/services/', HTTP_X_PROFILE='1')
+
+        self.assertEqual(response.status_code, 200)
+        profiles = self._profiles()
+        self.assertEqual([path.name for path in profiles], [response['X-Profile-File']])
+        functions = {name for _, _, name in pstats.Stats(str(profiles[0])).stats}
+        self.assertIn('list_services', functions)
+
+    def test_non_staff_and_disabled_are_not_profiled(self):
+        with override_settings(PROFILING_ENABLED=True, PROFILING_DIR=self.directory):
+            self._login('testuser')
+            response = self.client.get('/api/services/', {'profile': '1'})
+        self.assertNotIn('X-Profile-File', response)
+
+        # El middleware lee PROFILING_ENABLED al cargarse; un cliente nuevo lo carga sin él.
+        self.client = self.client_class()
+        self._login('staff')
+        self.client.get('/api/services/', HTTP_X_PROFILE='1')
+        self.assertEqual(self._profiles(), [])
+
+    def test_sampling_rotates_old_profiles(self):
+        with override_settings(
+            PROFILING_ENABLED=True, PROFILING_DIR=self.directory, PROFILING_SAMPLE_RATE=1, PROFILING_MAX_FILES=2
+        ):
+            self._login('testuser')
+            for _ in range(3):
+                response = self.client.get('/api/drivers/')
+                self.assertNotIn('X-Profile-File', response)
+
+        profiles = self._profiles()
+        self.assertEqual(len(profiles), 2)
+        self.assertTrue(all('GET-api-drivers' in path.name for path in profiles))
@@ -0,0 +1,2 @@
+from .queryBudget import QueryBudgetMixin
+from .endpointBudgetTest import EndpointBudgetTest
@@ -0,0 +1,154 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
+from rest_framework.test import APITestCase
+from asignacion_servicios.dispatch import OfferBroker
+from asignacion_servicios.models import Address, Client, Driver, Service
+from asignacion_servicios.services import OfferService
+from .queryBudget import QueryBudgetMixin
+
+ROWS = 1000
+CANDIDATE_DRIVERS = 100
+
+
+class EndpointBudgetTest(QueryBudgetMixin, APITestCase):
+    """
+    Presupuestos de consultas y tiempo por acción de cada ViewSet con ROWS filas por tabla.
+
+    Los presupuestos no dependen del número de filas: una consulta por fila (N+1) o un algoritmo
+    cuadrático los supera. Si un cambio legítimo necesita más consultas, ajusta el presupuesto
+    de esa acción en el mismo commit.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        addresses = []
+        for i in range(ROWS):
+            # Las primeras CANDIDATE_DRIVERS direcciones están en Bogotá, cerca de la recogida de 'create'.
+            city, base_lat, base_lng = ('Bogotá', 4.60, -74.08) if i < CANDIDATE_DRIVERS else ('Medellín', 6.24, -75.58)
+            address = Address(
+                name=f"Dirección {i}", country="Colombia", city=city, street=f"Calle {i}",
+                latitude=base_lat + (i % 50) * 0.001, longitude=base_lng + (i // 50) * 0.001,
+            )
+            address.normalize()
+            addresses.append(address)
+        cls.addresses = Address.objects.bulk_create(addresses)
+        cls.clients = Client.objects.bulk_create(
+            Client(name=f"Cliente {i}", phone=f"+5730{i:08d}", email=f"cliente{i}@correo.com", address=address)
+            for i, address in enumerate(cls.addresses)
+        )
+        cls.drivers = Driver.objects.bulk_create(
+            Driver(name=f"Conductor {i}", phone=f"+5731{i:08d}", address=address, is_available=True)
+            for i, address in enumerate(cls.addresses)
+        )
+        statuses = ('pending', 'in_progress', 'completed', 'canceled')
+        cls.services = Service.objects.bulk_create(
+            Service(
+                pickup_address=cls.addresses[i], client=cls.clients[i], status=statuses[i % 4],
+                driver=None if statuses[i % 4] == 'pending' else cls.drivers[CANDIDATE_DRIVERS + i % (ROWS - CANDIDATE_DRIVERS)],
+            )
+            for i in range(ROWS)
+        )
+        cls.pickup = Address.objects.create(
+            name="Recogida", country="Colombia", city="Bogotá", street="Carrera 7", latitude=4.6250, longitude=-74.0650
+        )
+        User.objects.create_user(username='testuser', password='testpass')
+
+    def setUp(self):
+        token = self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def _request(self, label, max_queries, max_ms, method, url, data=None, expected=200):
+        with self.assertBudget(label, max_queries, max_ms):
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertEqual(response.status_code, expected, f"{label}: {getattr(response, 'data', None)}")
+        return response
+
+    def test_address_endpoints(self):
+        address = self.addresses[-1]
+        self._request('addresses.list', 4, 200, 'get', '/api/addresses/')
+        self._request('addresses.list geo', 4, 300, 'get', '/api/addresses/?lat=4.6&lng=-74.08&radius_km=5')
+        self._request('addresses.retrieve', 3, 200, 'get', f'/api/addresses/{address.id}/')
+        # Búsqueda e inserción dentro de una transacción: en los tests se cuentan SAVEPOINT y
+        # RELEASE; en PostgreSQL, el advisory lock sobre la dirección normalizada.
+        self._request('addresses.create', 5, 200, 'post', '/api/addresses/', {
+            'name': "Nueva", 'country': "Colombia", 'city': "Cali", 'street': "Calle 5", 'latitude': 3.45, 'longitude': -76.53,
+        }, expected=201)
+        self._request('addresses.partial_update', 6, 200, 'patch', f'/api/addresses/{address.id}/', {'name': "Renombrada"})
+        self._request('addresses.update', 9, 200, 'put', f'/api/addresses/{address.id}/', {
+            'name': "Renombrada", 'country': "Colombia", 'city': address.city, 'street': "Calle 999 Sur",
+            'latitude': address.latitude, 'longitude': address.longitude,
+        })
+        # Sin referencias: se cuentan las comprobaciones PROTECT de clientes, conductores y servicios.
+        unused = Address.objects.create(
+            name="Sin uso", country="Colombia", city="Cali", street="Calle 9", latitude=3.46, longitude=-76.52
+        )
+        self._request('addresses.destroy', 7, 200, 'delete', f'/api/addresses/{unused.id}/', expected=204)
+
+    def test_client_endpoints(self):
+        client = self.clients[-1]
+        self._request('clients.list', 4, 200, 'get', '/api/clients/')
+        self._request('clients.retrieve', 3, 200, 'get', f'/api/clients/{client.id}/')
+        self._request('clients.create', 4, 200, 'post', '/api/clients/', {
+            'name': "Nuevo", 'phone': "+573209999999", 'email': "nuevo@correo.com", 'address': self.pickup.id,
+        }, expected=201)
+        self._request('clients.partial_update', 4, 200, 'patch', f'/api/clients/{client.id}/', {'name': "Renombrado"})
+        self._request('clients.update', 6, 200, 'put', f'/api/clients/{client.id}/', {
+            'name': "Renombrado", 'phone': client.phone, 'email': client.email, 'address': self.pickup.id,
+        })
+        unused = Client.objects.create(name="Sin uso", phone="+573208888888", email="sinuso@correo.com", address=self.pickup)
+        self._request('clients.destroy', 4, 200, 'delete', f'/api/clients/{unused.id}/', expected=204)
+
+    def test_driver_endpoints(self):
+        driver = self.drivers[-1]
+        self._request('drivers.list', 4, 200, 'get', '/api/drivers/')
+        self._request('drivers.list geo', 4, 300, 'get', '/api/drivers/?lat=4.6&lng=-74.08&radius_km=5')
+        self._request('drivers.retrieve', 3, 200, 'get', f'/api/drivers/{driver.id}/')
+        self._request('drivers.create', 4, 200, 'post', '/api/drivers/', {
+            'name': "Nuevo", 'phone': "+573219999999", 'address': self.pickup.id,
+        }, expected=201)
+        self._request('drivers.partial_update', 4, 200, 'patch', f'/api/drivers/{driver.id}/', {'name': "Renombrado"})
+        self._request('drivers.update', 7, 200, 'put', f'/api/drivers/{driver.id}/', {
+            'name': "Renombrado", 'phone': driver.phone, 'address': self.pickup.id,
+        })
+        self._request('drivers.recommendations', 2, 200, 'get', '/api/drivers/recommendations/')
+        service = self.services[1]
+        self._request('drivers.complete', 15, 200, 'post', f'/api/drivers/{service.driver_id}/complete/', {'service_id': service.id})
+        # Conductor con servicios: SET_NULL en sus servicios y CASCADE en su recomendación.
+        self._request('drivers.destroy', 5, 300, 'delete', f'/api/drivers/{self.services[2].driver_id}/', expected=204)
+
+    def test_service_endpoints(self):
+        service = self.services[0]
+        self._request('services.list', 4, 200, 'get', '/api/services/')
+        self._request('services.list status', 4, 200, 'get', '/api/services/?status=pending')
+        self._request('services.retrieve', 3, 200, 'get', f'/api/services/{service.id}/')
+        self._request('services.partial_update', 10, 200, 'patch', f'/api/services/{service.id}/', {'pickup_address': self.pickup.id})
+        self._request('services.update', 12, 200, 'put', f'/api/services/{service.id}/', {
+            'pickup_address': self.pickup.id, 'client': self.clients[0].id,
+        })
+        self._request('services.heatmap', 2, 200, 'get', '/api/services/heatmap/')
+        self._request('services.distance_matrix', 2, 200, 'post', '/api/services/distance-matrix/', {
+            'origins': [address.id for address in self.addresses[:20]],
+            'destinations': [[4.61, -74.08], [6.25, -75.57]],
+        })
+        self._request('services.bulk_transition', 9, 500, 'post', '/api/services/bulk-transition/', {
+            'ids': [service.id for service in self.services[4:404:4]], 'status': 'canceled',
+        })
+        self._request('services.destroy', 7, 200, 'delete', f'/api/services/{self.services[1].id}/', expected=204)
+
+    def test_create_service_with_candidate_drivers(self):
+        self._request('services.create', 17, 500, 'post', '/api/services/', {
+            'pickup_address': self.pickup.id, 'client': self.clients[0].id,
+        }, expected=201)
+
+    @override_settings(DISPATCH_OFFERS_ENABLED=True, DISPATCH_OFFER_SWEEP_SECONDS=0)
+    def test_offer_endpoints(self):
+        OfferService.broker = OfferBroker()
+        service = Service.objects.select_related('pickup_address').get(pk=self.services[0].id)
+        first = OfferService.offer_service(service)
+
+        response = self._request('drivers.offers', 4, 200, 'get', f'/api/drivers/{first.driver_id}/offers/')
+        self.assertEqual(response.data['offer']['service_id'], service.id)
+        # Rechazar escala la oferta: puntúa de nuevo a los candidatos de la ciudad.
+        self._request('drivers.reject_offer', 6, 300, 'post', f'/api/drivers/{first.driver_id}/offers/{service.id}/reject/')
+        (second,) = OfferService.broker.busy_drivers(first.shard)
+        self._request('drivers.accept_offer', 11, 200, 'post', f'/api/drivers/{second}/offers/{service.id}/accept/')
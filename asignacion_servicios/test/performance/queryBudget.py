@@ -0,0 +1,49 @@
+import os
+import time
+from contextlib import contextmanager
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    Mixin para TestCase que verifica el número de consultas SQL y el tiempo de una operación.
+
+    El número de consultas es determinista y detecta N+1; el tiempo detecta regresiones O(N²).
+    Como el tiempo depende de la máquina, los presupuestos en milisegundos se multiplican por
+    la variable de entorno PERF_BUDGET_FACTOR (por defecto 1) para ajustarlos en CI.
+    """
+
+    budget_databases = ('default',)
+
+    @contextmanager
+    def assertBudget(self, label: str, max_queries: int, max_ms: float):
+        """
+        Ejecuta el bloque capturando las consultas de 'budget_databases' y midiendo su duración.
+
+        Args:
+            label (str): Nombre de la operación para el mensaje de error.
+            max_queries (int): Número máximo de consultas SQL.
+            max_ms (float): Tiempo máximo en milisegundos (antes de aplicar PERF_BUDGET_FACTOR).
+
+        Raises:
+            AssertionError: Si se supera alguno de los presupuestos; el mensaje incluye las consultas.
+        """
+        contexts = [CaptureQueriesContext(connections[alias]) for alias in self.budget_databases]
+        for context in contexts:
+            context.__enter__()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            for context in reversed(contexts):
+                context.__exit__(None, None, None)
+
+        queries = [query['sql'] for context in contexts for query in context.captured_queries]
+        if len(queries) > max_queries:
+            listing = '\n'.join(f"  {index}. {sql}" for index, sql in enumerate(queries, start=1))
+            self.fail(f"{label}: {len(queries)} consultas (máximo {max_queries}):\n{listing}")
+        limit_ms = max_ms * float(os.environ.get('PERF_BUDGET_FACTOR', 1))
+        if elapsed_ms > limit_ms:
+            self.fail(f"{label}: {elapsed_ms:.0f} ms (máximo {limit_ms:.0f} ms)")
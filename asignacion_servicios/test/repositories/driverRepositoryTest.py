@@ -1,5 +1,5 @@
 from django.test import TestCase
-from asignacion_servicios.models import Driver, Address
+from asignacion_servicios.models import Driver, Address, Client, Service
 from asignacion_servicios.repositories import DriverRepository
 
 class DriverRepositoryTestCase(TestCase):
@@ -69,4 +69,33 @@ class DriverRepositoryTestCase(TestCase):
     def test_delete_driver(self):
         DriverRepository.delete(self.driver1)
         drivers = DriverRepository.list_all()
-        self.assertEqual(drivers.count(), 1)
\ No newline at end of file
+        self.assertEqual(drivers.count(), 1)
+
+    def test_release_if_idle_keeps_drivers_with_open_services(self):
+        client = Client.objects.create(name="Cliente", phone="+573009999999", email="c@correo.com", address=self.address1)
+        busy = Driver.objects.create(name="Ocupado", phone="+573003333333", address=self.address1, is_available=False)
+        Service.objects.create(pickup_address=self.address1, client=client, driver=busy)
+        released = DriverRepository.release_if_idle([self.driver2.id, busy.id])
+        self.assertEqual(released, 1)
+        self.driver2.refresh_from_db()
+        self.assertTrue(self.driver2.is_available)
+
+    def test_reconcile_availability(self):
+        client = Client.objects.create(name="Cliente", phone="+573009999999", email="c@correo.com", address=self.address1)
+        Service.objects.create(pickup_address=self.address1, client=client, driver=self.driver1)
+        self.assertEqual(DriverRepository.reconcile_availability(dry_run=True), (1, 1))
+        self.assertEqual(DriverRepository.reconcile_availability(), (1, 1))
+        self.driver1.refresh_from_db()
+        self.driver2.refresh_from_db()
+        self.assertFalse(self.driver1.is_available)
+        self.assertTrue(self.driver2.is_available)
+
+    def test_reconcile_active_services_bumps_updated_at(self):
+        client = Client.objects.create(name="Cliente", phone="+573009999999", email="c@correo.com", address=self.address1)
+        Driver.objects.filter(pk=self.driver1.pk).update(capacity=2, is_available=True)
+        Service.objects.create(pickup_address=self.address1, client=client, driver=self.driver1)
+        before = Driver.objects.get(pk=self.driver1.pk).updated_at
+        DriverRepository.reconcile_availability()
+        self.driver1.refresh_from_db()
+        self.assertEqual(self.driver1.active_services, 1)
+        self.assertGreater(self.driver1.updated_at, before)
@@ -83,4 +83,14 @@ class ServiceRepositoryTestCase(TestCase):
     def test_delete_service(self):
         ServiceRepository.delete(self.service1)
         services = ServiceRepository.list_all()
-        self.assertEqual(services.count(), 1)
\ No newline at end of file
+        self.assertEqual(services.count(), 1)
+
+    def test_bulk_update_status(self):
+        updated = ServiceRepository.bulk_update_status(
+            [self.service1.id, self.service2.id], ("pending", "in_progress"), "canceled"
+        )
+        self.assertEqual(updated, 1)
+        self.service1.refresh_from_db()
+        self.service2.refresh_from_db()
+        self.assertEqual(self.service1.status, "canceled")
+        self.assertEqual(self.service2.status, "completed")
@@ -0,0 +1,2 @@
+from .valuesSerializerTest import ValuesListSerializerTestCase
+from .validationContextTest import ValidationContextTestCase
@@ -0,0 +1,71 @@
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from asignacion_servicios.models import Address, Client, Driver
+from asignacion_servicios.serializers import DriverSerializer, ValidationContext
+
+
+class ValidationContextTestCase(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+        self.address = Address.objects.create(
+            name="Terminal Norte", country="Colombia", city="Medellín", street="Calle 10 #20-30",
+            latitude=6.2442, longitude=-75.5812
+        )
+        self.driver = Driver.objects.create(
+            name="Pedro Ruiz", phone="+573001234567", address=self.address, is_available=True
+        )
+        self.customer = Client.objects.create(
+            name="Juan Perez", phone="+573009999999", email="juan@example.com", address=self.address
+        )
+
+    def test_resolve_batches_one_query_per_model(self):
+        validation = ValidationContext()
+        validation.require_pk(Address, self.address.id)
+        validation.require_pk(Address, 999)
+        validation.require_unique(Driver, 'phone', "+573001234567")
+        validation.require_unique(Driver, 'phone', "+573000000000")
+        with self.assertNumQueries(2):
+            validation.resolve()
+        with self.assertNumQueries(0):
+            self.assertEqual(validation.get_instance(Address, self.address.id), self.address)
+            self.assertIsNone(validation.get_instance(Address, 999))
+            self.assertTrue(validation.is_taken(Driver, 'phone', "+573001234567"))
+            self.assertFalse(validation.is_taken(Driver, 'phone', "+573001234567", exclude_pk=self.driver.id))
+            self.assertFalse(validation.is_taken(Driver, 'phone', "+573000000000"))
+
+    def test_unregistered_check_queries_on_demand(self):
+        validation = ValidationContext()
+        with self.assertNumQueries(1):
+            self.assertTrue(validation.is_taken(Client, 'email', "juan@example.com"))
+
+    def test_serializer_validates_with_context(self):
+        serializer = DriverSerializer(data={
+            "name": "Carlos Gomez", "phone": "+573001234567", "address": 999, "is_available": True
+        })
+        with self.assertNumQueries(2):
+            self.assertFalse(serializer.is_valid())
+        self.assertIn('address', serializer.errors)
+        self.assertIn('phone', serializer.errors)
+
+    def test_create_driver_queries(self):
+        data = {"name": "Carlos Gomez", "phone": "+573003456789", "address": self.address.id, "is_available": True}
+        # Una consulta para Address, una para Driver y el INSERT.
+        with self.assertNumQueries(3):
+            response = self.client.post(reverse('drivers-list'), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_create_client_queries(self):
+        data = {"name": "Ana Torres", "phone": "+573002345678", "email": "ana@example.com", "address": self.address.id}
+        # Una consulta para Address, una para Client (email y teléfono) y el INSERT.
+        with self.assertNumQueries(3):
+            response = self.client.post(reverse('clients-list'), data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_update_client_keeps_own_email(self):
+        url = reverse('clients-detail', args=[self.customer.id])
+        data = {"name": "Juan Perez", "phone": "+573009999999", "email": "juan@example.com", "address": self.address.id}
+        response = self.client.put(url, data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
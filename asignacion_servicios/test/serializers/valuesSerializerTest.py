@@ -0,0 +1,79 @@
+import io
+import json
+from unittest import mock
+from django.test import TestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from asignacion_servicios.models import Address, Client, Driver, Service
+from asignacion_servicios.renderers import FastJSONRenderer, FastJSONParser
+from asignacion_servicios.renderers import fastJson
+from asignacion_servicios.serializers import (
+    DriverSerializer, DriverListSerializer, ServiceSerializer, ServiceListSerializer
+)
+
+
+class ValuesListSerializerTestCase(TestCase):
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Oficina Central", country="Colombia", city="Bogotá", street="Calle Falsa 123",
+            latitude=4.60971, longitude=-74.08175
+        )
+        self.client_obj = Client.objects.create(
+            name="Juan Pérez", phone="+573001234567", email="juan.perez@example.com", address=self.address
+        )
+        self.driver = Driver.objects.create(
+            name="Pedro Ruiz", phone="+573001111111", address=self.address, is_available=False
+        )
+        Driver.objects.create(name="Ana Torres", phone="+573002222222", address=self.address)
+        Service.objects.create(
+            pickup_address=self.address, client=self.client_obj, driver=self.driver,
+            status="in_progress", estimated_time=12.75, distance=8.5
+        )
+        Service.objects.create(pickup_address=self.address, client=self.client_obj)
+
+    def _assert_same_bytes(self, queryset, serializer_class, list_serializer_class):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        list_serializer = list_serializer_class()
+        rows = list_serializer.to_representation(list_serializer.values(queryset))
+        self.assertEqual(FastJSONRenderer().render(rows), expected)
+        with mock.patch.object(fastJson, 'orjson', None):
+            self.assertEqual(FastJSONRenderer().render(rows), expected)
+
+    def test_service_list_matches_service_serializer(self):
+        self._assert_same_bytes(Service.objects.all(), ServiceSerializer, ServiceListSerializer)
+
+    def test_driver_list_matches_driver_serializer(self):
+        self._assert_same_bytes(Driver.objects.all(), DriverSerializer, DriverListSerializer)
+
+    def test_list_serializer_does_not_instantiate_models(self):
+        list_serializer = ServiceListSerializer()
+        with self.assertNumQueries(1):
+            rows = list_serializer.to_representation(list_serializer.values(Service.objects.all()))
+        self.assertEqual(len(rows), 2)
+
+    def test_renderer_escapes_line_separators(self):
+        data = {"name": "a\u2028b\u2029c", "city": "Bogotá"}
+        self.assertEqual(FastJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_renderer_matches_stdlib_except_float_format(self):
+        if not fastJson.orjson_available():
+            self.skipTest("orjson no está instalado")
+        data = {"latitude": 4.60971, "distance": 8.5, "tiny": 1e-05, "big": 1e16}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+        self.assertIn(b'"tiny":0.00001', FastJSONRenderer().render(data))
+        self.assertEqual(FastJSONRenderer().render({"nan": float('nan')}), b'{"nan":null}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render({"nan": float('nan')})
+
+    def test_renderer_indent_uses_stdlib(self):
+        data = {"id": 1}
+        rendered = FastJSONRenderer().render(data, 'application/json; indent=2')
+        self.assertEqual(rendered, JSONRenderer().render(data, 'application/json; indent=2'))
+
+    def test_parser(self):
+        data = FastJSONParser().parse(io.BytesIO('{"ids": [1, 2], "status": "canceled"}'.encode()))
+        self.assertEqual(data, {"ids": [1, 2], "status": "canceled"})
+
+    def test_parser_invalid_json(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(io.BytesIO(b'{"ids": '))
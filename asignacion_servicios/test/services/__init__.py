@@ -1,4 +1,12 @@
 from .addressServiceTest import AddressServiceTestCase
 from .clientServiceTest import ClientServiceTestCase
 from .driverServiceTest import DriverServiceTestCase
-from .serviceServiceTest import ServiceServiceTestCase
\ No newline at end of file
+from .serviceServiceTest import ServiceServiceTestCase
+from .offerServiceTest import OfferServiceTestCase
+from .taskServiceTest import TaskServiceTestCase
+from .outboxServiceTest import OutboxServiceTestCase
+from .heatmapServiceTest import HeatmapServiceTestCase
+from .repositioningServiceTest import RepositioningServiceTestCase
+from .batchingServiceTest import BatchingServiceTestCase
+from .schedulingServiceTest import SchedulingServiceTestCase
+from .tokenRevocationServiceTest import TokenRevocationServiceTestCase
@@ -1,6 +1,9 @@
+from unittest import mock
+from django.db import connection
 from django.test import TestCase
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
-from asignacion_servicios.models import Address
+from asignacion_servicios.models import Address, Client
+from asignacion_servicios.repositories import AddressRepository
 from asignacion_servicios.services.addressService import AddressService
 
 class AddressServiceTestCase(TestCase):
@@ -44,8 +47,77 @@ class AddressServiceTestCase(TestCase):
             "latitude": 4.60971,
             "longitude": -74.08175
         }
+        address = AddressService.create_address(data)
+        self.assertEqual(address.pk, self.address1.pk)
+        self.assertEqual(Address.objects.count(), 2)
+
+    def test_create_address_near_duplicate_returns_existing(self):
+        data = {
+            "name": "Otra referencia",
+            "country": "Colombia",
+            "city": "BOGOTA",
+            "street": "calle  falsa, 123",
+            "latitude": 4.60971 + 1e-7,
+            "longitude": -74.08175 - 1e-7
+        }
+        address, created = AddressService.get_or_create_address(data)
+        self.assertFalse(created)
+        self.assertEqual(address.pk, self.address1.pk)
+
+    def test_create_address_locks_normalized_key_in_transaction(self):
+        atomic_depth = []
+        with mock.patch.object(
+            AddressRepository, 'lock_dedupe_key',
+            side_effect=lambda city, street: atomic_depth.append(len(connection.atomic_blocks)),
+        ) as lock:
+            AddressService.create_address({
+                "name": "Otra", "country": "Colombia", "city": "BOGOTÁ", "street": "calle  falsa, 123",
+                "latitude": 4.60971, "longitude": -74.08175,
+            })
+        lock.assert_called_once_with("bogota", "calle falsa 123")
+        # TestCase abre dos bloques atómicos; el tercero es el de get_or_create_address.
+        self.assertEqual(atomic_depth, [3])
+
+    def test_merge_duplicates(self):
+        duplicate = Address.objects.create(
+            name="Duplicada", country="Colombia", city="bogota", street="Calle Falsa 123.",
+            latitude=4.609711, longitude=-74.081751
+        )
+        client = Client.objects.create(name="Cliente", phone="+573001234567", email="c@correo.com", address=duplicate)
+        self.assertEqual(AddressService.merge_duplicates(dry_run=True), (1, 1))
+        self.assertEqual(AddressService.merge_duplicates(), (1, 1))
+        client.refresh_from_db()
+        self.assertEqual(client.address_id, self.address1.id)
+        self.assertFalse(Address.objects.filter(pk=duplicate.pk).exists())
+
+    def test_merge_duplicates_across_cell_border(self):
+        # 0.0001° de rejilla: 4.60999 y 4.61001 caen en filas vecinas.
+        first = Address.objects.create(
+            name="Borde", country="Colombia", city="Cali", street="Calle 5", latitude=4.60999, longitude=-76.5
+        )
+        second = Address.objects.create(
+            name="Borde", country="Colombia", city="cali", street="calle 5", latitude=4.61001, longitude=-76.5
+        )
+        far = Address.objects.create(
+            name="Lejos", country="Colombia", city="Cali", street="Calle 5", latitude=4.62, longitude=-76.5
+        )
+        self.assertNotEqual(first.grid_cell, second.grid_cell)
+        self.assertEqual(AddressRepository.duplicate_groups(), [[first.id, second.id]])
+        self.assertEqual(AddressService.merge_duplicates(), (1, 1))
+        self.assertTrue(Address.objects.filter(pk=far.pk).exists())
+
+    def test_update_address_rejects_near_duplicate(self):
         with self.assertRaises(ValidationError):
-            AddressService.create_address(data)
+            AddressService.update_address(self.address2.id, {
+                "city": "BOGOTA", "street": "calle falsa, 123", "latitude": 4.60972, "longitude": -74.08175,
+            })
+        self.address2.refresh_from_db()
+        self.assertEqual(self.address2.city, "Medellín")
+
+    def test_update_address_locks_new_normalized_key(self):
+        with mock.patch.object(AddressRepository, 'lock_dedupe_key') as lock:
+            AddressService.update_address(self.address2.id, {"street": "Carrera 46"})
+        lock.assert_called_once_with("medellin", "carrera 46")
 
     def test_get_address(self):
         address = AddressService.get_address(self.address1.id)
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from asignacion_servicios.dispatch import group_pickups, route_order
+from asignacion_servicios.models import Address, Client, Driver, Service
+from asignacion_servicios.repositories import DriverRepository
+from asignacion_servicios.services import BatchingService, DriverService
+
+
+class BatchingServiceTestCase(TestCase):
+    def setUp(self):
+        self.driver_address = Address.objects.create(
+            name="Base", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.6000, longitude=-74.0800
+        )
+        self.pickups = [
+            Address.objects.create(
+                name=f"Recogida {i}", country="Colombia", city="Bogotá", street=f"Carrera {i}",
+                latitude=4.6000 + 0.002 * i, longitude=-74.0800
+            )
+            for i in range(1, 4)
+        ]
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="c@correo.com", address=self.driver_address
+        )
+        self.driver = Driver.objects.create(
+            name="Conductor", phone="+573009876543", address=self.driver_address, capacity=3
+        )
+
+    def _pending(self, addresses):
+        return [Service.objects.create(pickup_address=address, client=self.client_obj) for address in addresses]
+
+    def test_group_pickups_by_city_window_and_radius(self):
+        t0 = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        pickups = [
+            ('bogota', 4.600, -74.080, t0),
+            ('bogota', 4.601, -74.080, t0 + timedelta(seconds=30)),
+            ('cali', 4.600, -74.080, t0 + timedelta(seconds=40)),
+            ('bogota', 4.700, -74.080, t0 + timedelta(seconds=50)),
+            ('bogota', 4.600, -74.080, t0 + timedelta(seconds=500)),
+        ]
+        self.assertEqual(group_pickups(pickups, radius_km=1, window_seconds=120, max_size=3), [[0, 1], [2], [3], [4]])
+
+    def test_route_order_visits_nearest_first(self):
+        order, cumulative = route_order((4.600, -74.08), [(4.606, -74.08), (4.602, -74.08), (4.604, -74.08)])
+        self.assertEqual(order, [1, 2, 0])
+        self.assertEqual(cumulative, sorted(cumulative))
+
+    def test_run_once_assigns_group_to_one_driver(self):
+        services = self._pending(self.pickups)
+        self.assertEqual(BatchingService.run_once(), (1, 3))
+
+        assigned = Service.objects.filter(pk__in=[service.id for service in services]).order_by('batch_position')
+        self.assertEqual({service.driver_id for service in assigned}, {self.driver.id})
+        self.assertEqual(len({service.batch_id for service in assigned}), 1)
+        self.assertEqual([service.pickup_address_id for service in assigned], [address.id for address in self.pickups])
+        self.driver.refresh_from_db()
+        self.assertEqual((self.driver.active_services, self.driver.is_available), (3, False))
+
+        DriverService.complete_service(self.driver.id, assigned[0].id)
+        self.driver.refresh_from_db()
+        self.assertEqual((self.driver.active_services, self.driver.is_available), (2, True))
+
+    def test_run_once_holds_incomplete_groups(self):
+        services = self._pending(self.pickups[:2])
+        self.assertEqual(BatchingService.run_once(now=services[0].created_at), (0, 0))
+        self.assertEqual(BatchingService.run_once(now=timezone.now() + timedelta(minutes=1)), (1, 2))
+
+    def test_claim_available_respects_capacity(self):
+        self.assertTrue(DriverRepository.claim_available(self.driver.id, slots=2))
+        self.assertFalse(DriverRepository.claim_available(self.driver.id, slots=2))
+        self.assertTrue(DriverRepository.claim_available(self.driver.id))
+        self.driver.refresh_from_db()
+        self.assertFalse(self.driver.is_available)
+
+    def test_batch_command_survives_errors(self):
+        run_once = mock.Mock(side_effect=[RuntimeError("base de datos caída"), (1, 2), KeyboardInterrupt])
+        with mock.patch.object(BatchingService, 'run_once', run_once), \
+                mock.patch('asignacion_servicios.management.commands.batch_services.time.sleep'), \
+                self.assertLogs('asignacion_servicios', 'ERROR'):
+            out = StringIO()
+            call_command('batch_services', stdout=out)
+        self.assertIn("Grupos asignados: 1 (2 servicios)", out.getvalue())
@@ -1,7 +1,7 @@
 from django.test import TestCase
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
-from asignacion_servicios.models import Driver, Address
-from asignacion_servicios.services import DriverService
+from asignacion_servicios.models import Client, Driver, Address, Service
+from asignacion_servicios.services import DriverService, ServiceService
 
 class DriverServiceTestCase(TestCase):
     def setUp(self):
@@ -110,4 +110,23 @@ class DriverServiceTestCase(TestCase):
 
     def test_delete_driver_not_found(self):
         with self.assertRaises(ObjectDoesNotExist):
-            DriverService.delete_driver(999)
\ No newline at end of file
+            DriverService.delete_driver(999)
+
+    def test_assign_driver_to_service_reserves_capacity(self):
+        client = Client.objects.create(name="Cliente", phone="+573009999999", email="c@correo.com", address=self.address1)
+        first = Service.objects.create(pickup_address=self.address1, client=client)
+        second = Service.objects.create(pickup_address=self.address1, client=client)
+
+        service = DriverService.assign_driver_to_service(self.driver1.id, first.id)
+        self.assertEqual((service.driver_id, service.status), (self.driver1.id, "in_progress"))
+        self.assertAlmostEqual(service.distance, 0)
+        self.assertEqual(service.estimated_time, ServiceService.estimate_minutes(0))
+        self.driver1.refresh_from_db()
+        self.assertEqual((self.driver1.active_services, self.driver1.is_available), (1, False))
+
+        with self.assertRaises(ValidationError):
+            DriverService.assign_driver_to_service(self.driver1.id, first.id)
+        with self.assertRaises(ValidationError):
+            DriverService.assign_driver_to_service(self.driver1.id, second.id)
+        with self.assertRaises(ObjectDoesNotExist):
+            DriverService.assign_driver_to_service(999, second.id)
@@ -0,0 +1,74 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from asignacion_servicios.models import Address, Client, DemandTile, Driver, Service
+from asignacion_servicios.services import DriverService, HeatmapService, ServiceService
+from asignacion_servicios.utils import geohash_bounds, geohash_encode
+
+
+class HeatmapServiceTestCase(TestCase):
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Origen", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.60971, longitude=-74.08175
+        )
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="c@correo.com", address=self.address
+        )
+        self.driver = Driver.objects.create(name="Conductor", phone="+573009876543", address=self.address)
+
+    def test_geohash_encode_and_bounds(self):
+        self.assertEqual(geohash_encode(57.64911, 10.40744, 11), 'u4pruydqqvj')
+        lat_min, lng_min, lat_max, lng_max = geohash_bounds(geohash_encode(4.60971, -74.08175, 6))
+        self.assertTrue(lat_min <= 4.60971 < lat_max and lng_min <= -74.08175 < lng_max)
+
+    def test_tiles_update_incrementally(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first, _ = ServiceService.create_service({"pickup_address": self.address.id, "client": self.client_obj})
+            second, _ = ServiceService.create_service({"pickup_address": self.address.id, "client": self.client_obj})
+            DriverService.complete_service(self.driver.id, first.id)
+            ServiceService.bulk_transition([second.id], 'canceled')
+
+        tile = DemandTile.objects.get()
+        self.assertEqual((tile.requested, tile.completed, tile.canceled), (2, 1, 1))
+
+        result = HeatmapService.heatmap(precision='5')
+        self.assertEqual(result['tiles'][0]['geohash'], geohash_encode(4.60971, -74.08175, 5))
+        self.assertEqual(result['tiles'][0]['open'], 0)
+
+    def test_rebuild_matches_incremental_tiles(self):
+        ServiceService.create_service({"pickup_address": self.address.id, "client": self.client_obj})
+        Service.objects.create(pickup_address=self.address, client=self.client_obj, status='canceled')
+        self.assertEqual(HeatmapService.rebuild(), 1)
+        tile = DemandTile.objects.get()
+        self.assertEqual((tile.requested, tile.completed, tile.canceled), (2, 0, 1))
+
+    def test_bulk_transition_updates_tiles_in_batch(self):
+        other = Address.objects.create(
+            name="Destino", country="Colombia", city="Medellín", street="Calle 2", latitude=6.2442, longitude=-75.5812
+        )
+        services = [
+            Service.objects.create(pickup_address=address, client=self.client_obj)
+            for address in (self.address, self.address, other)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            ServiceService.bulk_transition([service.id for service in services], 'canceled')
+
+        canceled = dict(DemandTile.objects.values_list('geohash', 'canceled'))
+        self.assertEqual(canceled, {
+            geohash_encode(4.60971, -74.08175, 6): 2, geohash_encode(6.2442, -75.5812, 6): 1,
+        })
+
+    def test_tile_is_incremented_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            ServiceService.create_service({"pickup_address": self.address.id, "client": self.client_obj})
+            self.assertFalse(DemandTile.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertEqual(DemandTile.objects.get().requested, 1)
+
+    def test_heatmap_rejects_invalid_params(self):
+        with self.assertRaises(ValidationError):
+            HeatmapService.heatmap(precision='9')
+        with self.assertRaises(ValidationError):
+            HeatmapService.heatmap(since='ayer')
+        with self.assertRaises(ValidationError):
+            HeatmapService.heatmap(since='2026-01-02T00:00:00', until='2026-01-01T00:00:00')
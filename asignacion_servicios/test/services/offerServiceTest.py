@@ -0,0 +1,152 @@
+import threading
+import time
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.core.exceptions import ValidationError
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from asignacion_servicios.dispatch import Offer, OfferBroker, city_key
+from asignacion_servicios.models import Service, Client, Driver, Address
+from asignacion_servicios.services import ServiceService, OfferService
+
+@override_settings(DISPATCH_OFFERS_ENABLED=True, DISPATCH_OFFER_TTL_SECONDS=20, DISPATCH_OFFER_SWEEP_SECONDS=0)
+class OfferServiceTestCase(TestCase):
+    def setUp(self):
+        OfferService.broker = OfferBroker()
+        self.pickup = Address.objects.create(
+            name="Recogida", country="Colombia", city="Bogotá", street="Calle 1",
+            latitude=4.60971, longitude=-74.08175
+        )
+        near = Address.objects.create(
+            name="Cerca", country="Colombia", city="Bogotá", street="Calle 2",
+            latitude=4.6100, longitude=-74.0820
+        )
+        far = Address.objects.create(
+            name="Lejos", country="Colombia", city="Bogotá", street="Calle 3",
+            latitude=4.7000, longitude=-74.0500
+        )
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="cliente@correo.com", address=self.pickup
+        )
+        self.near_driver = Driver.objects.create(name="Cerca", phone="+573001111111", address=near, is_available=True)
+        self.far_driver = Driver.objects.create(name="Lejos", phone="+573002222222", address=far, is_available=True)
+
+    def _create_service(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ServiceService.create_service({"pickup_address": self.pickup.id, "client": self.client_obj})
+
+    def test_offer_is_published_only_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            service, warning = ServiceService.create_service({"pickup_address": self.pickup.id, "client": self.client_obj})
+            self.assertIsNone(warning)
+            self.assertIsNone(OfferService.poll_offer(self.near_driver.id, 0))
+        for callback in callbacks:
+            callback()
+        self.assertEqual(OfferService.poll_offer(self.near_driver.id, 0).service_id, service.id)
+
+    def test_create_service_warns_when_no_driver_can_be_offered(self):
+        Driver.objects.update(is_available=False)
+        service, warning = self._create_service()
+        self.assertEqual(warning, "No hay conductores disponibles en este momento.")
+        self.assertIsNone(OfferService.poll_offer(self.near_driver.id, 0))
+
+    def test_create_service_offers_to_closest_driver_without_assigning(self):
+        service, warning = self._create_service()
+        self.assertIsNone(warning)
+        self.assertEqual(service.status, "pending")
+        self.assertIsNone(service.driver)
+        self.near_driver.refresh_from_db()
+        self.assertTrue(self.near_driver.is_available)
+
+        offer = OfferService.poll_offer(self.near_driver.id, 0)
+        self.assertEqual(offer.service_id, service.id)
+        self.assertIsNone(OfferService.poll_offer(self.far_driver.id, 0))
+
+    def test_accept_offer_assigns_driver(self):
+        service, _ = self._create_service()
+        accepted = OfferService.accept_offer(self.near_driver.id, service.id)
+        self.assertEqual(accepted.status, "in_progress")
+        self.assertEqual(accepted.driver, self.near_driver)
+        self.assertIsNotNone(accepted.distance)
+        self.near_driver.refresh_from_db()
+        self.assertFalse(self.near_driver.is_available)
+        with self.assertRaises(ValidationError):
+            OfferService.accept_offer(self.near_driver.id, service.id)
+
+    def test_reject_offer_escalates_to_next_driver(self):
+        service, _ = self._create_service()
+        next_offer = OfferService.reject_offer(self.near_driver.id, service.id)
+        self.assertEqual(next_offer.driver_id, self.far_driver.id)
+        self.assertIn(self.near_driver.id, next_offer.excluded)
+        self.assertIsNone(OfferService.poll_offer(self.near_driver.id, 0))
+        self.assertIsNone(OfferService.reject_offer(self.far_driver.id, service.id))
+
+    @override_settings(DISPATCH_OFFER_TTL_SECONDS=0)
+    def test_expired_offer_escalates_on_sweep(self):
+        service, _ = self._create_service()
+        self.assertEqual(OfferService.sweep_expired(), 1)
+        with self.assertRaises(ValidationError):
+            OfferService.accept_offer(self.near_driver.id, service.id)
+
+    def test_sweeper_thread_escalates_without_polling(self):
+        swept = threading.Event()
+        with override_settings(DISPATCH_OFFER_SWEEP_SECONDS=0.01), \
+                mock.patch.object(OfferService, 'sweep_expired', side_effect=swept.set):
+            self._create_service()
+            self.assertTrue(swept.wait(2))
+        OfferService._sweeper.join(2)
+        self.assertFalse(OfferService._sweeper.is_alive())
+
+    def test_accept_uses_average_speed_setting(self):
+        service, _ = self._create_service()
+        with override_settings(DISPATCH_AVERAGE_SPEED_KMH=20):
+            accepted = OfferService.accept_offer(self.near_driver.id, service.id)
+        self.assertAlmostEqual(accepted.estimated_time, accepted.distance / 20 * 60, places=2)
+
+    def test_accept_fails_when_driver_taken_and_escalates(self):
+        service, _ = self._create_service()
+        Driver.objects.filter(pk=self.near_driver.id).update(is_available=False)
+        with self.assertRaises(ValidationError):
+            OfferService.accept_offer(self.near_driver.id, service.id)
+        service.refresh_from_db()
+        self.assertEqual(service.status, "pending")
+        self.assertEqual(OfferService.poll_offer(self.far_driver.id, 0).service_id, service.id)
+
+    def test_poll_with_non_finite_timeout_returns_immediately(self):
+        started = time.monotonic()
+        self.assertIsNone(OfferService.poll_offer(self.far_driver.id, float('nan')))
+        self.assertIsNone(OfferService.poll_offer(self.far_driver.id, float('inf')))
+        self.assertLess(time.monotonic() - started, 1)
+
+    def test_broker_poll_skips_expired_and_cleans_up(self):
+        broker = OfferBroker()
+        shard = city_key("Colombia", "Bogotá")
+        broker.publish(Offer(1, 7, shard, 1.0, time.monotonic() - 1))
+        broker.publish(Offer(2, 7, shard, 1.0, time.monotonic() + 30))
+        self.assertEqual(broker.poll(7, shard).service_id, 2)
+        self.assertEqual([offer.service_id for offer in broker.pop_expired()], [1])
+        self.assertIsNotNone(broker.take(2, shard, driver_id=7))
+        self.assertEqual(broker.busy_drivers(shard), set())
+
+    def test_offer_endpoints(self):
+        User.objects.create_user(username='conductor', password='testpass')
+        api = APIClient()
+        token = api.post('/api/token/', {'username': 'conductor', 'password': 'testpass'}).data['access']
+        api.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        service, _ = self._create_service()
+
+        response = api.get(f'/api/drivers/{self.far_driver.id}/offers/')
+        self.assertEqual(response.status_code, 204)
+        response = api.get(f'/api/drivers/{self.near_driver.id}/offers/', {'wait': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['offer']['service_id'], service.id)
+
+        for wait in ('nan', 'inf', 'abc'):
+            response = api.get(f'/api/drivers/{self.far_driver.id}/offers/', {'wait': wait})
+            self.assertEqual(response.status_code, 400)
+
+        response = api.post(f'/api/drivers/{self.near_driver.id}/offers/{service.id}/accept/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['service']['driver'], self.near_driver.id)
+        response = api.post(f'/api/drivers/{self.far_driver.id}/offers/{service.id}/reject/')
+        self.assertEqual(response.status_code, 400)
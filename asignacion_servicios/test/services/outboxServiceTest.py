@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from asignacion_servicios.models import Address, Client, Driver, OutboxEvent, Service
+from asignacion_servicios.outbox import FileSink, InProcessSink, OutboxSink, subscribe, unsubscribe
+from asignacion_servicios.services import DriverService, OutboxService, ServiceService
+
+
+class FailingSink(OutboxSink):
+    def send(self, events):
+        raise RuntimeError("sink caído")
+
+
+class OutboxServiceTestCase(TestCase):
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Origen", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.60971, longitude=-74.08175
+        )
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="c@correo.com", address=self.address
+        )
+        self.driver = Driver.objects.create(name="Conductor", phone="+573009876543", address=self.address)
+
+    def _event_types(self, service_id):
+        return list(OutboxEvent.objects.filter(aggregate_id=service_id).values_list('event_type', flat=True))
+
+    def test_lifecycle_writes_events_in_order(self):
+        service, _ = ServiceService.create_service({"pickup_address": self.address.id, "client": self.client_obj})
+        DriverService.complete_service(self.driver.id, service.id)
+        self.assertEqual(self._event_types(service.id), ['service.created', 'service.status_changed'])
+        completed = OutboxEvent.objects.filter(aggregate_id=service.id).last()
+        self.assertEqual(completed.payload, {
+            'service_id': service.id, 'from': 'in_progress', 'to': 'completed', 'driver_id': self.driver.id
+        })
+
+    def test_update_service_records_driver_assignment(self):
+        service = Service.objects.create(pickup_address=self.address, client=self.client_obj)
+        ServiceService.update_service(service.id, {'driver': self.driver.id})
+        self.assertEqual(
+            self._event_types(service.id),
+            ['service.created', 'service.driver_assigned', 'service.status_changed']
+        )
+
+    def test_bulk_transition_writes_one_event_per_updated_service(self):
+        services = [Service.objects.create(pickup_address=self.address, client=self.client_obj) for _ in range(3)]
+        OutboxEvent.objects.all().delete()
+        ServiceService.bulk_transition([service.id for service in services], 'canceled')
+        self.assertEqual(OutboxEvent.objects.filter(event_type='service.status_changed').count(), 3)
+
+    def test_relay_publishes_to_sinks_and_marks_published(self):
+        received = []
+        handler = subscribe('service.created')(received.append)
+        self.addCleanup(unsubscribe, 'service.created', handler)
+        Service.objects.create(pickup_address=self.address, client=self.client_obj)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'outbox.jsonl')
+            self.assertEqual(OutboxService.relay_batch([FileSink(path), InProcessSink()]), 1)
+            with open(path, encoding='utf-8') as lines:
+                self.assertEqual(json.loads(lines.readline())['event_type'], 'service.created')
+
+        self.assertEqual(len(received), 1)
+        self.assertEqual(OutboxService.relay_batch([InProcessSink()]), 0)
+
+    def test_failed_sink_leaves_events_pending(self):
+        Service.objects.create(pickup_address=self.address, client=self.client_obj)
+        with self.assertRaises(RuntimeError):
+            OutboxService.relay_batch([FailingSink()])
+        self.assertEqual(OutboxEvent.objects.filter(published_at__isnull=True).count(), 1)
+
+    def test_relay_command_survives_sink_errors(self):
+        relay_batch = mock.Mock(side_effect=[RuntimeError("sink caído"), 2, KeyboardInterrupt])
+        with mock.patch.object(OutboxService, 'relay_batch', relay_batch), \
+                mock.patch('asignacion_servicios.management.commands.relay_outbox.time.sleep'), \
+                self.assertLogs('asignacion_servicios', 'ERROR'):
+            out = StringIO()
+            call_command('relay_outbox', stdout=out)
+        self.assertEqual(relay_batch.call_count, 3)
+        self.assertIn("Eventos publicados: 2", out.getvalue())
@@ -0,0 +1,51 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import TestCase
+from asignacion_servicios.dispatch import allocate, plan_moves
+from asignacion_servicios.models import Address, DemandTile, Driver, DriverRecommendation
+from asignacion_servicios.services import HeatmapService, RepositioningService
+from asignacion_servicios.utils import geohash_encode
+
+
+class RepositioningServiceTestCase(TestCase):
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Centro", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.60971, longitude=-74.08175
+        )
+        self.drivers = [
+            Driver.objects.create(name=f"Conductor {i}", phone=f"+57300123456{i}", address=self.address)
+            for i in range(3)
+        ]
+        self.at = datetime(2026, 3, 10, 18, 30, tzinfo=dt_timezone.utc)
+
+    def _demand(self, latitude, longitude, requested, weeks=(1, 2)):
+        for week in weeks:
+            DemandTile.objects.create(
+                geohash=geohash_encode(latitude, longitude, HeatmapService.precision()),
+                window_start=HeatmapService.window_start(self.at - timedelta(weeks=week)),
+                requested=requested,
+            )
+
+    def test_allocate_uses_largest_remainder(self):
+        self.assertEqual(allocate(3, [1, 1, 1]), [1, 1, 1])
+        self.assertEqual(allocate(4, [2.5, 1.0, 0.5]), [3, 1, 0])
+        self.assertEqual(allocate(3, [0, 0]), [0, 0])
+
+    def test_plan_moves_pairs_nearest_deficits(self):
+        centers = [(4.60, -74.08), (4.62, -74.08), (4.90, -74.08)]
+        moves = plan_moves([2, 0, 0], [0, 1, 1], centers, max_distance_km=10)
+        self.assertEqual([(source, target, count) for source, target, count, _ in moves], [(0, 1, 1)])
+
+    def test_forecast_averages_same_hour_of_week(self):
+        self._demand(4.65, -74.06, requested=6)
+        cell = geohash_encode(4.65, -74.06, RepositioningService.precision())
+        self.assertEqual(RepositioningService.forecast(self.at), {cell: 3.0})
+
+    def test_recommend_moves_idle_drivers_towards_demand(self):
+        self._demand(4.65, -74.06, requested=8)
+        self.assertEqual(RepositioningService.recommend(self.at), 3)
+        target = geohash_encode(4.65, -74.06, RepositioningService.precision())
+        self.assertEqual(set(DriverRecommendation.objects.values_list('target_geohash', flat=True)), {target})
+
+        Driver.objects.filter(pk=self.drivers[0].pk).update(is_available=False)
+        self.assertEqual(len(RepositioningService.list_recommendations()), 2)
+        self.assertEqual(RepositioningService.list_recommendations(self.drivers[0].pk), [])
@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from asignacion_servicios.dispatch import ScheduleQueue
+from asignacion_servicios.models import Address, Client, Driver, Service
+from asignacion_servicios.services import SchedulingService, ServiceService
+
+
+class SchedulingServiceTestCase(TestCase):
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Base", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.6000, longitude=-74.0800
+        )
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="c@correo.com", address=self.address
+        )
+        self.driver = Driver.objects.create(name="Conductor", phone="+573009876543", address=self.address)
+
+    def test_schedule_queue_orders_and_reschedules(self):
+        t0 = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        queue = ScheduleQueue()
+        queue.push(1, t0 + timedelta(minutes=5))
+        queue.push(2, t0 + timedelta(minutes=1))
+        queue.push(3, t0 + timedelta(minutes=3))
+        queue.push(2, t0 + timedelta(minutes=10))
+        queue.discard(3)
+
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.next_due(), t0 + timedelta(minutes=5))
+        self.assertEqual(queue.pop_due(t0 + timedelta(minutes=6), 10), [1])
+        self.assertEqual(queue.pop_due(t0 + timedelta(minutes=20), 10), [2])
+        self.assertIsNone(queue.next_due())
+
+    def test_deferred_service_is_dispatched_when_due(self):
+        scheduled_for = timezone.now() + timedelta(hours=1)
+        service, _ = ServiceService.create_service({
+            'pickup_address': self.address, 'client': self.client_obj, 'scheduled_for': scheduled_for,
+        })
+        self.assertEqual(service.status, 'pending')
+        self.assertIsNone(service.driver_id)
+
+        queue = ScheduleQueue()
+        self.assertEqual(SchedulingService.refresh(queue), 1)
+        self.assertEqual(SchedulingService.dispatch_due(queue), 0)
+
+        due = scheduled_for - SchedulingService.lead_time()
+        self.assertEqual(queue.next_due(), due)
+        self.assertEqual(SchedulingService.dispatch_due(queue, now=due), 1)
+        service.refresh_from_db()
+        self.assertEqual((service.status, service.driver_id), ('in_progress', self.driver.id))
+        self.assertEqual(len(queue), 0)
+
+    def test_refresh_keeps_retry_of_unassignable_overdue_service(self):
+        Driver.objects.update(is_available=False)
+        now = timezone.now()
+        Service.objects.create(pickup_address=self.address, client=self.client_obj, scheduled_for=now)
+        queue = ScheduleQueue()
+        SchedulingService.refresh(queue, now=now)
+        self.assertEqual(SchedulingService.dispatch_due(queue, now=now), 0)
+        retry_at = queue.next_due()
+        self.assertGreater(retry_at, now)
+
+        SchedulingService.refresh(queue, now=now + timedelta(seconds=1))
+        self.assertEqual(queue.next_due(), retry_at)
+
+    def test_refresh_applies_rescheduled_pickup(self):
+        now = timezone.now()
+        service = Service.objects.create(
+            pickup_address=self.address, client=self.client_obj, scheduled_for=now + timedelta(hours=1)
+        )
+        queue = ScheduleQueue()
+        SchedulingService.refresh(queue, now=now)
+        Service.objects.filter(pk=service.pk).update(scheduled_for=now)
+        SchedulingService.refresh(queue, now=now)
+        self.assertEqual(queue.next_due(), now - SchedulingService.lead_time())
+
+    def test_dispatcher_command_survives_errors_and_reloads(self):
+        dispatch_due = mock.Mock(side_effect=[RuntimeError("base de datos caída"), 3, KeyboardInterrupt])
+        with mock.patch.object(SchedulingService, 'dispatch_due', dispatch_due), \
+                mock.patch.object(SchedulingService, 'refresh') as refresh, \
+                mock.patch('asignacion_servicios.management.commands.dispatch_scheduled.time.sleep'), \
+                self.assertLogs('asignacion_servicios', 'ERROR'):
+            out = StringIO()
+            call_command('dispatch_scheduled', stdout=out)
+        self.assertEqual(refresh.call_count, 2)
+        self.assertIn("Servicios programados asignados: 3", out.getvalue())
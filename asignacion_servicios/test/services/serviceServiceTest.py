@@ -1,5 +1,7 @@
+from datetime import timedelta
 from django.test import TestCase
 from django.core.exceptions import ValidationError, ObjectDoesNotExist
+from asignacion_servicios.dispatch import distance_matrix
 from asignacion_servicios.models import Service, Client, Driver, Address
 from asignacion_servicios.services import ServiceService
 
@@ -95,6 +97,20 @@ class ServiceServiceTestCase(TestCase):
         self.assertEqual(service.driver, self.driver)
         self.assertIsNone(warning)
 
+    def test_create_service_with_driver_reserves_capacity(self):
+        data = {"pickup_address": self.address1.id, "client": self.client, "driver": self.driver.id}
+        service, _ = ServiceService.create_service(data)
+        self.assertAlmostEqual(service.distance, ServiceService.calculate_distance(self.address2, self.address1))
+        self.assertAlmostEqual(service.estimated_time, ServiceService.estimate_minutes(service.distance))
+        self.driver.refresh_from_db()
+        self.assertEqual((self.driver.active_services, self.driver.is_available), (1, False))
+
+        service, warning = ServiceService.create_service({"pickup_address": self.address1.id, "client": self.client})
+        self.assertIsNone(service.driver)
+        self.assertIsNotNone(warning)
+        with self.assertRaises(ValidationError):
+            ServiceService.create_service(data)
+
     def test_get_service(self):
         service = ServiceService.get_service(self.service.id)
         self.assertEqual(service.id, self.service.id)
@@ -155,4 +171,90 @@ class ServiceServiceTestCase(TestCase):
 
     def test_calculate_distance(self):
         distance = ServiceService.calculate_distance(self.address1, self.address2)
-        self.assertTrue(distance > 0)
\ No newline at end of file
+        self.assertTrue(distance > 0)
+
+    def test_bulk_transition_cancel(self):
+        self.driver.is_available = False
+        self.driver.save()
+        in_progress = Service.objects.create(
+            pickup_address=self.address1,
+            client=self.client,
+            driver=self.driver,
+            status="in_progress"
+        )
+        results = ServiceService.bulk_transition([self.service.id, in_progress.id], "canceled")
+        self.assertEqual([r["result"] for r in results], ["updated", "updated"])
+        self.service.refresh_from_db()
+        in_progress.refresh_from_db()
+        self.driver.refresh_from_db()
+        self.assertEqual(self.service.status, "canceled")
+        self.assertEqual(in_progress.status, "canceled")
+        self.assertTrue(self.driver.is_available)
+
+    def test_bulk_transition_complete_requires_in_progress(self):
+        results = ServiceService.bulk_transition([self.service.id, 999], "completed")
+        self.assertEqual(results[0]["result"], "invalid_transition")
+        self.assertEqual(results[1]["result"], "not_found")
+        self.service.refresh_from_db()
+        self.assertEqual(self.service.status, "pending")
+
+    def test_bulk_transition_invalid_status(self):
+        with self.assertRaises(ValidationError):
+            ServiceService.bulk_transition([self.service.id], "in_progress")
+
+    def test_update_service_reassign_swaps_drivers(self):
+        ServiceService.update_service(self.service.id, {"driver": self.driver.id})
+        other = Driver.objects.create(name="Conductor Dos", phone="+573005555555", address=self.address1)
+        updated = ServiceService.update_service(self.service.id, {"driver": other.id})
+        self.assertEqual(updated.driver, other)
+        self.driver.refresh_from_db()
+        other.refresh_from_db()
+        self.assertTrue(self.driver.is_available)
+        self.assertFalse(other.is_available)
+
+    def test_update_service_same_driver_is_not_reclaimed(self):
+        ServiceService.update_service(self.service.id, {"driver": self.driver.id})
+        updated = ServiceService.update_service(self.service.id, {"driver": self.driver.id, "distance": 3.0})
+        self.assertEqual(updated.distance, 3.0)
+
+    def test_cancel_service_releases_driver(self):
+        ServiceService.update_service(self.service.id, {"driver": self.driver.id})
+        ServiceService.update_service(self.service.id, {"status": "canceled"})
+        self.driver.refresh_from_db()
+        self.assertTrue(self.driver.is_available)
+
+    def test_find_closest_driver_scoring_presets(self):
+        nearby = Driver.objects.create(name="Cercano", phone="+573001112233", address=self.address1)
+        Service.objects.bulk_create([
+            Service(pickup_address=self.address1, client=self.client, driver=nearby, status="completed")
+            for _ in range(3)
+        ])
+        driver, distance = ServiceService._find_closest_driver(self.address1)
+        self.assertEqual(driver, nearby)
+        self.assertAlmostEqual(distance, 0.0)
+
+        weights = {'colombia|bogotá': {'distance': 0.1, 'recent_completed': 1.0}}
+        with self.settings(DISPATCH_SCORING_CITIES=weights):
+            driver, distance = ServiceService._find_closest_driver(self.address1)
+        self.assertEqual(driver, self.driver)
+        self.assertGreater(distance, 100)
+
+    def test_find_closest_driver_idle_uses_last_completed_service(self):
+        nearby = Driver.objects.create(name="Cercano", phone="+573001112233", address=self.address1)
+        recent = Service.objects.create(pickup_address=self.address1, client=self.client, driver=nearby, status="completed")
+        old = Service.objects.create(pickup_address=self.address1, client=self.client, driver=self.driver, status="completed")
+        Service.objects.filter(pk=old.pk).update(updated_at=recent.updated_at - timedelta(hours=5))
+        # Editar al conductor (updated_at) no cambia su tiempo sin servicios.
+        self.driver.save()
+
+        with self.settings(DISPATCH_SCORING_CITIES={'colombia|bogotá': {'idle': 1.0}}):
+            driver, distance = ServiceService._find_closest_driver(self.address1)
+        self.assertEqual(driver, self.driver)
+        pickup = (self.address1.latitude, self.address1.longitude)
+        expected = distance_matrix([pickup], [(self.driver.address.latitude, self.driver.address.longitude)])[0][0]
+        self.assertAlmostEqual(distance, float(expected), places=6)
+
+    def test_find_closest_driver_unknown_preset(self):
+        with self.settings(DISPATCH_SCORING_DEFAULT='inexistente'):
+            with self.assertRaises(ValueError):
+                ServiceService._find_closest_driver(self.address1)
@@ -0,0 +1,90 @@
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from io import StringIO
+from unittest import mock
+from asignacion_servicios.models import Address, Client, Driver, Task
+from asignacion_servicios.services import ServiceService, TaskService
+from asignacion_servicios.tasks import task
+
+calls = []
+
+
+@task('test_flaky_task', max_attempts=2)
+def flaky_task(fail: bool = False):
+    calls.append(fail)
+    if fail:
+        raise RuntimeError("fallo simulado")
+
+
+@override_settings(TASKS_RETRY_BASE_SECONDS=5, TASKS_RETRY_MAX_SECONDS=300)
+class TaskServiceTestCase(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_run_due_executes_and_marks_done(self):
+        queued = TaskService.enqueue(flaky_task)
+        self.assertEqual(TaskService.run_due(), 1)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'done')
+        self.assertEqual(queued.attempts, 1)
+        self.assertEqual(calls, [False])
+
+    def test_delayed_task_is_not_claimed_early(self):
+        TaskService.enqueue(flaky_task, delay_seconds=60)
+        self.assertEqual(TaskService.run_due(), 0)
+
+    def test_failed_task_retries_with_backoff_then_fails(self):
+        queued = TaskService.enqueue(flaky_task, fail=True)
+        TaskService.run_due()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'pending')
+        self.assertIn("fallo simulado", queued.last_error)
+        self.assertGreaterEqual(queued.run_after, timezone.now() + timedelta(seconds=4))
+
+        Task.objects.filter(pk=queued.pk).update(run_after=timezone.now())
+        with self.assertLogs('asignacion_servicios.services.taskService', level='ERROR'):
+            TaskService.run_due()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'failed')
+        self.assertEqual(queued.attempts, 2)
+
+    def test_retry_delay_is_exponential_and_capped(self):
+        self.assertGreaterEqual(TaskService.retry_delay(1), 5)
+        self.assertGreaterEqual(TaskService.retry_delay(3), 20)
+        self.assertLessEqual(TaskService.retry_delay(3), 22)
+        self.assertLessEqual(TaskService.retry_delay(20), 330)
+
+    def test_unknown_task_is_marked_failed(self):
+        queued = Task.objects.create(name='missing_task', run_after=timezone.now())
+        TaskService.run_due()
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'failed')
+
+    def test_create_service_defers_driver_notification(self):
+        address = Address.objects.create(
+            name="Origen", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.60971, longitude=-74.08175
+        )
+        client = Client.objects.create(name="Cliente", phone="+573001234567", email="c@correo.com", address=address)
+        Driver.objects.create(name="Conductor", phone="+573009876543", address=address, is_available=True)
+
+        service, _ = ServiceService.create_service({"pickup_address": address.id, "client": client})
+        queued = Task.objects.get(name='notify_driver_assigned')
+        self.assertEqual(queued.payload, {'service_id': service.id})
+
+        out = StringIO()
+        call_command('run_tasks', '--once', stdout=out)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, 'done')
+        self.assertIn("Tareas procesadas: 1", out.getvalue())
+
+    def test_worker_survives_errors_and_requeues_periodically(self):
+        run_due = mock.Mock(side_effect=[RuntimeError("base de datos caída"), 0, KeyboardInterrupt])
+        with mock.patch.object(TaskService, 'run_due', run_due), \
+                mock.patch.object(TaskService, 'requeue_stale', return_value=0) as requeue_stale, \
+                mock.patch('asignacion_servicios.management.commands.run_tasks.time.sleep'), \
+                override_settings(TASKS_REQUEUE_SECONDS=0), self.assertLogs('asignacion_servicios', 'ERROR'):
+            call_command('run_tasks', stdout=StringIO())
+        self.assertEqual(run_due.call_count, 3)
+        self.assertEqual(requeue_stale.call_count, 3)
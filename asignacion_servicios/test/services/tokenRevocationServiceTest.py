@@ -0,0 +1,115 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from asignacion_servicios.serializers.tokenSerializers import RefreshToken
+from asignacion_servicios.services import TokenRevocationService
+from asignacion_servicios.utils import BloomFilter
+
+
+@override_settings(THROTTLE_BUCKETS={})
+class TokenRevocationServiceTestCase(TestCase):
+    def setUp(self):
+        caches[settings.TOKEN_BLACKLIST_CACHE].clear()
+        TokenRevocationService.reset()
+        self.addCleanup(TokenRevocationService.reset)
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+
+    def obtain(self) -> str:
+        return self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['refresh']
+
+    def test_rotated_refresh_token_cannot_be_reused(self):
+        refresh = self.obtain()
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rotated = response.data['refresh']
+
+        response = self.client.post('/api/token/refresh/', {'refresh': refresh})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        response = self.client.post('/api/token/verify/', {'token': refresh})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/api/token/refresh/', {'refresh': rotated})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_default_revocation_cache_is_shared(self):
+        self.assertTrue(TokenRevocationService.cache_is_shared())
+
+    def test_concurrent_revocations_always_change_the_version(self):
+        cache = caches[settings.TOKEN_BLACKLIST_CACHE]
+        TokenRevocationService.sync()
+        seen = set()
+        for _ in range(3):
+            TokenRevocationService._bump_version()
+            seen.add(cache.get('token_blacklist:version'))
+        self.assertEqual(len(seen), 3)
+
+    def test_valid_token_is_checked_without_querying_the_blacklist(self):
+        refresh = self.obtain()
+        RefreshToken(self.obtain()).blacklist()
+        TokenRevocationService.sync()
+        with CaptureQueriesContext(connection) as queries:
+            RefreshToken(refresh)
+        self.assertFalse(any('blacklistedtoken' in query['sql'] for query in queries.captured_queries))
+
+    def test_revocations_from_other_processes_are_synced_by_version(self):
+        token = RefreshToken(self.obtain())
+        self.assertFalse(TokenRevocationService.is_revoked(token['jti']))
+
+        # Otro proceso revoca el token: la fila existe pero este filtro no la conoce.
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=OutstandingToken.objects.get(jti=token['jti']))])
+        caches[settings.TOKEN_BLACKLIST_CACHE].set('token_blacklist:version', 'otro-proceso')
+        self.assertTrue(TokenRevocationService.is_revoked(token['jti']))
+
+    @override_settings(TOKEN_BLACKLIST_CACHE='default')
+    def test_process_local_cache_always_checks_the_database(self):
+        self.assertFalse(TokenRevocationService.cache_is_shared())
+        token = RefreshToken(self.obtain())
+        self.assertFalse(TokenRevocationService.is_revoked(token['jti']))
+
+        # Otro proceso revoca el token y su versión no llega a esta caché.
+        BlacklistedToken.objects.bulk_create([BlacklistedToken(token=OutstandingToken.objects.get(jti=token['jti']))])
+        self.assertTrue(TokenRevocationService.is_revoked(token['jti']))
+        response = self.client.post('/api/token/refresh/', {'refresh': str(token)})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_purge_expired_removes_only_expired_tokens(self):
+        now = timezone.now()
+        tokens = [
+            OutstandingToken.objects.create(
+                user=self.user, jti=f'jti-{index}', token='t', expires_at=now + timedelta(hours=1 if index < 2 else -1),
+            )
+            for index in range(7)
+        ]
+        BlacklistedToken.objects.create(token=tokens[0])
+        BlacklistedToken.objects.create(token=tokens[5])
+
+        self.assertEqual(TokenRevocationService.purge_expired(now, batch_size=2), 5)
+        self.assertEqual(set(OutstandingToken.objects.values_list('jti', flat=True)), {'jti-0', 'jti-1'})
+        self.assertEqual(list(BlacklistedToken.objects.values_list('token__jti', flat=True)), ['jti-0'])
+
+    def test_purge_command_survives_errors(self):
+        purge_expired = mock.Mock(side_effect=[RuntimeError("base de datos caída"), 3, KeyboardInterrupt])
+        with mock.patch.object(TokenRevocationService, 'purge_expired', purge_expired), \
+                mock.patch('asignacion_servicios.management.commands.purge_tokens.time.sleep'), \
+                self.assertLogs('asignacion_servicios', 'ERROR'):
+            out = StringIO()
+            call_command('purge_tokens', every=60, stdout=out)
+        self.assertIn("Tokens expirados eliminados: 3", out.getvalue())
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for index in range(1000):
+            bloom.add(f'in-{index}')
+        self.assertTrue(all(f'in-{index}' in bloom for index in range(1000)))
+        false_positives = sum(f'out-{index}' in bloom for index in range(10000))
+        self.assertLess(false_positives, 300)
+        self.assertFalse(bloom.full())
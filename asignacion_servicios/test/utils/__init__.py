@@ -0,0 +1 @@
+from .geoTest import GeoQueryTestCase
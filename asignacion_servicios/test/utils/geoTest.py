@@ -0,0 +1,67 @@
+from django.contrib.auth.models import User
+from django.http import QueryDict
+from rest_framework.test import APITestCase
+from asignacion_servicios.models import Address, Driver
+from asignacion_servicios.utils import GeoArea, haversine_km, parse_geo_params
+
+
+class GeoQueryTestCase(APITestCase):
+    def setUp(self):
+        User.objects.create_user(username='testuser', password='testpass')
+        token = self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.center = Address.objects.create(
+            name="Centro", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.60971, longitude=-74.08175
+        )
+        self.near = Address.objects.create(
+            name="Cerca", country="Colombia", city="Bogotá", street="Calle 2", latitude=4.62, longitude=-74.08175
+        )
+        self.far = Address.objects.create(
+            name="Lejos", country="Colombia", city="Medellín", street="Calle 3", latitude=6.2442, longitude=-75.5812
+        )
+        self.near_driver = Driver.objects.create(name="Cerca", phone="+573001111111", address=self.near)
+        Driver.objects.create(name="Lejos", phone="+573002222222", address=self.far)
+
+    def test_bbox_around_contains_circle(self):
+        area = GeoArea.around(4.60971, -74.08175, 3)
+        lat_min, lng_min, lat_max, lng_max = area.bbox
+        self.assertAlmostEqual(haversine_km((4.60971, -74.08175), (lat_max, -74.08175)), 3, places=3)
+        self.assertAlmostEqual(haversine_km((4.60971, -74.08175), (4.60971, lng_max)), 3, delta=0.01)
+        self.assertLess(lng_min, lng_max)
+
+    def test_bbox_around_wraps_antimeridian(self):
+        lat_min, lng_min, lat_max, lng_max = GeoArea.around(0, 179.99, 10).bbox
+        self.assertGreater(lng_min, lng_max)
+
+    def test_parse_geo_params_validation(self):
+        self.assertIsNone(parse_geo_params(QueryDict(''), 100))
+        for query in ('lat=4&lng=-74', 'lat=4&lng=-74&radius_km=500', 'bbox=1,2,3', 'bbox=0,95,1,96',
+                      'bbox=0,0,1,1&lat=1&lng=1&radius_km=1'):
+            with self.assertRaises(ValueError):
+                parse_geo_params(QueryDict(query), 100)
+
+    def test_sql_distance_matches_python(self):
+        area = GeoArea.around(4.60971, -74.08175, 500)
+        distances = dict(area.apply(Address.objects.all()).values_list('name', 'distance_km'))
+        expected = haversine_km((4.60971, -74.08175), (6.2442, -75.5812))
+        self.assertAlmostEqual(distances['Lejos'], expected, places=6)
+
+    def test_address_radius_query_ordered_by_distance(self):
+        response = self.client.get('/api/addresses/', {'lat': 4.60971, 'lng': -74.08175, 'radius_km': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([a['name'] for a in response.data['results']], ["Centro", "Cerca"])
+
+    def test_address_bbox_query(self):
+        response = self.client.get('/api/addresses/', {'bbox': '-76,6,-75,7'})
+        self.assertEqual([a['name'] for a in response.data['results']], ["Lejos"])
+
+    def test_driver_radius_query(self):
+        response = self.client.get('/api/drivers/', {'lat': 4.60971, 'lng': -74.08175, 'radius_km': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([d['id'] for d in response.data['results']], [self.near_driver.id])
+
+    def test_invalid_geo_params_return_400(self):
+        response = self.client.get('/api/drivers/', {'lat': 4.6, 'radius_km': 3})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("error", response.data)
@@ -1,4 +1,8 @@
 from .addressViewTest import AddressViewSetTest
 from .clientViewTest import ClientViewSetTest
 from .driverViewTest import DriverViewSetTest
-from .serviceViewTest import ServiceViewSetTest
\ No newline at end of file
+from .serviceViewTest import ServiceViewSetTest
+from .conditionalGetViewTest import ConditionalGetViewTest
+from .sparseFieldsViewTest import SparseFieldsViewTest
+from .throttlingViewTest import TokenBucketThrottleTest
+from .authenticationViewTest import CachedJWTAuthenticationTest
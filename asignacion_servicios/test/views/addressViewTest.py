@@ -66,8 +66,9 @@ class AddressViewSetTest(APITestCase):
             "longitude": -74.08175
         }
         response = self.client.post(self.list_url, data)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        self.assertIn("non_field_errors", response.data)
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.assertEqual(response.data['id'], self.address1.id)
+        self.assertEqual(Address.objects.count(), 2)
 
     def test_retrieve_address(self):
         url = reverse('addresses-detail', args=[self.address1.id])
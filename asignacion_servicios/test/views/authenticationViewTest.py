@@ -0,0 +1,82 @@
+import time
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from asignacion_servicios.models import Address
+from asignacion_servicios.views.authentication import token_cache
+
+
+def user_queries(queries) -> int:
+    return sum('auth_user' in query['sql'] for query in queries)
+
+
+@override_settings(THROTTLE_BUCKETS={})
+class CachedJWTAuthenticationTest(APITestCase):
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        User.objects.create_user(username='testuser', password='testpass')
+        self.token = self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.address = Address.objects.create(
+            name="Base", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.6, longitude=-74.08
+        )
+
+    @override_settings(JWT_AUTH_STATELESS_READS=True)
+    def test_reads_do_not_load_the_user(self):
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                self.assertEqual(self.client.get('/api/addresses/').status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(queries.captured_queries), 0)
+
+    def test_writes_load_the_user_once_per_token(self):
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(3):
+                response = self.client.patch(f'/api/addresses/{self.address.id}/', {'name': 'Sede'}, format='json')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(user_queries(queries.captured_queries), 1)
+
+    def test_reads_load_the_user_by_default(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/addresses/')
+            self.client.get('/api/addresses/')
+        self.assertEqual(user_queries(queries.captured_queries), 1)
+
+    @override_settings(JWT_AUTH_STATELESS_READS=True)
+    def test_stateless_reads_expire_with_the_cache_window(self):
+        self.client.get('/api/addresses/')
+        with override_settings(JWT_AUTH_CACHE_SECONDS=1), \
+                patch('asignacion_servicios.views.authentication.time.time', return_value=time.time() + 5):
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get('/api/addresses/')
+            self.assertEqual(user_queries(queries.captured_queries), 1)
+            User.objects.filter(username='testuser').update(is_active=False)
+            token_cache.clear()
+            self.assertEqual(self.client.get('/api/addresses/').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_tampered_token_is_rejected_even_when_cached(self):
+        self.client.get('/api/addresses/')
+        header, payload, signature = self.token.split('.')
+        forged = f"{header}.{payload}.{signature[:-4]}AAAA"
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {forged}')
+        response = self.client.patch(f'/api/addresses/{self.address.id}/', {'name': 'Sede'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @override_settings(JWT_AUTH_CACHE_SIZE=2)
+    def test_cache_is_bounded(self):
+        for _ in range(3):
+            token = self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['access']
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            self.client.get('/api/addresses/')
+        self.assertEqual(len(token_cache), 2)
+
+    @override_settings(JWT_AUTH_CACHE_SECONDS=0)
+    def test_expired_entries_are_validated_again(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.patch(f'/api/addresses/{self.address.id}/', {'name': 'Sede'}, format='json')
+            self.client.patch(f'/api/addresses/{self.address.id}/', {'name': 'Sede'}, format='json')
+        self.assertEqual(user_queries(queries.captured_queries), 2)
@@ -0,0 +1,86 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.urls import reverse
+from django.contrib.auth.models import User
+from asignacion_servicios.models import Address, Client, Driver, Service
+
+
+class ConditionalGetViewTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='testpass')
+        self.client.force_authenticate(user=self.user)
+
+        self.address = Address.objects.create(
+            name="Base 1", country="España", city="Madrid", street="Calle 1",
+            latitude=40.416775, longitude=-3.703790
+        )
+        self.customer = Client.objects.create(
+            name="Cliente Test", phone="+34611111111",
+            email="cliente@test.com", address=self.address
+        )
+        self.driver = Driver.objects.create(
+            name="Juan Perez", phone="+34622222222", address=self.address, is_available=True
+        )
+        self.service = Service.objects.create(pickup_address=self.address, client=self.customer)
+
+    def test_retrieve_returns_etag_and_last_modified(self):
+        for basename, obj in [('addresses', self.address), ('clients', self.customer),
+                              ('drivers', self.driver), ('services', self.service)]:
+            response = self.client.get(reverse(f'{basename}-detail', args=[obj.id]))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('ETag', response)
+            self.assertIn('Last-Modified', response)
+
+    def test_retrieve_not_modified(self):
+        url = reverse('drivers-detail', args=[self.driver.id])
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], etag)
+
+    def test_retrieve_modified_after_update(self):
+        url = reverse('drivers-detail', args=[self.driver.id])
+        etag = self.client.get(url)['ETag']
+        self.driver.name = "Juan Actualizado"
+        self.driver.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_retrieve_missing_object_keeps_404(self):
+        response = self.client.get(reverse('services-detail', args=[999]), HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_not_modified(self):
+        url = reverse('services-list')
+        etag = self.client.get(url)['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_modified_after_delete(self):
+        url = reverse('addresses-list')
+        other = Address.objects.create(
+            name="Base 2", country="España", city="Barcelona", street="Calle 2",
+            latitude=41.385064, longitude=2.173403
+        )
+        etag = self.client.get(url)['ETag']
+        other.delete()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_etag_depends_on_query(self):
+        url = reverse('services-list')
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(f'{url}?status=pending', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_transition_changes_list_etag(self):
+        url = reverse('services-list')
+        etag = self.client.get(url)['ETag']
+        self.client.post(reverse('services-bulk-transition'),
+                         {"ids": [self.service.id], "status": "canceled"}, format='json')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -161,4 +161,12 @@ class DriverViewSetTest(APITestCase):
             "address": self.address1.id,
             "is_available": True
         })
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_recommendations(self):
+        url = reverse('drivers-recommendations')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, [])
+        response = self.client.get(url, {"driver": "abc"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -247,4 +247,57 @@ class ServiceViewSetTest(APITestCase):
         url = reverse('services-detail', args=[999])
         response = self.client.delete(url)
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
-        self.assertIn("error", response.data)
\ No newline at end of file
+        self.assertIn("error", response.data)
+
+    def test_bulk_transition(self):
+        url = reverse('services-bulk-transition')
+        data = {
+            "ids": [self.service_pending.id, self.service_in_progress.id, self.service_completed.id],
+            "status": "canceled"
+        }
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {r['id']: r['result'] for r in response.data['results']}
+        self.assertEqual(results[self.service_pending.id], 'updated')
+        self.assertEqual(results[self.service_in_progress.id], 'updated')
+        self.assertEqual(results[self.service_completed.id], 'invalid_transition')
+        self.service_completed.refresh_from_db()
+        self.assertEqual(self.service_completed.status, 'completed')
+
+    def test_bulk_transition_invalid_status(self):
+        url = reverse('services-bulk-transition')
+        response = self.client.post(url, {"ids": [self.service_pending.id], "status": "pending"}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_heatmap(self):
+        url = reverse('services-heatmap')
+        response = self.client.get(url, {"precision": 4})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['precision'], 4)
+        response = self.client.get(url, {"precision": "x"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_create_service_with_destination_stores_trip_leg(self):
+        data = {
+            "pickup_address": self.address1.id,
+            "destination_address": self.address2.id,
+            "client": self.client1.id,
+        }
+        response = self.client.post(self.list_url, data)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['destination_address'], self.address2.id)
+        self.assertGreater(response.data['trip_distance'], 0)
+        self.assertGreater(response.data['trip_estimated_time'], 0)
+
+    def test_distance_matrix(self):
+        url = reverse('services-distance-matrix')
+        data = {"origins": [self.address1.id, [4.60971, -74.08175]], "destinations": [self.address2.id]}
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['distances']), 2)
+        self.assertEqual(len(response.data['durations'][0]), 1)
+
+        response = self.client.post(url, {"origins": [999], "destinations": [self.address2.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.post(url, {"origins": [[100, 0]], "destinations": [self.address2.id]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APITestCase
+from asignacion_servicios.models import Address, Client, Driver, Service
+
+
+class SparseFieldsViewTest(APITestCase):
+    def setUp(self):
+        User.objects.create_user(username='testuser', password='testpass')
+        token = self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+        self.address = Address.objects.create(
+            name="Base", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.6, longitude=-74.08
+        )
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="c@correo.com", address=self.address
+        )
+        self.driver = Driver.objects.create(name="Conductor", phone="+573009876543", address=self.address)
+        self.service = Service.objects.create(pickup_address=self.address, client=self.client_obj, driver=self.driver)
+
+    def test_list_returns_only_requested_fields(self):
+        expected = {
+            '/api/addresses/': ['id', 'city'],
+            '/api/clients/': ['id', 'email'],
+            '/api/drivers/': ['id', 'is_available'],
+            '/api/services/': ['id', 'driver', 'status'],
+        }
+        for url, fields in expected.items():
+            response = self.client.get(url, {'fields': ','.join(reversed(fields))})
+            self.assertEqual(response.status_code, status.HTTP_200_OK, url)
+            self.assertEqual(list(response.data['results'][0]), fields, url)
+
+        response = self.client.get(f'/api/services/{self.service.id}/', {'fields': 'status,driver'})
+        self.assertEqual(response.data, {'driver': self.driver.id, 'status': 'in_progress'})
+
+    def test_list_reads_only_requested_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/addresses/', {'fields': 'id,name'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        page_query = queries.captured_queries[-1]['sql']
+        self.assertIn('"addresses"."name"', page_query)
+        self.assertNotIn('"addresses"."street"', page_query)
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/services/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('password', response.data['error'])
+        response = self.client.get(f'/api/drivers/{self.driver.id}/', {'fields': 'secret'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_etag_depends_on_fields(self):
+        url = f'/api/drivers/{self.driver.id}/'
+        full = self.client.get(url)
+        sparse = self.client.get(url, {'fields': 'id'})
+        self.assertNotEqual(full['ETag'], sparse['ETag'])
+        response = self.client.get(url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=full['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'id': self.driver.id})
+        response = self.client.get(url, {'fields': 'id'}, HTTP_IF_NONE_MATCH=sparse['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
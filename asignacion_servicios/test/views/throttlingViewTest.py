@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from asignacion_servicios.models import Address, Client
+
+
+@override_settings(THROTTLE_BUCKETS={'user': (0.01, 5), 'anon': (0.01, 5)}, THROTTLE_PRIORITY_RESERVE=0.4)
+class TokenBucketThrottleTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        User.objects.create_user(username='testuser', password='testpass')
+        with override_settings(THROTTLE_BUCKETS={}):
+            token = self.client.post('/api/token/', {'username': 'testuser', 'password': 'testpass'}).data['access']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.address = Address.objects.create(
+            name="Base", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.6, longitude=-74.08
+        )
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="c@correo.com", address=self.address
+        )
+
+    def test_reads_stop_at_reserve_and_dispatch_uses_it(self):
+        statuses = [self.client.get('/api/services/').status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        throttled = self.client.get('/api/services/heatmap/')
+        self.assertEqual(throttled.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', throttled)
+
+        data = {'pickup_address': self.address.id, 'client': self.client_obj.id}
+        statuses = [self.client.post('/api/services/', data, format='json').status_code for _ in range(3)]
+        self.assertEqual(statuses, [201, 201, 429])
+
+    def test_buckets_are_per_endpoint_and_user(self):
+        for _ in range(3):
+            self.client.get('/api/services/')
+        self.assertEqual(self.client.get('/api/services/').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(self.client.get('/api/drivers/').status_code, status.HTTP_200_OK)
+
+        self.client.credentials()
+        self.assertEqual(self.client.get('/api/drivers/').status_code, status.HTTP_200_OK)
@@ -0,0 +1 @@
+from .serviceStateMachineTest import ServiceStateMachineTestCase
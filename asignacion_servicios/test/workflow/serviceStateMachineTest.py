@@ -0,0 +1,65 @@
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from asignacion_servicios.models import Address, Client, Driver, OutboxEvent, Service
+from asignacion_servicios.workflow import ServiceStateMachine, on_transition
+from asignacion_servicios.workflow.serviceStateMachine import _hooks
+
+
+class ServiceStateMachineTestCase(TestCase):
+    def setUp(self):
+        self.address = Address.objects.create(
+            name="Origen", country="Colombia", city="Bogotá", street="Calle 1", latitude=4.60971, longitude=-74.08175
+        )
+        self.client_obj = Client.objects.create(
+            name="Cliente", phone="+573001234567", email="c@correo.com", address=self.address
+        )
+        self.driver = Driver.objects.create(name="Conductor", phone="+573009876543", address=self.address)
+        self.service = Service.objects.create(pickup_address=self.address, client=self.client_obj, driver=self.driver)
+
+    def test_transition_table(self):
+        self.assertTrue(ServiceStateMachine.can_transition('pending', 'in_progress'))
+        self.assertTrue(ServiceStateMachine.can_transition('in_progress', 'in_progress'))
+        self.assertFalse(ServiceStateMachine.can_transition('pending', 'completed'))
+        self.assertFalse(ServiceStateMachine.can_transition('completed', 'completed'))
+        self.assertEqual(ServiceStateMachine.SOURCES['canceled'], ('pending', 'in_progress'))
+        self.assertEqual(ServiceStateMachine.TERMINAL, frozenset({'completed', 'canceled'}))
+        self.assertIsNotNone(ServiceStateMachine.transition_error('in_progress', 'completed', False))
+        self.assertIsNotNone(ServiceStateMachine.status_error(None, 'unknown'))
+
+    def test_transition_to_is_guarded_against_stale_state(self):
+        stale = Service.objects.get(pk=self.service.pk)
+        self.service.transition_to('canceled')
+        with self.assertRaises(ValidationError):
+            stale.transition_to('completed')
+        self.service.refresh_from_db()
+        self.assertEqual(self.service.status, 'canceled')
+
+    def test_transition_to_rejects_invalid_transition(self):
+        self.service.transition_to('completed')
+        with self.assertRaises(ValidationError):
+            self.service.transition_to('canceled')
+        with self.assertRaises(ValidationError):
+            self.service.mark_as_completed()
+
+    def test_hooks_and_events_run_for_guarded_and_save_paths(self):
+        calls = []
+
+        def hook(service_id, from_status, to_status, driver_id):
+            calls.append((service_id, from_status, to_status, driver_id))
+
+        on_transition(to_status='canceled')(hook)
+        self.addCleanup(ServiceStateMachine._compiled_hooks.clear)
+        self.addCleanup(_hooks[('*', 'canceled')].remove, hook)
+
+        self.service.transition_to('canceled')
+        other = Service.objects.create(pickup_address=self.address, client=self.client_obj)
+        other.status = 'canceled'
+        other.save()
+
+        self.assertEqual(calls, [
+            (self.service.id, 'in_progress', 'canceled', self.driver.id),
+            (other.id, 'pending', 'canceled', None),
+        ])
+        self.assertEqual(
+            OutboxEvent.objects.filter(event_type='service.status_changed', payload__to='canceled').count(), 2
+        )
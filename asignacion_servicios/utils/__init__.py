@@ -0,0 +1,4 @@
+from .geo import GeoArea, haversine_km, haversine_expression, parse_geo_params
+from .addressNormalizer import normalize_text, grid_cell, neighbour_cells
+from .geohash import geohash_encode, geohash_bounds
+from .bloomFilter import BloomFilter
@@ -0,0 +1,63 @@
+import math
+import re
+import unicodedata
+from django.conf import settings
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize_text(value) -> str:
+    """
+    Normaliza un texto de dirección para compararlo: sin tildes, en minúsculas (casefold) y con
+    cualquier secuencia de signos o espacios reducida a un único espacio.
+
+    Args:
+        value (str o None): Texto original.
+
+    Returns:
+        str: Texto normalizado ('' si es None).
+    """
+    if not value:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', value)
+    without_marks = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM.sub(' ', without_marks.casefold()).strip()
+
+
+def grid_size() -> float:
+    """
+    Tamaño de la celda de la rejilla en grados (ADDRESS_GRID_DEGREES).
+    """
+    return getattr(settings, 'ADDRESS_GRID_DEGREES', 0.0001)
+
+
+def grid_cell(latitude: float, longitude: float) -> str:
+    """
+    Celda de la rejilla que contiene unas coordenadas.
+
+    Args:
+        latitude (float): Latitud.
+        longitude (float): Longitud.
+
+    Returns:
+        str: Identificador de la celda 'fila:columna'.
+    """
+    size = grid_size()
+    return f"{math.floor(latitude / size)}:{math.floor(longitude / size)}"
+
+
+def neighbour_cells(latitude: float, longitude: float) -> list:
+    """
+    Celda de unas coordenadas y sus 8 vecinas, para no separar puntos casi iguales que caen
+    a ambos lados del borde de una celda.
+
+    Args:
+        latitude (float): Latitud.
+        longitude (float): Longitud.
+
+    Returns:
+        list: Identificadores de las 9 celdas.
+    """
+    size = grid_size()
+    row, column = math.floor(latitude / size), math.floor(longitude / size)
+    return [f"{row + d_row}:{column + d_column}" for d_row in (-1, 0, 1) for d_column in (-1, 0, 1)]
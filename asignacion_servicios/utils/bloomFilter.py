@@ -0,0 +1,45 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom sobre un bytearray para comprobar pertenencia a un conjunto de cadenas en O(1).
+
+    Un resultado negativo es seguro; uno positivo puede ser un falso positivo con probabilidad
+    cercana a 'error_rate' mientras el filtro no supere 'capacity' elementos.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.size = max(int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / self.capacity * math.log(2)), 1)
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, value: str):
+        # Doble hashing (Kirsch-Mitzenmacher): k posiciones a partir de un solo digest.
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + index * second) % self.size for index in range(self.hashes))
+
+    def add(self, value: str) -> None:
+        """
+        Args:
+            value (str): Elemento a añadir.
+        """
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def full(self) -> bool:
+        """
+        Returns:
+            bool: True si se superó la capacidad y la tasa de falsos positivos ya no está garantizada.
+        """
+        return self.count > self.capacity
@@ -0,0 +1,171 @@
+import math
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import ASin, Cos, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+# Kilómetros por grado de latitud (constante en la esfera).
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+class GeoArea:
+    """
+    Zona de búsqueda geográfica: un círculo (centro y radio) o un rectángulo (bounding box).
+
+    Attributes:
+        bbox (tuple): (lat_min, lng_min, lat_max, lng_max). Si lng_min > lng_max, el
+            rectángulo cruza el antimeridiano.
+        center (tuple o None): (lat, lng) del centro cuando la zona es un radio.
+        radius_km (float o None): Radio en kilómetros.
+    """
+    __slots__ = ('bbox', 'center', 'radius_km')
+
+    def __init__(self, bbox, center=None, radius_km=None):
+        self.bbox = bbox
+        self.center = center
+        self.radius_km = radius_km
+
+    @classmethod
+    def around(cls, lat: float, lng: float, radius_km: float) -> 'GeoArea':
+        """
+        Construye la zona circular y el rectángulo que la contiene.
+
+        Args:
+            lat (float): Latitud del centro.
+            lng (float): Longitud del centro.
+            radius_km (float): Radio en kilómetros.
+
+        Returns:
+            GeoArea: Zona con centro, radio y bounding box.
+        """
+        delta_lat = radius_km / KM_PER_DEGREE
+        lat_min, lat_max = lat - delta_lat, lat + delta_lat
+        if lat_min <= -90 or lat_max >= 90:
+            # El círculo incluye un polo: todas las longitudes.
+            return cls((max(lat_min, -90.0), -180.0, min(lat_max, 90.0), 180.0), (lat, lng), radius_km)
+
+        delta_lng = math.degrees(math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat)))))
+        if delta_lng >= 180:
+            return cls((lat_min, -180.0, lat_max, 180.0), (lat, lng), radius_km)
+        lng_min = (lng - delta_lng + 540) % 360 - 180
+        lng_max = (lng + delta_lng + 540) % 360 - 180
+        return cls((lat_min, lng_min, lat_max, lng_max), (lat, lng), radius_km)
+
+    def bbox_q(self, prefix: str = '') -> Q:
+        """
+        Filtro por rectángulo sobre (latitude, longitude), que puede resolverse con el índice compuesto.
+
+        Args:
+            prefix (str, optional): Prefijo de la relación, por ejemplo 'address__'.
+
+        Returns:
+            Q: Condición de la consulta.
+        """
+        lat_min, lng_min, lat_max, lng_max = self.bbox
+        q = Q(**{f'{prefix}latitude__gte': lat_min, f'{prefix}latitude__lte': lat_max})
+        if lng_min <= lng_max:
+            return q & Q(**{f'{prefix}longitude__gte': lng_min, f'{prefix}longitude__lte': lng_max})
+        return q & (Q(**{f'{prefix}longitude__gte': lng_min}) | Q(**{f'{prefix}longitude__lte': lng_max}))
+
+    def apply(self, queryset, prefix: str = ''):
+        """
+        Filtra un queryset por la zona: primero por el rectángulo y, si es un radio, afina con la
+        distancia exacta (haversine) calculada en la base de datos y ordena por cercanía.
+
+        Args:
+            queryset (QuerySet): QuerySet a filtrar.
+            prefix (str, optional): Prefijo de la relación, por ejemplo 'address__'.
+
+        Returns:
+            QuerySet: QuerySet filtrado; con radio, anotado con 'distance_km'.
+        """
+        queryset = queryset.filter(self.bbox_q(prefix))
+        if self.radius_km is None:
+            return queryset
+        return (
+            queryset.annotate(distance_km=haversine_expression(self.center, prefix))
+            .filter(distance_km__lte=self.radius_km)
+            .order_by('distance_km')
+        )
+
+
+def haversine_km(origin: tuple, destination: tuple) -> float:
+    """
+    Distancia de círculo máximo entre dos puntos (lat, lng), en kilómetros.
+
+    Args:
+        origin (tuple): (lat, lng) de origen.
+        destination (tuple): (lat, lng) de destino.
+
+    Returns:
+        float: Distancia en kilómetros.
+    """
+    lat1, lng1 = map(math.radians, origin)
+    lat2, lng2 = map(math.radians, destination)
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_expression(center: tuple, prefix: str = ''):
+    """
+    Expresión SQL de la distancia haversine en km desde 'center' hasta (latitude, longitude).
+
+    Args:
+        center (tuple): (lat, lng) del punto de referencia.
+        prefix (str, optional): Prefijo de la relación, por ejemplo 'address__'.
+
+    Returns:
+        Func: Expresión utilizable en annotate()/filter().
+    """
+    lat, lng = center
+    lat_rad = Radians(F(f'{prefix}latitude'))
+    center_lat_rad = Value(math.radians(lat), output_field=FloatField())
+    half_dlat = (lat_rad - center_lat_rad) / 2
+    half_dlng = (Radians(F(f'{prefix}longitude')) - Value(math.radians(lng), output_field=FloatField())) / 2
+    a = Power(Sin(half_dlat), 2) + Cos(lat_rad) * Value(math.cos(math.radians(lat)), output_field=FloatField()) * Power(Sin(half_dlng), 2)
+    return Value(2 * EARTH_RADIUS_KM, output_field=FloatField()) * ASin(Sqrt(a))
+
+
+def parse_geo_params(params, max_radius_km: float):
+    """
+    Lee los parámetros de búsqueda geográfica de una petición.
+
+    Admite 'lat', 'lng' y 'radius_km' (círculo) o 'bbox=lng_min,lat_min,lng_max,lat_max'
+    (rectángulo, en el orden de GeoJSON).
+
+    Args:
+        params (QueryDict): Parámetros de la petición.
+        max_radius_km (float): Radio máximo permitido.
+
+    Raises:
+        ValueError: Si los parámetros están incompletos o fuera de rango.
+
+    Returns:
+        GeoArea o None: Zona pedida o None si no se pidió ninguna.
+    """
+    bbox = params.get('bbox')
+    radius = params.get('radius_km')
+    if bbox and radius:
+        raise ValueError("Usa 'bbox' o 'radius_km', no ambos.")
+
+    if bbox:
+        try:
+            lng_min, lat_min, lng_max, lat_max = (float(value) for value in bbox.split(','))
+        except ValueError:
+            raise ValueError("'bbox' debe tener el formato lng_min,lat_min,lng_max,lat_max.")
+        if not (-90 <= lat_min <= lat_max <= 90) or not all(-180 <= v <= 180 for v in (lng_min, lng_max)):
+            raise ValueError("'bbox' tiene coordenadas fuera de rango.")
+        return GeoArea((lat_min, lng_min, lat_max, lng_max))
+
+    if radius is None:
+        if params.get('lat') is not None or params.get('lng') is not None:
+            raise ValueError("Para buscar por radio indica 'lat', 'lng' y 'radius_km'.")
+        return None
+    try:
+        lat, lng, radius_km = float(params['lat']), float(params['lng']), float(radius)
+    except (KeyError, ValueError):
+        raise ValueError("Para buscar por radio indica 'lat', 'lng' y 'radius_km' numéricos.")
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        raise ValueError("'lat' o 'lng' están fuera de rango.")
+    if not 0 < radius_km <= max_radius_km:
+        raise ValueError(f"'radius_km' debe ser mayor que 0 y como máximo {max_radius_km}.")
+    return GeoArea.around(lat, lng, radius_km)
@@ -0,0 +1,72 @@
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+_DECODE = {char: index for index, char in enumerate(_BASE32)}
+
+MAX_PRECISION = 12
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int = 6) -> str:
+    """
+    Codifica unas coordenadas como geohash (celdas rectangulares anidadas: cada prefijo es la
+    celda que contiene a las más largas).
+
+    Args:
+        latitude (float): Latitud entre -90 y 90.
+        longitude (float): Longitud entre -180 y 180.
+        precision (int, optional): Número de caracteres (6 ≈ 1,2 km x 0,6 km).
+
+    Returns:
+        str: Geohash de la celda que contiene el punto.
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        target, bounds = (longitude, lng_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if target >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            bits = 0
+            value = 0
+    return ''.join(chars)
+
+
+def geohash_bounds(geohash: str) -> tuple:
+    """
+    Calcula el rectángulo que cubre un geohash.
+
+    Args:
+        geohash (str): Geohash válido.
+
+    Raises:
+        ValueError: Si contiene caracteres que no pertenecen al alfabeto geohash.
+
+    Returns:
+        tuple: (lat_min, lng_min, lat_max, lng_max).
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        if char not in _DECODE:
+            raise ValueError(f"Geohash inválido: {geohash}")
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bounds = lng_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            if (value >> shift) & 1:
+                bounds[0] = middle
+            else:
+                bounds[1] = middle
+            even = not even
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
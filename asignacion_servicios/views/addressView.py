@@ -4,15 +4,20 @@ from asignacion_servicios.serializers.addressSerializer import AddressSerializer
 from asignacion_servicios.services.addressService import AddressService
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
+from asignacion_servicios.utils import parse_geo_params
+from .conditionalMixin import ConditionalGetMixin
+from .sparseFieldsMixin import SparseFieldsMixin
 
-class AddressViewSet(viewsets.ModelViewSet):
+class AddressViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet para operaciones CRUD sobre el modelo Address.
 
     Métodos:
-        get_queryset(): Permite filtrar direcciones por país y ciudad.
-        create(): Crea una nueva dirección.
+        get_queryset(): Permite filtrar direcciones por país, ciudad, radio o bounding box.
+        create(): Crea una nueva dirección o retorna la equivalente existente.
         retrieve(): Recupera una dirección por su ID.
         update(): Actualiza una dirección existente.
         partial_update(): Actualiza parcialmente una dirección existente.
@@ -24,7 +29,8 @@ class AddressViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """
-        Obtiene el queryset de direcciones, filtrando opcionalmente por país y ciudad.
+        Obtiene el queryset de direcciones, filtrando opcionalmente por país, ciudad y zona
+        geográfica (radio alrededor de 'lat'/'lng' o 'bbox').
 
         Returns:
             QuerySet: QuerySet de direcciones filtradas o todas si no hay filtros.
@@ -34,23 +40,41 @@ class AddressViewSet(viewsets.ModelViewSet):
             'city': self.request.query_params.get('city')
         }
         filters = {k: v for k, v in filters.items() if v}
-        return AddressService.list_addresses(filters)
+        return AddressService.list_addresses(filters, area=self._geo_area())
+
+    def _geo_area(self):
+        """
+        Lee los parámetros de búsqueda geográfica ('lat', 'lng', 'radius_km' o 'bbox').
+
+        Raises:
+            DRFValidationError: Si los parámetros no son válidos.
+
+        Returns:
+            GeoArea o None: Zona pedida o None si no se pidió ninguna.
+        """
+        try:
+            return parse_geo_params(self.request.query_params, settings.GEO_MAX_RADIUS_KM)
+        except ValueError as e:
+            raise DRFValidationError({"error": str(e)})
 
     def create(self, request, *args, **kwargs):
         """
-        Crea una nueva dirección.
+        Crea una nueva dirección o retorna la equivalente ya existente.
 
         Args:
             request (Request): Objeto de la petición HTTP.
 
         Returns:
-            Response: Respuesta HTTP con la dirección creada o error de validación.
+            Response: Respuesta HTTP con la dirección creada (201), la existente (200) o error de validación.
         """
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
-            address = AddressService.create_address(serializer.validated_data)
-            return Response(self.get_serializer(address).data, status=status.HTTP_201_CREATED)
+            address, created = AddressService.get_or_create_address(serializer.validated_data)
+            return Response(
+                self.get_serializer(address).data,
+                status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+            )
         except ValidationError as e:
             return Response({"error": e.message_dict if hasattr(e, 'message_dict') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
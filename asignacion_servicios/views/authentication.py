@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+
+
+class ValidatedTokenCache:
+    """
+    LRU acotado y seguro entre hilos de tokens ya validados.
+
+    Cada entrada guarda el token validado, el usuario cargado (o None si aún no se cargó) y el
+    momento en que expira, que nunca es posterior al 'exp' del token.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, raw_token: bytes, now: float):
+        """
+        Args:
+            raw_token (bytes): Token tal como llegó en el encabezado.
+            now (float): Momento actual (time.time()).
+
+        Returns:
+            list o None: [token validado, usuario o None, expira] o None si no está o expiró.
+        """
+        with self._lock:
+            entry = self._entries.get(raw_token)
+            if entry is None:
+                return None
+            if entry[2] <= now:
+                del self._entries[raw_token]
+                return None
+            self._entries.move_to_end(raw_token)
+            return entry
+
+    def put(self, raw_token: bytes, validated_token, user, expires_at: float, max_size: int) -> list:
+        """
+        Guarda un token validado y descarta los menos usados si se supera 'max_size'.
+
+        Returns:
+            list: Entrada guardada.
+        """
+        entry = [validated_token, user, expires_at]
+        with self._lock:
+            self._entries[raw_token] = entry
+            self._entries.move_to_end(raw_token)
+            while len(self._entries) > max_size:
+                self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = ValidatedTokenCache()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication que cachea por token la validación (firma y claims) y el usuario cargado.
+
+    Las entradas viven en un LRU de JWT_AUTH_CACHE_SIZE tokens durante JWT_AUTH_CACHE_SECONDS,
+    sin pasar nunca del 'exp' del token. La clave es el token completo y no solo su 'jti': un
+    token con el mismo 'jti' y otra firma no coincide con la entrada y se valida de nuevo.
+
+    Con JWT_AUTH_STATELESS_READS (desactivado por defecto) las peticiones de lectura (GET, HEAD,
+    OPTIONS) se autentican con un TokenUser construido con los claims, sin consultar la tabla de
+    usuarios, solo durante los primeros JWT_AUTH_CACHE_SECONDS desde el 'iat' del token; después
+    cargan el usuario como las escrituras. Así un usuario desactivado o que cambió su contraseña
+    sigue autenticado como mucho JWT_AUTH_CACHE_SECONDS, tanto en lecturas como en escrituras.
+    """
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        now = time.time()
+        ttl = getattr(settings, 'JWT_AUTH_CACHE_SECONDS', 300)
+        entry = token_cache.get(raw_token, now)
+        if entry is None:
+            validated_token = self.get_validated_token(raw_token)
+            expires_at = min(validated_token.get('exp', now), now + ttl)
+            entry = token_cache.put(
+                raw_token, validated_token, None, expires_at, getattr(settings, 'JWT_AUTH_CACHE_SIZE', 10000)
+            )
+        validated_token, user, _ = entry
+
+        if user is None:
+            if (
+                request.method in SAFE_METHODS
+                and getattr(settings, 'JWT_AUTH_STATELESS_READS', False)
+                and now < validated_token.get('iat', 0) + ttl
+            ):
+                return TokenUser(validated_token), validated_token
+            # get_user valida que el usuario exista y esté activo antes de cachearlo.
+            user = entry[1] = self.get_user(validated_token)
+        return user, validated_token
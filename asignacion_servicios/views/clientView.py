@@ -5,8 +5,10 @@ from asignacion_servicios.services.clientService import ClientService
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.pagination import PageNumberPagination
+from .conditionalMixin import ConditionalGetMixin
+from .sparseFieldsMixin import SparseFieldsMixin
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet para operaciones CRUD sobre el modelo Client.
     """
@@ -33,7 +35,7 @@ class ClientViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
-            client = ClientService.create_client(serializer.validated_data)
+            client = ClientService.create_client(serializer.validated_data, validation_context=serializer.validation_context)
             return Response(self.get_serializer(client).data, status=status.HTTP_201_CREATED)
         except ValidationError as e:
             return Response({"error": e.message_dict if hasattr(e, 'message_dict') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -78,7 +80,7 @@ class ClientViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(client, data=request.data)
         try:
             serializer.is_valid(raise_exception=True)
-            updated_client = ClientService.update_client(pk, serializer.validated_data)
+            updated_client = ClientService.update_client(pk, serializer.validated_data, validation_context=serializer.validation_context)
             return Response(self.get_serializer(updated_client).data)
         except ValidationError as e:
             return Response({"error": e.message_dict if hasattr(e, 'message_dict') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -104,7 +106,7 @@ class ClientViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(client, data=request.data, partial=True)
         try:
             serializer.is_valid(raise_exception=True)
-            updated_client = ClientService.update_client(pk, serializer.validated_data)
+            updated_client = ClientService.update_client(pk, serializer.validated_data, validation_context=serializer.validation_context)
             return Response(self.get_serializer(updated_client).data)
         except ValidationError as e:
             return Response({"error": e.message_dict if hasattr(e, 'message_dict') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,130 @@
+import hashlib
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+class NotModified(APIException):
+    """
+    Excepción interna para cortar la petición cuando el cliente ya tiene la versión actual.
+    """
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para ViewSets que añade soporte de GET condicional (ETag / Last-Modified).
+
+    Antes de ejecutar 'list' o 'retrieve' calcula una huella barata de la versión de los datos
+    a partir de 'updated_at': para el detalle consulta solo el 'updated_at' de la fila, y para
+    el listado hace una consulta de Max('updated_at') y Count('pk') sobre el queryset filtrado.
+    Si la huella coincide con If-None-Match (o no hay cambios desde If-Modified-Since) responde
+    304 sin cargar ni serializar los objetos.
+    """
+
+    conditional_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._conditional_headers = None
+        if request.method not in ('GET', 'HEAD') or self.action not in self.conditional_actions:
+            return
+
+        if self.action == 'retrieve':
+            fingerprint = self._retrieve_fingerprint(kwargs.get('pk'), request)
+        else:
+            fingerprint = self._list_fingerprint(request)
+        if fingerprint is None:
+            return
+
+        self._conditional_headers = fingerprint
+        if self._is_not_modified(request, *fingerprint):
+            raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        headers = getattr(self, '_conditional_headers', None)
+        if headers and response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            etag, last_modified = headers
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified.timestamp())
+        return response
+
+    def _conditional_model(self):
+        return self.get_queryset().model
+
+    def _retrieve_fingerprint(self, pk, request):
+        """
+        Calcula la huella de un objeto a partir de su 'updated_at'.
+
+        Los campos pedidos con '?fields=' forman parte de la huella: cada subconjunto de campos es
+        una representación distinta.
+
+        Args:
+            pk: ID del objeto.
+            request (Request): Petición, de la que se toma '?fields='.
+
+        Returns:
+            tuple o None: (etag, last_modified) o None si el objeto no existe.
+        """
+        model = self._conditional_model()
+        try:
+            updated_at = model._default_manager.filter(pk=pk).values_list('updated_at', flat=True).first()
+        except (ValueError, TypeError):
+            return None
+        if updated_at is None:
+            return None
+        fields = request.query_params.get('fields', '')
+        return self._make_etag(f"{model._meta.label}:{pk}:{fields}:{updated_at.isoformat()}"), updated_at
+
+    def _list_fingerprint(self, request):
+        """
+        Calcula la huella de un listado a partir del máximo 'updated_at' y del número de filas.
+
+        El número de filas detecta eliminaciones, que no cambian el máximo 'updated_at'.
+        La ruta completa (filtros y página) forma parte de la huella.
+
+        Returns:
+            tuple: (etag, last_modified)
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        probe = queryset.order_by().aggregate(last_updated=Max('updated_at'), total=Count('pk'))
+        last_updated = probe['last_updated']
+        version = last_updated.isoformat() if last_updated else ''
+        key = f"{queryset.model._meta.label}:{request.get_full_path()}:{probe['total']}:{version}"
+        return self._make_etag(key), last_updated
+
+    @staticmethod
+    def _make_etag(key: str) -> str:
+        return 'W/"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+    @staticmethod
+    def _is_not_modified(request, etag: str, last_modified) -> bool:
+        """
+        Evalúa If-None-Match y, si no viene, If-Modified-Since.
+
+        Returns:
+            bool: True si el cliente ya tiene la versión actual.
+        """
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            client_etags = parse_etags(if_none_match)
+            if '*' in client_etags:
+                return True
+            # Comparación débil: se ignora el prefijo W/.
+            opaque = etag.removeprefix('W/')
+            return any(client_etag.removeprefix('W/') == opaque for client_etag in client_etags)
+
+        if_modified_since = request.META.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since and last_modified is not None:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and int(last_modified.timestamp()) <= since
+        return False
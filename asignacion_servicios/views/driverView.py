@@ -1,21 +1,28 @@
+import math
 from rest_framework import viewsets, status
 from rest_framework.response import Response
-from asignacion_servicios.serializers import DriverSerializer, ServiceSerializer
-from asignacion_servicios.services import DriverService
+from asignacion_servicios.serializers import DriverSerializer, DriverListSerializer, ServiceSerializer
+from asignacion_servicios.services import DriverService, OfferService, RepositioningService
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from .jwt_config import IsAuthenticatedOrReadOnly
 from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.exceptions import ValidationError as DRFValidationError
 from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
+from asignacion_servicios.utils import parse_geo_params
+from .conditionalMixin import ConditionalGetMixin
+from .sparseFieldsMixin import SparseFieldsMixin
 
-class DriverViewSet(viewsets.ModelViewSet):
+class DriverViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet para operaciones CRUD sobre el modelo Driver.
     """
     serializer_class = DriverSerializer
     pagination_class = PageNumberPagination
     permission_classes = [IsAuthenticatedOrReadOnly]
+    # Acciones de despacho con capacidad reservada en TokenBucketThrottle.
+    priority_actions = ('complete_service',)
 
     @action(detail=True, methods=['post'], url_path='complete', permission_classes=[IsAuthenticated])
     def complete_service(self, request, pk=None):
@@ -43,9 +50,103 @@ class DriverViewSet(viewsets.ModelViewSet):
         except Exception:
             return Response({"error": "Error interno del servidor."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @action(detail=True, methods=['get'], url_path='offers', permission_classes=[IsAuthenticated])
+    def offers(self, request, pk=None):
+        """
+        Espera la siguiente oferta de servicio para el conductor (long-poll).
+
+        Args:
+            request (Request): Objeto de la petición HTTP con 'wait' opcional (segundos).
+            pk (int, optional): ID del conductor.
+
+        Returns:
+            Response: Respuesta HTTP con la oferta, 204 si no llegó ninguna o error.
+        """
+        try:
+            wait = float(request.query_params.get('wait', 0))
+            if not math.isfinite(wait):
+                raise ValueError(wait)
+        except ValueError:
+            return Response({"error": "El parámetro 'wait' debe ser un número."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            offer = OfferService.poll_offer(pk, wait)
+        except ObjectDoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception:
+            return Response({"error": "Error interno del servidor."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        if offer is None:
+            return Response(status=status.HTTP_204_NO_CONTENT)
+        return Response({"offer": offer.to_dict()})
+
+    @action(detail=True, methods=['post'], url_path=r'offers/(?P<service_id>[0-9]+)/accept', permission_classes=[IsAuthenticated])
+    def accept_offer(self, request, pk=None, service_id=None):
+        """
+        Acepta la oferta de un servicio y lo asigna al conductor.
+
+        Args:
+            request (Request): Objeto de la petición HTTP.
+            pk (int, optional): ID del conductor.
+            service_id (int, optional): ID del servicio ofrecido.
+
+        Returns:
+            Response: Respuesta HTTP con el servicio asignado o error.
+        """
+        try:
+            service = OfferService.accept_offer(pk, service_id)
+            return Response({"message": "Oferta aceptada.", "service": ServiceSerializer(service).data})
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ObjectDoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception:
+            return Response({"error": "Error interno del servidor."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=True, methods=['post'], url_path=r'offers/(?P<service_id>[0-9]+)/reject', permission_classes=[IsAuthenticated])
+    def reject_offer(self, request, pk=None, service_id=None):
+        """
+        Rechaza la oferta de un servicio, que pasa al siguiente conductor más cercano.
+
+        Args:
+            request (Request): Objeto de la petición HTTP.
+            pk (int, optional): ID del conductor.
+            service_id (int, optional): ID del servicio ofrecido.
+
+        Returns:
+            Response: Respuesta HTTP de confirmación o error.
+        """
+        try:
+            OfferService.reject_offer(pk, service_id)
+            return Response({"message": "Oferta rechazada."})
+        except ValidationError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ObjectDoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except Exception:
+            return Response({"error": "Error interno del servidor."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @action(detail=False, methods=['get'], url_path='recommendations', permission_classes=[IsAuthenticated])
+    def recommendations(self, request):
+        """
+        Lista las posiciones sugeridas a los conductores disponibles (calculadas por recommend_positions).
+
+        Parámetro opcional: 'driver' para consultar la sugerencia de un conductor.
+
+        Args:
+            request (Request): Objeto de la petición HTTP.
+
+        Returns:
+            Response: Respuesta HTTP con las sugerencias vigentes o error de validación.
+        """
+        driver_id = request.query_params.get('driver')
+        if driver_id is not None and not driver_id.isdigit():
+            return Response({"error": "El parámetro 'driver' debe ser un ID numérico."}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(RepositioningService.list_recommendations(int(driver_id) if driver_id else None))
+
     def get_queryset(self):
         """
-        Retorna el queryset de conductores, filtrando por disponibilidad, ciudad y país si se especifican.
+        Retorna el queryset de conductores, filtrando por disponibilidad, ciudad y país si se especifican,
+        y por zona geográfica de su dirección (radio alrededor de 'lat'/'lng' o 'bbox').
 
         Returns:
             QuerySet: QuerySet de conductores filtrados.
@@ -56,7 +157,40 @@ class DriverViewSet(viewsets.ModelViewSet):
             'country': self.request.query_params.get('country')
         }
         filters = {k: v for k, v in filters.items() if v is not None}
-        return DriverService.list_drivers(filters)
+        return DriverService.list_drivers(filters, area=self._geo_area())
+
+    def _geo_area(self):
+        """
+        Lee los parámetros de búsqueda geográfica ('lat', 'lng', 'radius_km' o 'bbox').
+
+        Raises:
+            DRFValidationError: Si los parámetros no son válidos.
+
+        Returns:
+            GeoArea o None: Zona pedida o None si no se pidió ninguna.
+        """
+        try:
+            return parse_geo_params(self.request.query_params, settings.GEO_MAX_RADIUS_KM)
+        except ValueError as e:
+            raise DRFValidationError({"error": str(e)})
+
+    def list(self, request, *args, **kwargs):
+        """
+        Lista conductores paginados leyendo solo las columnas necesarias (o las de ?fields=) con .values_list(),
+        sin instanciar modelos ni un DriverSerializer por fila.
+
+        Args:
+            request (Request): Objeto de la petición HTTP.
+
+        Returns:
+            Response: Respuesta HTTP paginada con los conductores.
+        """
+        list_serializer = DriverListSerializer(self.sparse_fields)
+        rows = list_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(list_serializer.to_representation(page))
+        return Response(list_serializer.to_representation(rows))
 
     def create(self, request, *args, **kwargs):
         """
@@ -71,7 +205,7 @@ class DriverViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
-            driver = DriverService.create_driver(serializer.validated_data)
+            driver = DriverService.create_driver(serializer.validated_data, validation_context=serializer.validation_context)
             output = self.get_serializer(driver)
             return Response(output.data, status=status.HTTP_201_CREATED)
         except ValueError as e:
@@ -118,7 +252,7 @@ class DriverViewSet(viewsets.ModelViewSet):
             driver = DriverService.get_driver(pk)
             serializer = self.get_serializer(driver, data=request.data)
             serializer.is_valid(raise_exception=True)
-            updated_driver = DriverService.update_driver(pk, serializer.validated_data)
+            updated_driver = DriverService.update_driver(pk, serializer.validated_data, validation_context=serializer.validation_context)
             output = self.get_serializer(updated_driver)
             return Response(output.data, status=status.HTTP_200_OK)
         except (ValidationError, DRFValidationError) as e:
@@ -144,7 +278,7 @@ class DriverViewSet(viewsets.ModelViewSet):
             driver = DriverService.get_driver(pk)
             serializer = self.get_serializer(driver, data=request.data, partial=True)
             serializer.is_valid(raise_exception=True)
-            updated_driver = DriverService.update_driver(pk, serializer.validated_data)
+            updated_driver = DriverService.update_driver(pk, serializer.validated_data, validation_context=serializer.validation_context)
             output = self.get_serializer(updated_driver)
             return Response(output.data)
         except (ValidationError, DRFValidationError) as e:
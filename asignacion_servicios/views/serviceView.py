@@ -1,19 +1,26 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
-from asignacion_servicios.serializers import ServiceSerializer
-from asignacion_servicios.services import ServiceService
+from asignacion_servicios.serializers import (
+    ServiceSerializer, ServiceListSerializer, ServiceBulkTransitionSerializer, DistanceMatrixSerializer
+)
+from asignacion_servicios.services import HeatmapService, ServiceService
 from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework.pagination import PageNumberPagination
+from .conditionalMixin import ConditionalGetMixin
+from .sparseFieldsMixin import SparseFieldsMixin
 
-class ServiceViewSet(viewsets.ModelViewSet):
+class ServiceViewSet(ConditionalGetMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     """
     ViewSet para operaciones CRUD sobre el modelo Service.
     """
     serializer_class = ServiceSerializer
     pagination_class = PageNumberPagination
     permission_classes = [IsAuthenticated]
+    # Acciones de despacho con capacidad reservada en TokenBucketThrottle.
+    priority_actions = ('create',)
 
     def get_queryset(self):
         """
@@ -26,6 +33,23 @@ class ServiceViewSet(viewsets.ModelViewSet):
         filters = {k: v for k, v in filters.items() if v}
         return ServiceService.list_services(filters)
 
+    def list(self, request, *args, **kwargs):
+        """
+        Lista servicios paginados leyendo solo las columnas necesarias (o las de ?fields=) con .values_list(),
+        sin instanciar modelos ni un ServiceSerializer por fila.
+
+        Args:
+            request (Request): Objeto de la petición HTTP.
+
+        Returns:
+            Response: Respuesta HTTP paginada con los servicios.
+        """
+        list_serializer = ServiceListSerializer(self.sparse_fields)
+        rows = list_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(list_serializer.to_representation(page))
+        return Response(list_serializer.to_representation(rows))
 
     def create(self, request, *args, **kwargs):
         """
@@ -51,6 +75,75 @@ class ServiceViewSet(viewsets.ModelViewSet):
         except Exception:
             return Response({"error": "Error interno del servidor."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+    @swagger_auto_schema(request_body=ServiceBulkTransitionSerializer)
+    @action(detail=False, methods=['post'], url_path='bulk-transition')
+    def bulk_transition(self, request):
+        """
+        Cambia el estado de varios servicios a 'completed' o 'canceled' en una sola petición.
+
+        Args:
+            request (Request): Objeto de la petición HTTP con 'ids' y 'status'.
+
+        Returns:
+            Response: Respuesta HTTP con el resultado por cada ID o error de validación.
+        """
+        serializer = ServiceBulkTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            results = ServiceService.bulk_transition(
+                serializer.validated_data['ids'],
+                serializer.validated_data['status']
+            )
+            return Response({"results": results})
+        except ValidationError as e:
+            return Response({"error": e.message_dict if hasattr(e, 'message_dict') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception:
+            return Response({"error": "Error interno del servidor."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @swagger_auto_schema(request_body=DistanceMatrixSerializer)
+    @action(detail=False, methods=['post'], url_path='distance-matrix')
+    def distance_matrix(self, request):
+        """
+        Calcula en una sola petición la distancia y el tiempo estimado entre varios orígenes y destinos,
+        para cotizar sin una petición por par.
+
+        Args:
+            request (Request): Objeto de la petición HTTP con 'origins' y 'destinations'.
+
+        Returns:
+            Response: Respuesta HTTP con las matrices 'distances' (km) y 'durations' (minutos) o error.
+        """
+        serializer = DistanceMatrixSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            return Response(ServiceService.distance_matrix(
+                serializer.validated_data['origins'],
+                serializer.validated_data['destinations']
+            ))
+        except ValidationError as e:
+            return Response({"error": e.message_dict if hasattr(e, 'message_dict') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ObjectDoesNotExist as e:
+            return Response({"error": str(e)}, status=status.HTTP_404_NOT_FOUND)
+
+    @action(detail=False, methods=['get'], url_path='heatmap')
+    def heatmap(self, request):
+        """
+        Retorna la demanda agregada por celda geohash a partir de las celdas precalculadas.
+
+        Parámetros opcionales: 'since' y 'until' (ISO 8601) y 'precision' (longitud del geohash).
+
+        Args:
+            request (Request): Objeto de la petición HTTP.
+
+        Returns:
+            Response: Respuesta HTTP con las celdas y sus contadores o error de validación.
+        """
+        params = request.query_params
+        try:
+            return Response(HeatmapService.heatmap(params.get('since'), params.get('until'), params.get('precision')))
+        except ValidationError as e:
+            return Response({"error": e.message_dict if hasattr(e, 'message_dict') else str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
     def _create_service_with_warning(self, validated_data):
         """
         Llama a ServiceService.create_service y separa el warning si existe.
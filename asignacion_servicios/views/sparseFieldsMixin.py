@@ -0,0 +1,48 @@
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from asignacion_servicios.serializers import parse_sparse_fields
+
+
+class SparseFieldsMixin:
+    """
+    Mixin para ViewSets que admite '?fields=id,status,driver' en 'list' y 'retrieve'.
+
+    Los campos pedidos se validan tras la autenticación (400 si alguno no existe), se pasan al
+    serializador y, en el listado, se trasladan al queryset con .only() para no leer columnas
+    que no se devuelven. Los listados basados en ValuesListSerializer los reciben a través de
+    'sparse_fields'. Debe ir después de ConditionalGetMixin para validar antes de la huella.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.sparse_fields = None
+        if self.action not in self.sparse_actions:
+            return
+        try:
+            self.sparse_fields = parse_sparse_fields(
+                request.query_params.get('fields'), list(self.get_serializer_class()().fields)
+            )
+        except ValueError as e:
+            raise DRFValidationError({"error": str(e)})
+
+    def get_serializer(self, *args, **kwargs):
+        if getattr(self, 'sparse_fields', None) is not None:
+            kwargs.setdefault('fields', self.sparse_fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if getattr(self, 'sparse_fields', None) is not None and self.action == 'list':
+            queryset = queryset.only(*self._sparse_columns(queryset.model))
+        return queryset
+
+    def _sparse_columns(self, model) -> list:
+        """
+        Returns:
+            list: Campos del modelo que respaldan los campos pedidos del serializador.
+        """
+        serializer_fields = self.get_serializer_class()().fields
+        model_fields = {field.name for field in model._meta.concrete_fields}
+        sources = (serializer_fields[name].source for name in self.sparse_fields)
+        return [source for source in sources if source in model_fields]
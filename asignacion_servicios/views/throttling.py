@@ -0,0 +1,62 @@
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.throttling import BaseThrottle
+
+_lock = threading.Lock()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Limita las peticiones con un token bucket por usuario (JWT) o IP y por clase de endpoint.
+
+    Cada par (usuario, ViewSet) tiene un bucket de 'capacidad' tokens que se rellena a 'tasa'
+    tokens por segundo (THROTTLE_BUCKETS, scope 'user' o 'anon'); cada petición consume uno.
+    Las acciones listadas en 'priority_actions' del ViewSet (crear servicios, completar
+    servicios) pueden vaciar el bucket, mientras que el resto (listados, mapas, exportaciones)
+    se detiene al llegar a la reserva THROTTLE_PRIORITY_RESERVE, así que el tráfico de lectura
+    nunca agota la capacidad de las operaciones de despacho.
+
+    El estado vive en la caché THROTTLE_CACHE: con una caché local es por proceso y con una
+    compartida (Redis, Memcached) es global; en este caso la lectura y escritura no son
+    atómicas entre procesos y el límite es aproximado.
+    """
+
+    def __init__(self):
+        self.wait_seconds = None
+
+    def allow_request(self, request, view) -> bool:
+        scope = 'user' if request.user and request.user.is_authenticated else 'anon'
+        rate, capacity = getattr(settings, 'THROTTLE_BUCKETS', {}).get(scope, (None, None))
+        if not rate:
+            return True
+        ident = request.user.pk if scope == 'user' else self.get_ident(request)
+        key = f"throttle:{scope}:{view.__class__.__name__}:{ident}"
+        priority = getattr(view, 'action', None) in getattr(view, 'priority_actions', ())
+        floor = 0 if priority else capacity * getattr(settings, 'THROTTLE_PRIORITY_RESERVE', 0.2)
+
+        cache = caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+        now = time.time()
+        with _lock:
+            state = cache.get(key)
+            if state is None:
+                tokens = float(capacity)
+            else:
+                tokens, updated = state
+                tokens = min(float(capacity), tokens + (now - updated) * rate)
+            allowed = tokens - 1 >= floor
+            if allowed:
+                tokens -= 1
+            else:
+                self.wait_seconds = (floor + 1 - tokens) / rate
+            # Pasado el tiempo de rellenar el bucket, su estado equivale a uno nuevo.
+            cache.set(key, (tokens, now), timeout=int(capacity / rate) + 1)
+        return allowed
+
+    def wait(self):
+        """
+        Returns:
+            float o None: Segundos hasta que haya un token disponible (encabezado Retry-After).
+        """
+        return self.wait_seconds
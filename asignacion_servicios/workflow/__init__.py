@@ -0,0 +1 @@
+from .serviceStateMachine import ServiceStateMachine, on_transition
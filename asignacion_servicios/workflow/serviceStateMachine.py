@@ -0,0 +1,218 @@
+from django.core.exceptions import ValidationError
+
+# Transiciones permitidas entre estados distintos. 'completed' y 'canceled' son finales.
+_TRANSITIONS = {
+    'pending': ('in_progress', 'canceled'),
+    'in_progress': ('pending', 'completed', 'canceled'),
+    'completed': (),
+    'canceled': (),
+}
+
+_hooks = {}
+_batch_hooks = {}
+
+
+def on_transition(from_status: str = '*', to_status: str = '*', batch: bool = False):
+    """
+    Registra una función que se ejecuta, dentro de la transacción del cambio, cada vez que
+    un servicio pasa de 'from_status' a 'to_status' ('*' para cualquiera).
+
+    La función recibe (service_id, from_status, to_status, driver_id). Con batch=True recibe
+    una sola vez por transición masiva (rows, to_status), con rows como lista de tuplas
+    (service_id, from_status, driver_id), para procesar todos los servicios con pocas consultas.
+
+    Args:
+        from_status (str, optional): Estado de origen.
+        to_status (str, optional): Estado destino.
+        batch (bool, optional): Si la función recibe las transiciones agrupadas.
+
+    Returns:
+        callable: Decorador que registra la función y la retorna sin cambios.
+    """
+    def decorator(func):
+        (_batch_hooks if batch else _hooks).setdefault((from_status, to_status), []).append(func)
+        ServiceStateMachine._compiled_hooks.clear()
+        return func
+    return decorator
+
+
+class ServiceStateMachine:
+    """
+    Reglas de estado de los servicios, centralizadas en una tabla de transiciones precalculada.
+
+    Todas las consultas (¿se permite la transición?, ¿desde qué estados se llega a un estado?)
+    son búsquedas en conjuntos y diccionarios construidos al importar el módulo.
+    """
+
+    STATUSES = tuple(_TRANSITIONS)
+    TERMINAL = frozenset(status for status, targets in _TRANSITIONS.items() if not targets)
+    # Pares (origen, destino) permitidos; un estado no final puede "pasar" a sí mismo (sin cambio).
+    ALLOWED = frozenset(
+        [(source, target) for source, targets in _TRANSITIONS.items() for target in targets]
+        + [(status, status) for status, targets in _TRANSITIONS.items() if targets]
+    )
+    # Estados de origen válidos para cada estado destino, para UPDATE ... WHERE status IN (...).
+    SOURCES = {
+        target: tuple(source for source, targets in _TRANSITIONS.items() if target in targets)
+        for target in _TRANSITIONS
+    }
+    # Estados destino admitidos en transiciones masivas.
+    BULK_TARGETS = ('completed', 'canceled')
+
+    _compiled_hooks = {}
+
+    @staticmethod
+    def can_transition(from_status: str, to_status: str) -> bool:
+        """
+        Indica si un servicio puede pasar de un estado a otro.
+
+        Args:
+            from_status (str): Estado actual.
+            to_status (str): Estado destino.
+
+        Returns:
+            bool: True si la transición está permitida.
+        """
+        return (from_status, to_status) in ServiceStateMachine.ALLOWED
+
+    @staticmethod
+    def status_error(from_status: str, to_status: str):
+        """
+        Verifica una transición de estado según la tabla.
+
+        Args:
+            from_status (str o None): Estado actual, None si el servicio es nuevo.
+            to_status (str): Estado destino.
+
+        Returns:
+            str o None: Mensaje de error si la transición no es válida, None en caso contrario.
+        """
+        if from_status == 'completed':
+            return "No se puede cambiar el estado de un servicio ya completado."
+        if from_status in ServiceStateMachine.TERMINAL:
+            return f"No se puede cambiar el estado de un servicio '{from_status}'."
+        if to_status not in _TRANSITIONS:
+            return (
+                f"El estado '{to_status}' no es válido. "
+                f"Los estados permitidos son: {', '.join(ServiceStateMachine.STATUSES)}."
+            )
+        if from_status is None or (from_status, to_status) in ServiceStateMachine.ALLOWED:
+            return None
+        if to_status == 'completed':
+            return "Solo se pueden completar servicios que estén en progreso."
+        return f"No se puede pasar un servicio de '{from_status}' a '{to_status}'."
+
+    @staticmethod
+    def driver_error(status: str, has_driver: bool):
+        """
+        Verifica que el estado sea coherente con tener o no un conductor asignado.
+
+        Args:
+            status (str): Estado del servicio.
+            has_driver (bool): Si el servicio tiene conductor.
+
+        Returns:
+            str o None: Mensaje de error si no es coherente, None en caso contrario.
+        """
+        if status == 'completed' and not has_driver:
+            return "Un servicio completado debe tener un conductor asignado."
+        if status == 'pending' and has_driver:
+            return "Un servicio pendiente no debe tener un conductor asignado."
+        return None
+
+    @staticmethod
+    def transition_error(from_status: str, to_status: str, has_driver: bool):
+        """
+        Verifica una transición completa: tabla de estados y reglas de conductor.
+
+        Args:
+            from_status (str o None): Estado actual.
+            to_status (str): Estado destino.
+            has_driver (bool): Si el servicio tendrá conductor tras la transición.
+
+        Returns:
+            str o None: Mensaje de error o None si la transición es válida.
+        """
+        error = ServiceStateMachine.status_error(from_status, to_status)
+        if error is None and to_status == 'completed':
+            error = ServiceStateMachine.driver_error(to_status, has_driver)
+        return error
+
+    @staticmethod
+    def check(from_status: str, to_status: str, has_driver: bool) -> None:
+        """
+        Igual que transition_error(), pero lanza la excepción.
+
+        Raises:
+            ValidationError: Si la transición no es válida.
+        """
+        error = ServiceStateMachine.transition_error(from_status, to_status, has_driver)
+        if error:
+            raise ValidationError(error)
+
+    @staticmethod
+    def status_on_save(status: str, has_driver: bool) -> str:
+        """
+        Estado resultante al guardar: un servicio pendiente con conductor pasa a 'in_progress'.
+
+        Args:
+            status (str): Estado actual.
+            has_driver (bool): Si el servicio tiene conductor.
+
+        Returns:
+            str: Estado a guardar.
+        """
+        if status == 'pending' and has_driver:
+            return 'in_progress'
+        return status
+
+    @staticmethod
+    def run_hooks(service_id: int, from_status: str, to_status: str, driver_id) -> None:
+        """
+        Ejecuta las funciones registradas con @on_transition para una transición.
+
+        Args:
+            service_id (int): ID del servicio.
+            from_status (str o None): Estado anterior.
+            to_status (str): Estado nuevo.
+            driver_id (int o None): Conductor asignado antes del cambio.
+        """
+        ServiceStateMachine.run_hooks_many([(service_id, from_status, driver_id)], to_status)
+
+    @staticmethod
+    def run_hooks_many(rows: list, to_status: str) -> None:
+        """
+        Ejecuta las funciones registradas con @on_transition para varias transiciones al mismo estado:
+        las individuales por cada servicio y las de batch=True una vez por estado de origen.
+
+        Args:
+            rows (list): Tuplas (service_id, estado anterior, driver_id).
+            to_status (str): Estado nuevo.
+        """
+        by_source = {}
+        for row in rows:
+            by_source.setdefault(row[1], []).append(row)
+        for from_status, group in by_source.items():
+            hooks, batch_hooks = ServiceStateMachine._hooks_for(from_status, to_status)
+            for service_id, _, driver_id in group:
+                for hook in hooks:
+                    hook(service_id, from_status, to_status, driver_id)
+            for hook in batch_hooks:
+                hook(group, to_status)
+
+    @staticmethod
+    def _hooks_for(from_status: str, to_status: str) -> tuple:
+        """
+        Returns:
+            tuple: (funciones individuales, funciones batch) que aplican a la transición, en caché.
+        """
+        key = (from_status, to_status)
+        hooks = ServiceStateMachine._compiled_hooks.get(key)
+        if hooks is None:
+            keys = (key, (from_status, '*'), ('*', to_status), ('*', '*'))
+            hooks = (
+                tuple(hook for k in keys for hook in _hooks.get(k, [])),
+                tuple(hook for k in keys for hook in _batch_hooks.get(k, [])),
+            )
+            ServiceStateMachine._compiled_hooks[key] = hooks
+        return hooks
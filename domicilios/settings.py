@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'drf_yasg',
     'asignacion_servicios'
 ]
@@ -62,22 +63,77 @@ SWAGGER_SETTINGS = {
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'asignacion_servicios.views.authentication.CachedJWTAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'asignacion_servicios.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'asignacion_servicios.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 10,
+    'DEFAULT_THROTTLE_CLASSES': (
+        'asignacion_servicios.views.throttling.TokenBucketThrottle',
+    ),
 }
 
+# Token buckets por usuario (o IP si no hay JWT) y ViewSet: (tokens por segundo, capacidad).
+# Las acciones de despacho (priority_actions: crear y completar servicios) pueden usar toda la
+# capacidad; el resto se detiene al quedar THROTTLE_PRIORITY_RESERVE de ella. Con varios procesos,
+# THROTTLE_CACHE debe apuntar a una caché compartida para que el límite sea global. Un cliente
+# anónimo nunca tiene más capacidad que uno autenticado.
+THROTTLE_BUCKETS = {
+    'user': (10, 100),
+    'anon': (5, 50),
+}
+THROTTLE_PRIORITY_RESERVE = 0.2
+THROTTLE_CACHE = 'default'
+
+# Caché de tokens validados (y su usuario) de CachedJWTAuthentication: número de tokens y
+# segundos que se confía en una entrada. Con JWT_AUTH_STATELESS_READS las lecturas usan los
+# claims del token sin consultar la tabla de usuarios durante JWT_AUTH_CACHE_SECONDS desde su
+# emisión; está desactivado porque un usuario desactivado seguiría leyendo durante ese tiempo.
+JWT_AUTH_CACHE_SIZE = 10000
+JWT_AUTH_CACHE_SECONDS = 300
+JWT_AUTH_STATELESS_READS = False
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(days=2), 
     'REFRESH_TOKEN_LIFETIME': timedelta(days=3),   
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
+    'TOKEN_REFRESH_SERIALIZER': 'asignacion_servicios.serializers.tokenSerializers.TokenRefreshSerializer',
+    'TOKEN_VERIFY_SERIALIZER': 'asignacion_servicios.serializers.tokenSerializers.TokenVerifySerializer',
+}
+
+# Cachés: 'default' vive en la memoria de cada proceso; 'shared' vive en la base de datos (tabla
+# creada con python manage.py createcachetable) y la ven todos los procesos y workers.
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'shared': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'shared_cache'},
 }
 
+# Revocación de tokens de refresco: filtro de Bloom por proceso (capacidad y tasa de falsos
+# positivos) reconstruido cada TOKEN_BLACKLIST_REBUILD_SECONDS. Las revocaciones se propagan
+# con una versión en TOKEN_BLACKLIST_CACHE, que debe ser compartida ('shared'); si es una caché
+# del proceso (LocMemCache) el filtro no se usa y cada refresco consulta la base de datos.
+# python manage.py purge_tokens elimina por lotes de TOKEN_PURGE_BATCH_SIZE los tokens expirados.
+TOKEN_BLACKLIST_BLOOM_CAPACITY = 1_000_000
+TOKEN_BLACKLIST_BLOOM_ERROR_RATE = 0.001
+TOKEN_BLACKLIST_REBUILD_SECONDS = 3600
+TOKEN_BLACKLIST_CACHE = 'shared'
+TOKEN_PURGE_BATCH_SIZE = 1000
+
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'asignacion_servicios.middleware.CompressionMiddleware',
+    'asignacion_servicios.middleware.ProfilingMiddleware',
+    'asignacion_servicios.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -121,6 +177,133 @@ DATABASES = {
     }
 }
 
+# Réplica de solo lectura. Por defecto apunta a la misma base de datos que 'default';
+# en producción se configura con REPLICA_HOST_DB / REPLICA_PORT_DB.
+# En los tests se comporta como espejo de 'default'.
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'HOST': os.getenv('REPLICA_HOST_DB', DATABASES['default']['HOST']),
+    'PORT': os.getenv('REPLICA_PORT_DB', DATABASES['default']['PORT']),
+    'TEST': {'MIRROR': 'default'},
+}
+
+DATABASE_ROUTERS = ['asignacion_servicios.db.PrimaryReplicaRouter']
+
+# Las peticiones GET/HEAD/OPTIONS leen de la réplica solo si está habilitada.
+READ_REPLICA_ENABLED = os.getenv('READ_REPLICA_ENABLED', 'False').lower() == 'true'
+READ_REPLICA_ALIAS = 'replica'
+# Segundos que una sesión lee de la primaria después de escribir (read-your-writes).
+READ_REPLICA_STICKY_SECONDS = 5
+
+# Si está habilitado, los servicios nuevos se ofrecen al conductor más cercano, que debe
+# aceptarlos; si la oferta expira o se rechaza pasa al siguiente conductor más cercano.
+DISPATCH_OFFERS_ENABLED = os.getenv('DISPATCH_OFFERS_ENABLED', 'False').lower() == 'true'
+DISPATCH_OFFER_TTL_SECONDS = 20
+DISPATCH_OFFER_MAX_ATTEMPTS = 5
+# Espera máxima de GET /api/drivers/{id}/offers/ (long-poll).
+DISPATCH_OFFER_POLL_SECONDS = 25
+# Intervalo del hilo que escala las ofertas expiradas (0 lo desactiva).
+DISPATCH_OFFER_SWEEP_SECONDS = 1.0
+
+# Puntuación de conductores al asignar servicios. Criterios: 'distance', 'eta' (costo),
+# 'recent_completed' (servicios completados en las últimas DISPATCH_SCORING_RECENT_HOURS horas;
+# penaliza para repartir el trabajo) e 'idle' (tiempo desde su último servicio completado; beneficio).
+# DISPATCH_SCORING_CITIES asocia 'país|ciudad' a un preset o a un diccionario de pesos, por ejemplo
+# {'colombia|bogotá': 'balanced'}. El preset 'distance' conserva la asignación al más cercano.
+DISPATCH_SCORING_PRESETS = {
+    'distance': {'distance': 1.0},
+    'balanced': {'distance': 0.6, 'recent_completed': 0.2, 'idle': 0.2},
+}
+DISPATCH_SCORING_DEFAULT = 'distance'
+DISPATCH_SCORING_CITIES = {}
+DISPATCH_SCORING_RECENT_HOURS = 24
+DISPATCH_AVERAGE_SPEED_KMH = 40
+
+# Número máximo de pares origen/destino por petición a POST /api/services/distance-matrix/.
+DISTANCE_MATRIX_MAX_ELEMENTS = 2500
+
+# Asignación en lotes (python manage.py batch_services): los servicios nuevos quedan pendientes y se
+# agrupan por cercanía de la recogida (radio) y de la creación (ventana) para que un conductor con
+# capacidad suficiente (Driver.capacity) los atienda en un viaje. Un grupo se asigna al llenarse o
+# cuando su recogida más antigua esperó DISPATCH_BATCH_HOLD_SECONDS.
+DISPATCH_BATCHING_ENABLED = os.getenv('DISPATCH_BATCHING_ENABLED', 'False').lower() == 'true'
+DISPATCH_BATCH_RADIUS_KM = 1.5
+DISPATCH_BATCH_WINDOW_SECONDS = 120
+DISPATCH_BATCH_HOLD_SECONDS = 30
+DISPATCH_BATCH_MAX_SIZE = 3
+
+# Servicios programados (python manage.py dispatch_scheduled): se asignan DISPATCH_SCHEDULE_LEAD_SECONDS
+# antes de la hora de recogida. El dispatcher recarga desde la base de datos cada
+# DISPATCH_SCHEDULE_REFRESH_SECONDS (debe ser menor que la antelación) los servicios de la próxima
+# DISPATCH_SCHEDULE_HORIZON_SECONDS y reintenta cada DISPATCH_SCHEDULE_RETRY_SECONDS si no hay conductores.
+DISPATCH_SCHEDULE_LEAD_SECONDS = 600
+DISPATCH_SCHEDULE_REFRESH_SECONDS = 60
+DISPATCH_SCHEDULE_HORIZON_SECONDS = 3600
+DISPATCH_SCHEDULE_RETRY_SECONDS = 30
+DISPATCH_SCHEDULE_BATCH_SIZE = 200
+SCHEDULED_SERVICES_MAX_DAYS = 30
+
+# Tareas en segundo plano (python manage.py run_tasks): backoff exponencial entre reintentos y
+# segundos tras los que una tarea en ejecución se considera abandonada por su worker y cada
+# cuántos segundos el worker reencola las abandonadas.
+TASKS_RETRY_BASE_SECONDS = 5
+TASKS_RETRY_MAX_SECONDS = 300
+TASKS_STALE_SECONDS = 600
+TASKS_REQUEUE_SECONDS = 60
+
+# Destinos del relay de eventos outbox (python manage.py relay_outbox). Ejemplos:
+# {'BACKEND': 'asignacion_servicios.outbox.FileSink', 'OPTIONS': {'path': 'outbox.jsonl'}}
+# {'BACKEND': 'asignacion_servicios.outbox.WebhookSink', 'OPTIONS': {'url': 'https://...'}}
+OUTBOX_SINKS = [
+    {'BACKEND': 'asignacion_servicios.outbox.InProcessSink'},
+]
+OUTBOX_BATCH_SIZE = 500
+
+# Radio máximo (km) de las búsquedas geográficas (?lat=&lng=&radius_km=) en direcciones y conductores.
+GEO_MAX_RADIUS_KM = 100
+
+# Tamaño (grados) de la celda de rejilla usada para detectar direcciones duplicadas (~11 m).
+ADDRESS_GRID_DEGREES = 0.0001
+
+# Mapa de demanda (GET /api/services/heatmap/): precisión geohash de las celdas guardadas
+# (6 ≈ 1,2 km x 0,6 km), duración de cada ventana, rango por defecto y rango máximo consultable.
+HEATMAP_GEOHASH_PRECISION = 6
+HEATMAP_WINDOW_MINUTES = 60
+HEATMAP_DEFAULT_HOURS = 24
+HEATMAP_MAX_HOURS = 24 * 31
+
+# Sugerencias de posición para conductores disponibles (python manage.py recommend_positions):
+# precisión geohash de las celdas, semanas de historial de la media móvil y distancia máxima sugerida.
+REPOSITION_GEOHASH_PRECISION = 5
+REPOSITION_HISTORY_WEEKS = 4
+REPOSITION_MAX_DISTANCE_KM = 10
+
+# Perfilado de peticiones (ProfilingMiddleware). Un usuario staff perfila una petición con el
+# encabezado 'X-Profile: 1' o '?profile=1'; PROFILING_SAMPLE_RATE = N perfila además una de cada N
+# peticiones (0 lo desactiva). PROFILING_ENGINE: 'cprofile' (.prof) o 'pyinstrument' (si está instalado).
+PROFILING_ENABLED = os.getenv('PROFILING_ENABLED', 'False').lower() == 'true'
+PROFILING_SAMPLE_RATE = int(os.getenv('PROFILING_SAMPLE_RATE', '0'))
+PROFILING_ENGINE = os.getenv('PROFILING_ENGINE', 'cprofile')
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_MAX_FILES = 200
+
+# Estadísticas de consultas SQL por huella (literales eliminados) y por método de repositorio.
+# Las consultas de más de SLOW_QUERY_MS se registran con su origen en el logger
+# 'asignacion_servicios.db.queryStats'. Cada proceso guarda un snapshot en QUERY_STATS_DIR cada
+# QUERY_STATS_FLUSH_SECONDS; python manage.py query_stats muestra las consultas más costosas.
+QUERY_STATS_ENABLED = os.getenv('QUERY_STATS_ENABLED', 'False').lower() == 'true'
+SLOW_QUERY_MS = int(os.getenv('SLOW_QUERY_MS', '200'))
+QUERY_STATS_SAMPLES = 200
+QUERY_STATS_DIR = BASE_DIR / 'query_stats'
+QUERY_STATS_FLUSH_SECONDS = 60
+
+# Compresión de respuestas (CompressionMiddleware) según Accept-Encoding: brotli si está instalado,
+# si no gzip. Las respuestas menores que COMPRESSION_MIN_BYTES se envían sin comprimir.
+COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'True').lower() == 'true'
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators